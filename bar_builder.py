@@ -0,0 +1,105 @@
+import threading
+import time
+from datetime import datetime, timedelta, time as dt_time
+import pandas as pd
+
+# --- LIVE TICK -> 1m / 5m OHLCV BAR BUILDER ---
+# వెబ్‌సాకెట్ టిక్స్ ని మెమరీ లోనే 1-min & 5-min క్యాండిల్స్ గా మారుస్తుంది.
+# ఉదయం REST నుండి వచ్చిన హిస్టరీ (seed) + లైవ్ బార్స్ కలిపి process_5m_data కి కావాల్సిన ఫ్రేమ్ ఇస్తుంది.
+
+BAR_COLS = ['Open', 'High', 'Low', 'Close', 'Volume']
+MARKET_OPEN, MARKET_CLOSE = dt_time(9, 15), dt_time(15, 30)
+
+
+def _bar_start(wall, interval):
+    start = wall.replace(second=0, microsecond=0)
+    return start - timedelta(minutes=(start.hour * 60 + start.minute) % interval)
+
+
+class BarBuilder:
+    def __init__(self, intervals=(1, 5), reseed_after=30):
+        self.intervals = intervals
+        self.reseed_after = reseed_after
+        self._bars = {m: {} for m in intervals}   # interval -> sec_id -> [[start, o, h, l, c, v], ...]
+        self._cum_vol = {}                         # sec_id -> (day, లాస్ట్ day volume)
+        self._seed = {}                            # sec_id -> (day, seeded_at, df, interval)
+        self._lock = threading.Lock()
+
+    def on_tick(self, tick):
+        if not tick: return
+        sec_id, ltp, cum_vol, _, ltt = tick
+        if not ltp > 0: return
+        wall = datetime.fromtimestamp(ltt)
+        if not (MARKET_OPEN <= wall.time() < MARKET_CLOSE): return
+        day = wall.date()
+
+        with self._lock:
+            # Quote ప్యాకెట్ లో day cumulative volume వస్తుంది, బార్ కి దాని డెల్టా మాత్రమే
+            prev_day, prev_vol = self._cum_vol.get(sec_id, (None, None))
+            vol = 0.0
+            if cum_vol == cum_vol:
+                if prev_day == day and prev_vol is not None: vol = max(0.0, cum_vol - prev_vol)
+                self._cum_vol[sec_id] = (day, cum_vol)
+
+            for m in self.intervals:
+                bars = self._bars[m].get(sec_id)
+                if bars is None or bars[-1][0].date() != day:
+                    bars = self._bars[m][sec_id] = []
+                start = _bar_start(wall, m)
+                if bars and bars[-1][0] == start:
+                    b = bars[-1]
+                    b[2], b[3], b[4], b[5] = max(b[2], ltp), min(b[3], ltp), ltp, b[5] + vol
+                elif not bars or start > bars[-1][0]:
+                    bars.append([start, ltp, ltp, ltp, ltp, vol])
+
+    def live_frame(self, sec_id, interval=5):
+        with self._lock:
+            bars = [list(b) for b in self._bars.get(interval, {}).get(sec_id, [])]
+        if not bars: return pd.DataFrame(columns=BAR_COLS)
+        return pd.DataFrame([b[1:] for b in bars], columns=BAR_COLS, index=pd.DatetimeIndex([b[0] for b in bars], name='Date'))
+
+    def needs_backfill(self, sec_id):
+        seed = self._seed.get(sec_id)
+        if seed is None or seed[0] != datetime.now().date(): return True
+        tail = self._live_tail(seed[2], self.live_frame(sec_id, seed[3]), seed[3])
+        if tail is not None and not self._is_stale(tail, seed[3]): return False
+        # లైవ్ బార్స్ లేకపోతే / గ్యాప్ ఉంటే / వెబ్‌సాకెట్ ఆగిపోతే పాత లాగానే కొద్దిసేపటికి ఒకసారి REST
+        return time.time() - seed[1] > self.reseed_after
+
+    def seed(self, sec_id, df):
+        # Dhan intraday_minute_data 1-min క్యాండిల్స్ ఇస్తుంది, yf 5-min. seed ఏ టైమ్‌ఫ్రేమ్ అయితే లైవ్ కూడా అదే
+        gaps = pd.Series(df.index).diff().dropna()
+        step = gaps.median().total_seconds() / 60 if not gaps.empty else 5
+        interval = min(self.intervals, key=lambda m: abs(m - step))
+        with self._lock:
+            self._seed[sec_id] = (datetime.now().date(), time.time(), df[BAR_COLS], interval)
+
+    def _live_tail(self, base, live, interval):
+        # seed చివరి క్యాండిల్ నుండి లైవ్ బార్స్ - మధ్యలో ఒక్క క్యాండిల్ మిస్ అయినా None (రీసీడ్ తర్వాత ఆ గ్యాప్ seed కవర్ చేస్తుంది)
+        if live.empty or base.empty: return None
+        step = timedelta(minutes=interval)
+        tail = live[live.index >= base.index[-1]]
+        if tail.empty or tail.index[0] > base.index[-1] + step: return None
+        if len(tail) > 1 and (tail.index[1:] - tail.index[:-1] > step).any(): return None
+        return tail
+
+    def _is_stale(self, tail, interval):
+        # లాస్ట్ లైవ్ క్యాండిల్ ముగిసి reseed_after సెకన్లు దాటినా టిక్ రాలేదు (మార్కెట్ క్లోజ్ తర్వాత కాదు)
+        now = datetime.now()
+        until = min(now, datetime.combine(now.date(), MARKET_CLOSE))
+        return (until - (tail.index[-1] + timedelta(minutes=interval))).total_seconds() > self.reseed_after
+
+    def frame(self, sec_id):
+        # REST seed + లైవ్ బార్స్. ఒకే క్యాండిల్ రెండింట్లో ఉంటే Open seed ది, H/L/V రెండింటి max/min
+        seed = self._seed.get(sec_id)
+        if seed is None: return pd.DataFrame(columns=BAR_COLS)
+        base, interval = seed[2], seed[3]
+        live = self._live_tail(base, self.live_frame(sec_id, interval), interval)
+        if live is None: return base
+
+        first = live.index[0]
+        if first in base.index:
+            b = base.loc[first]
+            live.iloc[0] = [b['Open'], max(b['High'], live['High'].iat[0]), min(b['Low'], live['Low'].iat[0]),
+                            live['Close'].iat[0], max(b['Volume'], live['Volume'].iat[0])]
+        return pd.concat([base[base.index < first], live])
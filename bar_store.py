@@ -0,0 +1,144 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+
+# --- PERSISTENT LOCAL OHLCV STORE ---
+# ప్రతి (symbol, interval) కి ఒక memory-mapped .npy ఫైల్. ఒకసారి backfill అయ్యాక,
+# లాస్ట్ స్టోర్ అయిన టైమ్‌స్టాంప్ నుండి మిస్సింగ్ బార్స్ మాత్రమే డౌన్‌లోడ్ చేసి మెర్జ్ చేస్తుంది.
+# yf బార్స్ split / dividend adjusted - ఓవర్‌ల్యాప్ అయిన పూర్తి బార్ Close మారితే (స్ప్లిట్ / బోనస్) ఆ సింబల్ మొత్తం మళ్ళీ backfill.
+
+BAR_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+BAR_DTYPE = np.dtype([('ts', 'i8')] + [(f, 'f8') for f in BAR_FIELDS])
+
+
+def _safe_name(symbol):
+    return "".join(ch if ch.isalnum() or ch in "-_." else f"_{ord(ch):02x}" for ch in symbol)
+
+
+def _to_records(df):
+    idx = pd.DatetimeIndex(df.index)
+    if idx.tz is not None: idx = idx.tz_localize(None)
+    rec = np.empty(len(df), dtype=BAR_DTYPE)
+    rec['ts'] = idx.as_unit('ns').asi8
+    for f in BAR_FIELDS:
+        rec[f] = pd.to_numeric(df[f], errors='coerce').to_numpy(dtype=float) if f in df.columns else np.nan
+    return rec
+
+
+def _to_frame(rec):
+    df = pd.DataFrame({f: rec[f] for f in BAR_FIELDS}, index=pd.to_datetime(rec['ts']))
+    df.index.name = 'Date'
+    return df
+
+
+def split_panel(frame, symbols):
+    # yf.download(group_by='ticker') ఫ్రేమ్ ని {symbol: OHLCV df} గా విడదీస్తుంది
+    if frame is None or frame.empty: return {}
+    if not isinstance(frame.columns, pd.MultiIndex):
+        return {symbols[0]: frame} if len(symbols) == 1 else {}
+    present = set(frame.columns.get_level_values(0))
+    return {s: frame[s] for s in symbols if s in present}
+
+
+class BarStore:
+    def __init__(self, root, max_bars=600, adjust_tol=0.005):
+        self.root = root
+        self.max_bars = max_bars
+        self.adjust_tol = adjust_tol
+        self._lock = threading.Lock()
+
+    def _path(self, symbol, interval):
+        return os.path.join(self.root, interval, f"{_safe_name(symbol)}.npy")
+
+    def read(self, symbol, interval):
+        path = self._path(symbol, interval)
+        if not os.path.exists(path): return None
+        try: return np.load(path, mmap_mode='r')
+        except (OSError, ValueError): return None
+
+    def last_timestamp(self, symbol, interval):
+        rec = self.read(symbol, interval)
+        if rec is None or len(rec) == 0: return None
+        return pd.Timestamp(int(rec['ts'][-1]))
+
+    def merge(self, symbol, interval, df):
+        new = _to_records(df.dropna(subset=['Close']) if 'Close' in df.columns else df.iloc[0:0])
+        with self._lock:
+            old = self.read(symbol, interval)
+            merged = new if old is None else np.concatenate([np.asarray(old), new])
+            # అదే టైమ్‌స్టాంప్ మళ్ళీ వస్తే (ఈరోజు లైవ్ క్యాండిల్) కొత్త వాల్యూ నే ఉంచుతుంది
+            _, last_pos = np.unique(merged['ts'][::-1], return_index=True)
+            merged = merged[len(merged) - 1 - last_pos]
+            merged = merged[-self.max_bars:]
+
+            path = self._path(symbol, interval)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, 'wb') as fh: np.save(fh, merged)
+            os.replace(tmp, path)
+
+    def load(self, symbol, interval, since=None):
+        rec = self.read(symbol, interval)
+        if rec is None or len(rec) == 0: return pd.DataFrame(columns=BAR_FIELDS)
+        if since is not None:
+            rec = rec[rec['ts'] >= pd.Timestamp(since).as_unit('ns').value]
+        return _to_frame(rec)
+
+    def load_panel(self, symbols, interval, since=None):
+        frames = {}
+        for s in symbols:
+            df = self.load(s, interval, since)
+            if not df.empty: frames[s] = df
+        if not frames: return pd.DataFrame()
+        return pd.concat(frames, axis=1, sort=True)
+
+    def _backfill(self, symbols, interval, backfill_period, fetch, chunk_size):
+        for i in range(0, len(symbols), chunk_size):
+            chunk = symbols[i:i + chunk_size]
+            got = split_panel(fetch(chunk, period=backfill_period), chunk)
+            # డౌన్‌లోడ్ ఫెయిల్ / సింబల్ మిస్ అయితే ఏమీ రాయదు - లేకపోతే ఖాళీ ఫైల్ వల్ల తర్వాత 7 రోజుల డెల్టా మాత్రమే వచ్చి హిస్టరీ కట్ అవుతుంది
+            for s in chunk:
+                df = got.get(s)
+                if df is not None and 'Close' in df.columns and not df.dropna(subset=['Close']).empty: self.merge(s, interval, df)
+
+    def _adjusted_since_store(self, ref, df):
+        # ref = స్టోర్ లో లాస్ట్ ముందు (పూర్తైన) బార్; కొత్త డౌన్‌లోడ్ లో అదే బార్ Close adjust_tol కంటే మారితే True
+        if ref is None or 'Close' not in df.columns: return False
+        new = _to_records(df.dropna(subset=['Close']))
+        hit = new['Close'][new['ts'] == ref['ts']]
+        old_close = float(ref['Close'])
+        return len(hit) > 0 and old_close > 0 and abs(float(hit[0]) - old_close) / old_close > self.adjust_tol
+
+    def top_up(self, symbols, interval, backfill_period, fetch, chunk_size=200):
+        # 1. స్టోర్ లో లేని (లేదా ఖాళీ ఫైల్ ఉన్న) స్టాక్స్ కి పూర్తి backfill
+        missing = [s for s in symbols if self.last_timestamp(s, interval) is None]
+        self._backfill(missing, interval, backfill_period, fetch, chunk_size)
+
+        # 2. మిగతా వాటికి లాస్ట్ ముందు బార్ తేదీ నుండి డెల్టా (లాస్ట్ బార్ ఈరోజు లైవ్ క్యాండిల్ కావచ్చు, ముందుది పూర్తైనది - adjust చెక్ కి)
+        by_start, refs = {}, {}
+        for s in symbols:
+            if s in missing: continue
+            rec = self.read(s, interval)
+            if rec is None or len(rec) == 0: continue
+            refs[s] = rec[-2].copy() if len(rec) >= 2 else None
+            start = pd.Timestamp(int(rec['ts'][-2 if len(rec) >= 2 else -1])).normalize()
+            by_start.setdefault(start, []).append(s)
+
+        adjusted = []
+        for start, group in by_start.items():
+            for i in range(0, len(group), chunk_size):
+                chunk = group[i:i + chunk_size]
+                got = split_panel(fetch(chunk, start=start.strftime('%Y-%m-%d')), chunk)
+                for s, df in got.items():
+                    if self._adjusted_since_store(refs.get(s), df): adjusted.append(s)
+                    elif not df.dropna(subset=['Close']).empty: self.merge(s, interval, df)
+
+        # 3. స్ప్లిట్ / బోనస్ / డివిడెండ్ adjust అయిన సింబల్స్: పాత స్కేల్ బార్స్ తీసేసి పూర్తి backfill
+        if adjusted:
+            with self._lock:
+                for s in adjusted:
+                    try: os.remove(self._path(s, interval))
+                    except OSError: pass
+            self._backfill(adjusted, interval, backfill_period, fetch, chunk_size)
+        return adjusted
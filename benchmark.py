@@ -0,0 +1,157 @@
+import argparse
+import gc
+import json
+import resource
+import time
+import tracemalloc
+import numpy as np
+from synthetic_market import synthetic_symbols, daily_panel, intraday_panel, tick_last_bar
+from radar_engine import compute_daily_radar
+from intraday_state import IntradayIndicatorState
+from intraday_tags import compute_intraday_tags
+from strategy_engine import run_strategies, STRATEGIES
+from chart_figures import build_chart_figure
+from chart_decimation import bucket_ohlc, max_bars_for_width
+from terminal_tables import term_table_html
+from compact_snapshot import compact_radar, compact_charts, expand_radar, frame_nbytes
+
+# --- OFFLINE PIPELINE BENCHMARK ---
+# సింథటిక్ మార్కెట్ మీద ప్రతి స్టేజ్ విడివిడిగా: టైమ్, థ్రూపుట్ (ఐటమ్స్/సెకన్), పీక్ మెమరీ (tracemalloc).
+# వాడకం: python benchmark.py --sizes 100 700 3000 --charts 24 --repeat 3 [--json out.json]
+
+
+def timed(name, items, func, repeat=1, track_mem=True):
+    # బెస్ట్-ఆఫ్-N టైమ్ (నాయిస్ తక్కువ). tracemalloc హుక్స్ టైమింగ్ ని 3-4x స్లో చేస్తాయి,
+    # అందుకే పీక్ మెమరీ కోసం విడిగా ఇంకో రన్.
+    best, peak, result = None, 0, None
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        t0 = time.perf_counter()
+        result = func()
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    if track_mem:
+        gc.collect()
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, dict(stage=name, items=items, seconds=best, per_sec=items / best if best else float('inf'), peak_mb=peak / 2**20)
+
+
+def daily_chart(df_h):
+    # new.py "Daily Chart" ప్రిపరేషన్ లాగే
+    df_h = df_h.dropna(subset=['Close']).copy()
+    df_h['SMA_50'] = df_h['Close'].rolling(window=50).mean()
+    df_h['SMA_150'] = df_h['Close'].rolling(window=150).mean()
+    df_h['SMA_200'] = df_h['Close'].rolling(window=200).mean()
+    return df_h
+
+
+def run_size(n, charts=24, repeat=1, track_mem=True, seed=0):
+    symbols = synthetic_symbols(n)
+    stocks = symbols[1:]
+    daily = daily_panel(symbols, seed=seed)
+    panel_5m = intraday_panel(symbols, seed=seed + 1)
+    ticked = tick_last_bar(panel_5m, seed=seed + 2)
+    rows = []
+
+    radar, r = timed("radar indicators (daily)", len(symbols), lambda: compute_daily_radar(daily, 375), repeat, track_mem)
+    rows.append(r)
+    radar['T'] = radar['Fetch_T'].str.replace(".NS", "", regex=False)
+
+    # 5m: కోల్డ్ (పూర్తి హిస్టరీ) & వార్మ్ (లాస్ట్ బార్ టిక్ మాత్రమే, incremental state)
+    states = {}
+    def cold_5m():
+        states.clear()
+        out = {}
+        for s in symbols:
+            st_ = states[s] = IntradayIndicatorState()
+            out[s] = st_.update(panel_5m[s])
+        return out
+    charts_5m, r = timed("5m indicators (cold)", len(symbols), cold_5m, 1, track_mem)
+    rows.append(r)
+    charts_5m, r = timed("5m indicators (tick)", len(symbols), lambda: {s: states[s].update(ticked[s]) for s in symbols}, 1, track_mem)
+    rows.append(r)
+
+    # స్నాప్‌షాట్ లో పెట్టే కాంపాక్ట్ ఫార్మాట్ (రీఫ్రెష్ కి ఒకసారి) & సెషన్ లో expand (ప్రతి రీరన్)
+    compact, r = timed("compact snapshot", len(symbols), lambda: (compact_radar(radar), compact_charts(charts_5m)), repeat, track_mem)
+    r['mb_before'] = (frame_nbytes(radar) + frame_nbytes(charts_5m)) / 2**20
+    r['mb_after'] = (frame_nbytes(compact[0]) + frame_nbytes(compact[1])) / 2**20
+    rows.append(r)
+    _, r = timed("expand radar (per rerun)", len(radar), lambda: expand_radar(compact[0]), repeat, track_mem)
+    rows.append(r)
+
+    cols = radar.set_index('Fetch_T')
+    tag_syms = [s for s in stocks if s in cols.index and not charts_5m[s].empty]
+    def tags():
+        c = cols.loc[tag_syms]
+        return compute_intraday_tags(charts_5m, tag_syms, c['C'].to_numpy(), c['O'].to_numpy(), c['H'].to_numpy(), c['L'].to_numpy(),
+                                     nifty_dist_5m=0.3, with_trap=True, with_retest=True, with_orb=True)
+    tags_df, r = timed("intraday tags", len(tag_syms), tags, repeat, track_mem)
+    rows.append(r)
+
+    df_f = radar[radar['Fetch_T'].isin(tag_syms)].copy()
+    for c in tags_df.columns: df_f[c] = df_f['Fetch_T'].map(tags_df[c])
+    fno_mask = np.random.default_rng(seed).random(len(df_f)) < 0.3
+    _, r = timed("strategy masks (all)", len(df_f), lambda: run_strategies(df_f, list(STRATEGIES), charts_5m, fno_mask, 0.3), repeat, track_mem)
+    rows.append(r)
+
+    html, r = timed("html table", len(radar), lambda: term_table_html(radar, "BENCH", "term-head-buy"), repeat, track_mem)
+    rows.append(r)
+
+    chart_syms = tag_syms[:charts]
+    max_bars = max_bars_for_width(220)
+    def build(kind, compact, show_vol):
+        figs = []
+        for s in chart_syms:
+            df_c = charts_5m[s] if kind == "Intraday (5m)" else daily_chart(daily[s])
+            if compact: df_c = bucket_ohlc(df_c, max_bars)
+            figs.append(build_chart_figure(df_c, s, f"<b>{s}</b>", kind, False, show_vol, compact=compact))
+        return figs
+    figs, r = timed("figure build (5m)", len(chart_syms), lambda: build("Intraday (5m)", True, False), repeat, track_mem)
+    rows.append(r)
+    dfigs, r = timed("figure build (daily, vol)", len(chart_syms), lambda: build("Daily Chart", True, True), repeat, track_mem)
+    rows.append(r)
+    # st.plotly_chart ప్రతి రీరన్ లో ఇదే చేస్తుంది (to_dict + JSON)
+    _, r = timed("figure json", len(chart_syms), lambda: [f.to_json() for f in figs + dfigs], repeat, track_mem)
+    r['items'] = len(figs) + len(dfigs)
+    r['per_sec'] = r['items'] / r['seconds'] if r['seconds'] else float('inf')
+    rows.append(r)
+
+    for row in rows: row['symbols'] = n
+    return rows
+
+
+def print_rows(rows):
+    print(f"{'symbols':>7}  {'stage':<28}{'items':>7}{'ms':>11}{'items/s':>12}{'peak MB':>10}")
+    for r in rows:
+        size = f"  {r['mb_before']:.1f} -> {r['mb_after']:.1f} MB" if 'mb_after' in r else ""
+        print(f"{r['symbols']:>7}  {r['stage']:<28}{r['items']:>7}{r['seconds'] * 1000:>11.1f}{r['per_sec']:>12.0f}{r['peak_mb']:>10.1f}{size}", flush=True)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Offline benchmark for the radar / 5m / strategy / chart pipelines")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100, 700, 3000])
+    ap.add_argument("--charts", type=int, default=24, help="figures built per size (one grid page is 6)")
+    ap.add_argument("--repeat", type=int, default=1, help="best-of-N timing for the repeatable stages")
+    ap.add_argument("--no-mem", action="store_true", help="skip the extra tracemalloc pass per stage")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", help="write all rows to this file")
+    args = ap.parse_args(argv)
+
+    all_rows = []
+    for n in args.sizes:
+        rows = run_size(n, args.charts, args.repeat, not args.no_mem, args.seed)
+        print_rows(rows)
+        print()
+        all_rows.extend(rows)
+
+    print(f"process max RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+    if args.json:
+        with open(args.json, "w") as f: json.dump(all_rows, f, indent=1)
+    return all_rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import numpy as np
+
+# --- CHART PAYLOAD DECIMATION ---
+# కార్డ్ వెడల్పు కంటే ఎక్కువ క్యాండిల్స్ పంపినా కనిపించవు - బ్రౌజర్ మెమరీ & వెబ్‌సాకెట్ వేస్ట్.
+# వరుస బార్స్ ని బకెట్స్ గా కలిపి OHLC ఆకారం అలాగే ఉంచుతుంది (High=max, Low=min, Volume=sum).
+
+PX_PER_BAR = 2      # ఒక క్యాండిల్ కి కనీసం 2px లేకపోతే కనిపించదు
+
+
+def max_bars_for_width(card_px):
+    return max(20, int(card_px) // PX_PER_BAR)
+
+
+def bucket_ohlc(df, max_bars):
+    # బకెట్స్ చివరి నుండి అలైన్ - లాస్ట్ బకెట్ లోనే లైవ్ బార్, ముందు బకెట్స్ మారవు (ఫిగర్ ప్యాచ్ పని చేస్తుంది)
+    n = len(df)
+    if max_bars <= 0 or n <= max_bars: return df
+    k = -(-n // max_bars)
+    starts = np.unique(np.r_[0, np.arange(n % k, n, k)])
+    ends = np.r_[starts[1:], n] - 1
+
+    # మిగతా కాలమ్స్ (SMA / VWAP / EMA లైన్స్) బకెట్ చివరి వాల్యూ, టైమ్‌స్టాంప్ కూడా చివరి బార్ దే
+    out = df.iloc[ends].copy()
+    if 'Open' in df.columns: out['Open'] = df['Open'].to_numpy()[starts]
+    if 'High' in df.columns: out['High'] = np.fmax.reduceat(df['High'].to_numpy(dtype=float), starts)
+    if 'Low' in df.columns: out['Low'] = np.fmin.reduceat(df['Low'].to_numpy(dtype=float), starts)
+    if 'Volume' in df.columns: out['Volume'] = np.add.reduceat(np.nan_to_num(df['Volume'].to_numpy(dtype=float)), starts)
+    return out
@@ -0,0 +1,227 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+# --- CHART FIGURE BUILD / PATCH ---
+# ప్లాట్లీ ఫిగర్ బిల్డ్ & లాస్ట్ బార్ ప్యాచ్ - Streamlit లేకుండా (క్యాచ్ / రెండరింగ్ new.py లో).
+
+CHART_COLS = ['Open', 'High', 'Low', 'Close', 'Volume', 'VWAP', 'EMA_10', 'Vol_SMA_89', 'SMA_10', 'SMA_40', 'SMA_50', 'SMA_150', 'SMA_200']
+CHART_LINES = {
+    "Daily Chart": [('SMA_50', dict(color='#FFD700', width=1.5), '50 SMA'), ('SMA_150', dict(color='#00BFFF', width=1.5, dash='dash'), '150 SMA'), ('SMA_200', dict(color='#FF4500', width=2), '200 SMA')],
+    "Weekly Chart": [('SMA_10', dict(color='#FFD700', width=1.5), '10 Wk SMA'), ('SMA_40', dict(color='#FF4500', width=2), '40 Wk SMA')],
+}
+
+
+def chart_y_range(df_chart):
+    min_val = df_chart['Low'].min()
+    max_val = df_chart['High'].max()
+    y_padding = (max_val - min_val) * 0.15 if (max_val - min_val) != 0 else min_val * 0.005
+    return [min_val - y_padding, max_val + (y_padding * 2.5)]
+
+
+def chart_hover_text(df_chart):
+    # pandas స్ట్రింగ్ కాన్‌కాట్ బదులు ఒకే లిస్ట్ కాంప్రహెన్షన్ (ప్యాచ్ లో లాస్ట్ బార్ కి మాత్రమే)
+    chart_times = pd.to_datetime(df_chart.index)
+    if chart_times.tz is not None: chart_times = chart_times.tz_convert('Asia/Kolkata')
+    else: chart_times = chart_times.tz_localize('UTC').tz_convert('Asia/Kolkata')
+    ohlc = [df_chart[c].round(2).tolist() for c in ('Open', 'High', 'Low', 'Close')]
+    return [f"🕒 {t}<br>🟢 O: ₹{o}<br>📈 H: ₹{h}<br>📉 L: ₹{l}<br>🔴 C: ₹{c}" if o == o and h == h and l == l and c == c else None
+            for t, o, h, l, c in zip(chart_times.strftime('%d-%b %I:%M %p'), *ohlc)]
+
+
+def chart_candle_masks(df_chart):
+    # క్యాండిల్ కలర్స్ & వాల్యూమ్ బార్ కలర్స్ రెండూ ఈ ఒక్క మాస్క్ కంప్యూటేషన్ నుండే
+    bull = (df_chart['Close'] >= df_chart['Open']).to_numpy()
+    if 'Volume' in df_chart.columns:
+        vol_sma = df_chart.get('Vol_SMA_89', df_chart['Volume'].rolling(window=20, min_periods=1).mean())
+        hv_mask = (df_chart['Volume'] > (vol_sma * 1.618)).to_numpy()
+
+        vwap_val = df_chart.get('VWAP', pd.Series(0, index=df_chart.index))
+        ema10_val = df_chart.get('EMA_10', pd.Series(0, index=df_chart.index))
+
+        # VWAP & 10 EMA పైన ఉంటే బుల్లిష్ ట్రెండ్, కింద ఉంటే బేరిష్ ట్రెండ్
+        strong_up = ((df_chart['Close'] > vwap_val) & (df_chart['Close'] > ema10_val)).to_numpy()
+        strong_down = ((df_chart['Close'] < vwap_val) & (df_chart['Close'] < ema10_val)).to_numpy()
+    else:
+        hv_mask = strong_up = strong_down = np.zeros(len(df_chart), dtype=bool)
+
+    # సెపరేట్ మాస్క్‌లు
+    mask_hv_bull = hv_mask & strong_up & bull
+    mask_hv_bear = hv_mask & strong_down & ~bull
+    return dict(norm=~(mask_hv_bull | mask_hv_bear), hv_bull=mask_hv_bull, hv_bear=mask_hv_bear, hv=hv_mask, bull=bull)
+
+
+def chart_volume_colors(masks):
+    # 🔥 Advanced Volume Bar Colors (VWAP & 10 EMA Based) - లూప్ లేకుండా మాస్క్‌ల నుండి నేరుగా
+    # నార్మల్ వాల్యూమ్ కి మ్యూటెడ్ కలర్స్, హై వాల్యూమ్ కి Yellow/Orange (undefined trend)
+    colors = np.where(masks['bull'], 'rgba(46, 160, 67, 0.4)', 'rgba(218, 54, 51, 0.4)').astype(object)
+    colors[masks['hv']] = np.where(masks['bull'], '#FFD700', '#FF8C00')[masks['hv']]
+    # హై వాల్యూమ్ వచ్చి, ప్రైస్ వ్వాప్ & ఈఎంఏ పైన ఉంటే Bright Dark Green, కింద ఉంటే Deep Dark Red
+    colors[masks['hv_bull']] = '#00FF00'
+    colors[masks['hv_bear']] = '#8B0000'
+    return colors.tolist()
+
+
+def chart_tag_params(df_chart):
+    # ఇంట్రాడే VWAP / EMA ట్యాగ్స్ (లాస్ట్ వాల్యూ టెక్స్ట్, ఒకదానిపై ఒకటి పడకుండా anchor)
+    offset = -4 if len(df_chart) >= 4 else -1
+    tag_idx = df_chart.index[offset]
+    last_close = float(df_chart['Close'].iloc[-1])
+    has_vwap = 'VWAP' in df_chart.columns
+    has_ema = 'EMA_10' in df_chart.columns
+
+    last_vwap = float(df_chart['VWAP'].iloc[-1]) if has_vwap else 0
+    last_ema = float(df_chart['EMA_10'].iloc[-1]) if has_ema else 0
+    tag_y_vwap = float(df_chart['VWAP'].iloc[offset]) if has_vwap else 0
+    tag_y_ema = float(df_chart['EMA_10'].iloc[offset]) if has_ema else 0
+
+    v_anchor = "bottom" if last_close <= last_vwap else "top"
+    e_anchor = "bottom" if last_close <= last_ema else "top"
+    v_shift = 6 if v_anchor == "bottom" else -6
+    e_shift = 6 if e_anchor == "bottom" else -6
+
+    if has_vwap and has_ema and abs(tag_y_vwap - tag_y_ema) / (tag_y_vwap + 0.001) < 0.005:
+        if tag_y_vwap >= tag_y_ema:
+            v_anchor, v_shift = "bottom", 6
+            e_anchor, e_shift = "top", -6
+        else:
+            v_anchor, v_shift = "top", -6
+            e_anchor, e_shift = "bottom", 6
+
+    tags = {}
+    if has_vwap: tags['VWAP'] = dict(x=tag_idx, y=tag_y_vwap, text=f"V:{last_vwap:.1f}", yanchor=v_anchor, yshift=v_shift)
+    if has_ema: tags['EMA_10'] = dict(x=tag_idx, y=tag_y_ema, text=f"E:{last_ema:.1f}", yanchor=e_anchor, yshift=e_shift)
+    return tags
+
+
+def build_chart_figure(df_chart, fetch_sym, title_html, timeframe, show_crosshair, show_vol, alert_data=None, compact=False):
+    y_range = chart_y_range(df_chart)
+    rc = dict(row=1, col=1) if show_vol else dict()
+
+    if show_vol: fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.02, row_heights=[0.75, 0.25])
+    else: fig = go.Figure()
+
+    # 🔥 Advanced Price Candles (Volume Based Colors directly on Price)
+    # ప్రతి ట్రేస్ కి uid - లాస్ట్ బార్ ప్యాచ్ చేసేటప్పుడు ఏ ట్రేస్ ఏదో తెలియడానికి
+    masks = chart_candle_masks(df_chart)
+    mask_norm, mask_hv_bull, mask_hv_bear = masks['norm'], masks['hv_bull'], masks['hv_bear']
+    def am(col, mask): return np.where(mask, df_chart[col], np.nan)
+
+    # 1. Normal Candles (మ్యూటెడ్ కలర్స్)
+    fig.add_trace(go.Candlestick(
+        x=df_chart.index, open=am('Open', mask_norm), high=am('High', mask_norm), low=am('Low', mask_norm), close=am('Close', mask_norm),
+        increasing_line_color='#2ea043', increasing_fillcolor='#2ea043', increasing_line_width=1,
+        decreasing_line_color='#da3633', decreasing_fillcolor='#da3633', decreasing_line_width=1,
+        showlegend=False, hoverinfo='skip', uid='candle_norm'
+    ), **rc)
+
+    # 2. High Volume Bullish Candles (బ్రైట్ గ్రీన్)
+    if mask_hv_bull.any():
+        fig.add_trace(go.Candlestick(
+            x=df_chart.index, open=am('Open', mask_hv_bull), high=am('High', mask_hv_bull), low=am('Low', mask_hv_bull), close=am('Close', mask_hv_bull),
+            increasing_line_color='#00FF00', increasing_fillcolor='#00FF00', increasing_line_width=2,
+            decreasing_line_color='#00FF00', decreasing_fillcolor='#00FF00', decreasing_line_width=2,
+            showlegend=False, hoverinfo='skip', uid='candle_hv_bull'
+        ), **rc)
+
+    # 3. High Volume Bearish Candles (బ్రైట్ రెడ్)
+    if mask_hv_bear.any():
+        fig.add_trace(go.Candlestick(
+            x=df_chart.index, open=am('Open', mask_hv_bear), high=am('High', mask_hv_bear), low=am('Low', mask_hv_bear), close=am('Close', mask_hv_bear),
+            increasing_line_color='#FF0000', increasing_fillcolor='#FF0000', increasing_line_width=2,
+            decreasing_line_color='#FF0000', decreasing_fillcolor='#FF0000', decreasing_line_width=2,
+            showlegend=False, hoverinfo='skip', uid='candle_hv_bear'
+        ), **rc)
+
+    # 🔥 కాంపాక్ట్ మోడ్: క్రాస్‌హెయిర్ ఆఫ్ అయితే ఇన్విజిబుల్ హోవర్ స్కాటర్ అవసరం లేదు (పేలోడ్ సగం)
+    if show_crosshair or not compact:
+        fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['High'], mode='lines', line=dict(color='rgba(0,0,0,0)'), showlegend=False, hoverinfo='text' if show_crosshair else 'skip', text=chart_hover_text(df_chart), hovertemplate="%{text}<extra></extra>" if show_crosshair else None, name="", uid='hover'), **rc)
+
+    if timeframe in CHART_LINES:
+        for col, line, name in CHART_LINES[timeframe]:
+            if col in df_chart.columns: fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart[col], mode='lines', line=line, name=name, showlegend=False, hoverinfo='skip', uid=col), **rc)
+    else:
+        tags = chart_tag_params(df_chart)
+        if 'VWAP' in tags:
+            fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['VWAP'], mode='lines', line=dict(color='#FFD700', width=1.5, dash='dot'), showlegend=False, hoverinfo='skip', uid='VWAP'), **rc)
+            fig.add_annotation(**tags['VWAP'], showarrow=False, xanchor="right", xshift=-5, font=dict(color="#161b22", size=10, family="monospace", weight="bold"), bgcolor="#FFD700", borderpad=2, name='tag_VWAP', **rc)
+
+        if 'EMA_10' in tags:
+            fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['EMA_10'], mode='lines', line=dict(color='#00BFFF', width=1.5, dash='dash'), showlegend=False, hoverinfo='skip', uid='EMA_10'), **rc)
+            fig.add_annotation(**tags['EMA_10'], showarrow=False, xanchor="right", xshift=-5, font=dict(color="#161b22", size=10, family="monospace", weight="bold"), bgcolor="#00BFFF", borderpad=2, name='tag_EMA_10', **rc)
+
+    if show_vol:
+        fig.add_trace(go.Bar(x=df_chart.index, y=df_chart['Volume'], marker_color=chart_volume_colors(masks), showlegend=False, hoverinfo='skip', uid='volume'), row=2, col=1)
+        fig.update_layout(margin=dict(l=0, r=45 if show_crosshair else 5, t=0, b=0), height=275, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', xaxis_rangeslider_visible=False)
+    else:
+        fig.update_layout(margin=dict(l=0, r=45 if show_crosshair else 5, t=0, b=0), height=235, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', showlegend=False, xaxis_rangeslider_visible=False)
+    fig.add_annotation(text=title_html, xref="paper", yref="paper", x=0, xanchor="left", xshift=35, y=0.98, yanchor="top", showarrow=False, font=dict(size=13, color="#ffffff"), bgcolor="rgba(0,0,0,0)", borderwidth=0, name='title')
+
+    if alert_data:
+        line_c = "#3fb950" if "Above" in alert_data['type'] else "#f85149"
+        fig.add_hline(y=alert_data['price'], line_dash="dash", line_color=line_c, line_width=1.5, opacity=0.8, **rc)
+
+    if show_vol and show_crosshair:
+        fig.update_layout(hovermode='x', dragmode=False, hoverlabel=dict(bgcolor="#161b22", font_size=12, font_color="#ffffff", bordercolor="#30363d"))
+        fig.update_xaxes(showspikes=True, spikemode='across', spikethickness=1, spikedash='dot', spikecolor="rgba(255, 255, 255, 0.4)", showgrid=False, zeroline=False, showticklabels=False, showline=False, fixedrange=True)
+        fig.update_yaxes(showspikes=True, spikemode='across', spikethickness=1, spikedash='dot', spikecolor="rgba(255, 255, 255, 0.4)", showgrid=False, zeroline=False, showticklabels=True, side='right', tickfont=dict(color="#ffffff", size=10), showline=False, fixedrange=True, range=y_range, row=1, col=1)
+        fig.update_yaxes(showspikes=False, showgrid=False, zeroline=False, showticklabels=False, showline=False, fixedrange=True, row=2, col=1)
+    elif show_vol:
+        fig.update_layout(hovermode=False, dragmode=False)
+        fig.update_xaxes(showgrid=False, zeroline=False, showticklabels=False, showline=False, fixedrange=True)
+        fig.update_yaxes(showgrid=False, zeroline=False, showticklabels=False, showline=False, fixedrange=True, range=y_range, row=1, col=1)
+        fig.update_yaxes(showgrid=False, zeroline=False, showticklabels=False, showline=False, fixedrange=True, row=2, col=1)
+    elif show_crosshair:
+        fig.update_layout(hovermode='x', dragmode=False, hoverlabel=dict(bgcolor="#161b22", font_size=12, font_color="#ffffff", bordercolor="#30363d"))
+        fig.update_yaxes(showspikes=True, spikemode='across', spikethickness=0.2, spikedash='solid', spikecolor="rgba(255,255,255,0.4)", showgrid=False, zeroline=False, showticklabels=True, side='right', tickfont=dict(color="#ffffff", size=10), showline=False, fixedrange=True, range=y_range)
+        fig.update_xaxes(showspikes=False, showgrid=False, zeroline=False, showticklabels=False, showline=False, fixedrange=True)
+    else:
+        fig.update_layout(hovermode=False, dragmode=False)
+        fig.update_yaxes(showgrid=False, zeroline=False, showticklabels=False, showline=False, fixedrange=True, range=y_range)
+        fig.update_xaxes(showgrid=False, zeroline=False, showticklabels=False, showline=False, fixedrange=True)
+    return fig
+
+
+def patch_chart_figure(fig, df_chart, title_html):
+    # లాస్ట్ బార్ మాత్రమే మారితే (ముందు బార్స్ అన్నీ అవే) ట్రేస్ అర్రేస్ లో ఆ ఒక్క పాయింట్ నే మారుస్తాం.
+    # ఒరిజినల్ ఫిగర్ ని ముట్టుకోదు (వేరే సెషన్ దాన్ని సీరియలైజ్ చేస్తూ ఉండొచ్చు) - ప్యాచ్ అయిన కొత్త కాపీ ఇస్తుంది.
+    # కొత్త కలర్ కేటగిరీ కి ట్రేస్ లేకపోతే None -> పూర్తి రీబిల్డ్
+    i = len(df_chart) - 1
+    last = df_chart.iloc[i]
+    masks = chart_candle_masks(df_chart)
+    candles = (('candle_norm', masks['norm']), ('candle_hv_bull', masks['hv_bull']), ('candle_hv_bear', masks['hv_bear']))
+    uids = {t.uid for t in fig.data}
+    if any(mask[i] and uid not in uids for uid, mask in candles): return None
+    fig = go.Figure(fig)
+    traces = {t.uid: t for t in fig.data}
+    for uid, mask in candles:
+        if uid not in traces: continue
+        t = traces[uid]
+        upd = {}
+        for attr, col in (('open', 'Open'), ('high', 'High'), ('low', 'Low'), ('close', 'Close')):
+            arr = np.array(t[attr], dtype=float)
+            arr[i] = last[col] if mask[i] else np.nan
+            upd[attr] = arr
+        t.update(**upd)
+
+    if 'hover' in traces:
+        hover = traces['hover']
+        y = np.array(hover.y, dtype=float); y[i] = last['High']
+        text = list(hover.text); text[i] = chart_hover_text(df_chart.iloc[i:])[0]
+        hover.update(y=y, text=text)
+    for col in ('VWAP', 'EMA_10', 'SMA_10', 'SMA_40', 'SMA_50', 'SMA_150', 'SMA_200'):
+        if col in traces:
+            y = np.array(traces[col].y, dtype=float); y[i] = last[col]
+            traces[col].update(y=y)
+    if 'volume' in traces:
+        y = np.array(traces['volume'].y, dtype=float); y[i] = last['Volume']
+        colors = list(traces['volume'].marker.color); colors[i] = chart_volume_colors(masks)[i]
+        traces['volume'].update(y=y, marker_color=colors)
+
+    tags = chart_tag_params(df_chart) if any(t.startswith('tag_') for t in [a.name or '' for a in fig.layout.annotations]) else {}
+    for a in fig.layout.annotations:
+        if a.name == 'title': a.text = title_html
+        elif a.name and a.name.startswith('tag_') and a.name[4:] in tags: a.update(**tags[a.name[4:]])
+    fig.layout.yaxis.range = chart_y_range(df_chart)
+    return fig
@@ -0,0 +1,113 @@
+from collections.abc import Mapping
+import numpy as np
+import pandas as pd
+from shared_snapshot import readonly_frame
+
+# --- COMPACT SNAPSHOT FORMAT (స్నాప్‌షాట్ & కాష్ లేయర్స్ కోసం) ---
+# float64 బదులు float32 ప్రైసెస్ / ఇండికేటర్స్, Volume int64, సింబల్ & సెక్టార్ categorical,
+# రేడార్ bool కాలమ్స్ అన్నీ ఒకే 'Flags' బిట్‌ఫీల్డ్ లో. సెషన్ కి ఇచ్చేటప్పుడు expand_radar తో bool & str కాలమ్స్ మళ్ళీ.
+
+PRICE_DTYPE = np.float32
+VOLUME_DTYPE = np.int64
+VOLUME_FIELDS = {'Volume'}
+CATEGORY_COLUMNS = ['Fetch_T', 'T', 'Sector']
+# బిట్ పొజిషన్ = లిస్ట్ ఇండెక్స్ (కొత్త ఫ్లాగ్ ఎప్పుడూ చివరనే యాడ్ చేయాలి)
+FLAG_COLUMNS = ['VCP_Contract', 'VCP_Vol_Dry', 'Is_Swing', 'Is_W_Pullback', 'Narrow_CPR',
+                'Is_Index', 'Is_Sector', 'Is_Commodity']
+FLAG_BITS = {c: np.uint16(1 << i) for i, c in enumerate(FLAG_COLUMNS)}
+
+
+def _field(col):
+    # MultiIndex ప్యానెల్ లో (ticker, field), సాధారణ ఫ్రేమ్ లో field
+    return col[-1] if isinstance(col, tuple) else col
+
+
+def _target_dtype(name, dtype):
+    if _field(name) in VOLUME_FIELDS and dtype.kind in 'fiu': return VOLUME_DTYPE
+    if dtype == np.float64: return PRICE_DTYPE
+    return None
+
+
+def _compact_column(name, s):
+    dt = _target_dtype(name, s.dtype)
+    if dt is None: return s
+    return s.fillna(0).astype(dt) if dt is VOLUME_DTYPE and s.dtype.kind == 'f' else s.astype(dt)
+
+
+def compact_frame(df):
+    # OHLCV / ఇండికేటర్ ఫ్రేమ్స్ & yf.download ప్యానెల్స్ (MultiIndex కాలమ్స్) రెండింటికీ
+    if df is None or df.empty: return df
+    targets = {c: dt for c, dt in ((c, _target_dtype(c, t)) for c, t in df.dtypes.items()) if dt is not None}
+    if not targets: return df
+    # మిస్సింగ్ బార్స్ Volume NaN -> 0 (అక్కడ Close కూడా NaN, dropna(subset=['Close']) లో పోతాయి)
+    vols = [c for c, dt in targets.items() if dt is VOLUME_DTYPE and df[c].dtype.kind == 'f']
+    if len(targets) == df.shape[1] and all(t == np.float64 for t in df.dtypes):
+        # సాధారణ కేస్ (అన్నీ float64): ఒకే numpy కన్వర్షన్, కాలమ్ వారీ astype కంటే చాలా వేగం
+        # కొత్త అర్రేస్ ఈ ఫ్రేమ్ కి మాత్రమే సొంతం -> నేరుగా రీడ్-ఓన్లీ బ్లాక్స్ (షేర్డ్ స్నాప్‌షాట్ లో మళ్ళీ కాపీ అవసరం లేదు)
+        vals = df.to_numpy(dtype=float)
+        vol_pos = [i for i, c in enumerate(df.columns) if targets[c] is VOLUME_DTYPE]
+        px_pos = [i for i, c in enumerate(df.columns) if targets[c] is not VOLUME_DTYPE]
+        blocks = []
+        if px_pos: blocks.append((px_pos, vals[:, px_pos].astype(PRICE_DTYPE)))
+        if vol_pos: blocks.append((vol_pos, np.nan_to_num(vals[:, vol_pos], nan=0.0).astype(VOLUME_DTYPE)))
+        return readonly_frame(df.index, df.columns, blocks, df.attrs)
+    else:
+        if vols:
+            df = df.copy()
+            df[vols] = df[vols].fillna(0)
+        out = df.astype(targets)
+    out.attrs = dict(df.attrs)
+    return out
+
+
+def compact_charts(charts):
+    # {Fetch_T: df_day} - ఖాళీ ఫ్రేమ్స్ అలాగే
+    return {sym: compact_frame(df) for sym, df in charts.items()}
+
+
+def compact_radar(df):
+    if df is None or df.empty: return df
+    flags = np.zeros(len(df), dtype=np.uint16)
+    cols = {}
+    for c in df.columns:
+        if c in FLAG_BITS:
+            flags[df[c].fillna(False).to_numpy(dtype=bool)] |= FLAG_BITS[c]
+        elif c in CATEGORY_COLUMNS:
+            cols[c] = df[c].astype('category')
+        else:
+            cols[c] = _compact_column(c, df[c])
+    cols['Flags'] = flags
+    out = pd.DataFrame(cols, index=df.index)
+    out.attrs = dict(df.attrs, columns=list(df.columns))
+    return out
+
+
+def flag(df, name):
+    # bool కాలమ్ expand చేయకుండానే ఒక ఫ్లాగ్ మాస్క్
+    return (df['Flags'].to_numpy() & FLAG_BITS[name]) != 0
+
+
+def expand_radar(cdf):
+    # Flags -> bool కాలమ్స్, ఒరిజినల్ కాలమ్ ఆర్డర్ లో. ప్రైస్ కాలమ్స్ float32 గానే (CoW - కాపీ కాదు)
+    if cdf is None or cdf.empty or 'Flags' not in cdf.columns:
+        return pd.DataFrame() if cdf is None else cdf.copy()
+    attrs = dict(cdf.attrs)
+    order = attrs.pop('columns', None) or [c for c in cdf.columns if c != 'Flags'] + FLAG_COLUMNS
+    cols = {}
+    for c in order:
+        if c in FLAG_BITS: cols[c] = flag(cdf, c)
+        elif c in CATEGORY_COLUMNS and isinstance(cdf[c].dtype, pd.CategoricalDtype):
+            # సెషన్ కోడ్ .map(dict).fillna("") చేస్తుంది - categorical మీద అది ఫెయిల్, అందుకే స్ట్రింగ్స్ గా డీకోడ్
+            cols[c] = cdf[c].astype(cdf[c].cat.categories.dtype)
+        elif c in cdf.columns: cols[c] = cdf[c]
+    out = pd.DataFrame(cols, index=cdf.index, copy=False)
+    out.attrs = attrs
+    return out
+
+
+def frame_nbytes(obj):
+    # DataFrame / {సింబల్: DataFrame} డీప్ మెమరీ (బైట్స్) - పెర్ఫ్ ప్యానెల్ & బెంచ్‌మార్క్ కోసం
+    if isinstance(obj, Mapping): return sum(frame_nbytes(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)): return sum(frame_nbytes(v) for v in obj)
+    if isinstance(obj, (pd.DataFrame, pd.Series)): return int(obj.memory_usage(deep=True).sum()) if isinstance(obj, pd.DataFrame) else int(obj.memory_usage(deep=True))
+    return 0
@@ -0,0 +1,349 @@
+import asyncio
+import glob
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from urllib.parse import quote
+import pandas as pd
+
+# --- RECORD / REPLAY DATA SOURCE (yfinance, Dhan, mfapi, Google Sheets) ---
+# DATA_MODE=live   : నేరుగా అసలు API లు (డిఫాల్ట్, ఏ ఓవర్‌హెడ్ లేదు)
+# DATA_MODE=record : అసలు API కాల్ చేసి, రెస్పాన్స్ + పట్టిన టైమ్ DATA_DIR లో సేవ్ చేస్తుంది
+# DATA_MODE=replay : నెట్‌వర్క్ / క్రెడెన్షియల్స్ లేకుండా రికార్డ్ అయిన రెస్పాన్సెస్ మాత్రమే
+# REPLAY_LATENCY_MS: ప్రతి కాల్ కి ఫిక్స్‌డ్ డిలే (ms), లేదా "recorded" అంటే రికార్డ్ అయిన టైమ్ నే
+# REPLAY_SPEED     : recorded డిలేస్ & టిక్ గ్యాప్స్ ని ఎన్ని రెట్లు వేగంగా ప్లే చేయాలి (2 = రెండింతలు)
+
+DATA_MODES = ("live", "record", "replay")
+# ఇవి ప్రతి రన్ కి మారుతాయి (ఈరోజు తేదీ నుండి), కీ లో కలిపితే replay ఎప్పుడూ మిస్ అవుతుంది
+VOLATILE_ARGS = {"start", "end", "from_date", "to_date", "startDate", "endDate"}
+# రెస్పాన్స్ మీద ప్రభావం లేని ఆర్గ్యుమెంట్స్
+IGNORED_ARGS = {"progress", "threads", "timeout", "retry_if", "low_memory"}
+
+
+class ReplayMiss(KeyError):
+    pass
+
+
+def _canon(value):
+    # కీ కోసం స్థిరమైన JSON: స్ట్రింగ్ లిస్ట్స్ సార్ట్ (ఆర్డర్ మారినా అదే కీ)
+    if isinstance(value, dict):
+        return {str(k): _canon(v) for k, v in sorted(value.items()) if k not in VOLATILE_ARGS and k not in IGNORED_ARGS}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_canon(v) for v in value]
+        return sorted(items) if all(isinstance(v, str) for v in items) else items
+    if isinstance(value, (str, int, float, bool)) or value is None: return value
+    return str(value)
+
+
+def _atomic_dump(path, obj):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, 'wb') as fh: pickle.dump(obj, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def _load(path):
+    try:
+        with open(path, 'rb') as fh: return pickle.load(fh)
+    except (OSError, EOFError, pickle.UnpicklingError): return None
+
+
+class Tape:
+    # ఒక్కో (source, name, args) కి ఒక pickle ఫైల్: {key, result, elapsed}
+    def __init__(self, root, latency=0.0, speed=1.0):
+        self.root = root
+        self.latency = latency          # సెకన్లు, లేదా "recorded"
+        self.speed = max(float(speed), 1e-6)
+        self.stats = {"recorded": 0, "hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+    def key(self, source, name, args=(), kwargs=None):
+        return json.dumps([source, name, _canon(list(args)), _canon(kwargs or {})], ensure_ascii=False)
+
+    def _path(self, source, key):
+        return os.path.join(self.root, source, hashlib.blake2b(key.encode(), digest_size=16).hexdigest() + ".pkl")
+
+    def _count(self, what):
+        with self._lock: self.stats[what] += 1
+
+    def delay(self, elapsed):
+        if self.latency == "recorded": return max(0.0, elapsed or 0.0) / self.speed
+        return self.latency
+
+    def save(self, source, key, result, elapsed):
+        _atomic_dump(self._path(source, key), {"key": key, "result": result, "elapsed": elapsed})
+        self._count("recorded")
+
+    def lookup(self, source, key):
+        rec = _load(self._path(source, key))
+        self._count("misses" if rec is None else "hits")
+        return rec
+
+    def call(self, mode, source, name, func, args=(), kwargs=None, miss=ReplayMiss):
+        kwargs = kwargs or {}
+        if mode == "live": return func(*args, **kwargs)
+        key = self.key(source, name, args, kwargs)
+        if mode == "record":
+            t0 = time.perf_counter()
+            result = func(*args, **kwargs)
+            self.save(source, key, result, time.perf_counter() - t0)
+            return result
+        rec = self.lookup(source, key)
+        if rec is None:
+            if miss is ReplayMiss: raise ReplayMiss(key)
+            return miss
+        wait = self.delay(rec.get("elapsed"))
+        if wait > 0: time.sleep(wait)
+        return rec["result"]
+
+
+# --- yf.download: ఒక్కో టిక్కర్ కి విడిగా ---
+# అదే చంక్స్ / ఆర్డర్ లో మళ్ళీ అడగకపోయినా (BarStore డెల్టా, సెషన్ బట్టి మారే 5m లిస్ట్) replay పని చేయాలి,
+# అందుకే టిక్కర్ వారీగా (interval) ఫ్రేమ్ మెర్జ్ చేసి ఉంచి, అడిగిన వాటిని మళ్ళీ group_by='ticker' ఆకారంలో కలుపుతాం.
+
+def _split_download(frame, tickers):
+    if frame is None or frame.empty: return {}
+    if not isinstance(frame.columns, pd.MultiIndex):
+        return {tickers[0]: frame} if len(tickers) == 1 else {}
+    present = set(frame.columns.get_level_values(0))
+    return {t: frame[t] for t in tickers if t in present}
+
+
+class _YahooTape:
+    def __init__(self, tape):
+        self.tape = tape
+        self._lock = threading.Lock()
+
+    def _path(self, ticker, interval):
+        return os.path.join(self.tape.root, "yf", interval, quote(ticker, safe='') + ".pkl")
+
+    def record(self, tickers, interval, frame, elapsed):
+        share = elapsed / max(len(tickers), 1)
+        for t, df in _split_download(frame, tickers).items():
+            df = df.dropna(how='all')
+            if df.empty: continue
+            path = self._path(t, interval)
+            with self._lock:
+                old = _load(path)
+                if old is not None:
+                    # అదే టైమ్‌స్టాంప్ మళ్ళీ వస్తే కొత్త వాల్యూ (ఈరోజు లైవ్ క్యాండిల్)
+                    df = pd.concat([old["frame"], df])
+                    df = df[~df.index.duplicated(keep='last')].sort_index()
+                _atomic_dump(path, {"frame": df, "elapsed": share})
+            self.tape._count("recorded")
+
+    def replay(self, tickers, interval, start=None, group_by=None):
+        frames, elapsed = {}, 0.0
+        for t in tickers:
+            rec = _load(self._path(t, interval))
+            self.tape._count("misses" if rec is None else "hits")
+            if rec is None: continue
+            df = rec["frame"]
+            if start is not None:
+                since = pd.Timestamp(start)
+                idx = df.index.tz_localize(None) if getattr(df.index, 'tz', None) is not None else df.index
+                df = df[idx >= since]
+            if not df.empty: frames[t] = df
+            elapsed += rec.get("elapsed") or 0.0
+        wait = self.tape.delay(elapsed)
+        if wait > 0: time.sleep(wait)
+        if not frames: return pd.DataFrame()
+        # yf లాగే: ఒకే స్ట్రింగ్ టిక్కర్ (group_by లేకుండా) అయితే ఫ్లాట్ కాలమ్స్
+        if len(tickers) == 1 and group_by is None: return frames[tickers[0]]
+        return pd.concat(frames, axis=1, sort=True)
+
+
+# --- DHAN / SHEETS ప్రాక్సీలు ---
+
+class _RecordingProxy:
+    # ప్రతి మెథడ్ కాల్ రెస్పాన్స్ రికార్డ్ అవుతుంది, మిగతా యాట్రిబ్యూట్స్ అసలు ఆబ్జెక్ట్ నుండే
+    def __init__(self, target, tape, source, methods=None):
+        self._target, self._tape, self._source, self._methods = target, tape, source, methods
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr) or (self._methods is not None and name not in self._methods): return attr
+        def recorded(*args, **kwargs):
+            return self._tape.call("record", self._source, name, attr, args, kwargs)
+        recorded.__name__ = name
+        return recorded
+
+
+class _ReplayProxy:
+    # రికార్డ్ అయిన కాల్స్ నుండి మాత్రమే; writes (methods లో లేనివి) no-op
+    def __init__(self, tape, source, methods=None, miss=ReplayMiss):
+        self._tape, self._source, self._methods, self._miss = tape, source, methods, miss
+
+    def __getattr__(self, name):
+        if name.startswith('__'): raise AttributeError(name)
+        if self._methods is not None and name not in self._methods:
+            return lambda *args, **kwargs: None
+        def replayed(*args, **kwargs):
+            return self._tape.call("replay", self._source, name, None, args, kwargs, miss=self._miss)
+        replayed.__name__ = name
+        return replayed
+
+
+# Dhan REST ఫెయిల్ అయినప్పుడు ఇచ్చే ఆకారం లోనే - కాలర్ YF ఫాల్‌బ్యాక్ కి వెళ్తుంది
+DHAN_MISS = {"status": "failure", "remarks": "replay: not recorded", "data": []}
+SHEET_READS = {"get_all_records", "get_all_values", "row_values", "col_values"}
+
+
+# --- TICK STREAM (DhanFeed) ---
+
+class _TickRecorder:
+    # on_message ముందు ప్రతి టిక్ ని (రికార్డింగ్ మొదలైనప్పటి నుండి సెకన్లు, మెసేజ్) JSONL గా
+    def __init__(self, path):
+        self.path = path
+        self.t0 = time.monotonic()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def wrap(self, on_message):
+        def on_tick(instance, message):
+            line = json.dumps({"t": round(time.monotonic() - self.t0, 4), "m": message}, default=str, ensure_ascii=False)
+            with self._lock:
+                with open(self.path, 'a', encoding='utf-8') as fh: fh.write(line + "\n")
+            on_message(instance, message)
+        return on_tick
+
+
+class ReplayFeed:
+    # marketfeed.DhanFeed స్టాండ్-ఇన్: రికార్డ్ అయిన టిక్స్ అదే గ్యాప్స్ తో (REPLAY_SPEED తో స్కేల్), సబ్‌స్క్రైబ్ అయిన ids కి మాత్రమే
+    def __init__(self, path, instruments, on_connect=None, on_message=None, speed=1.0, loop=False):
+        self.path, self.speed, self.loop = path, max(float(speed), 1e-6), loop
+        self.on_connect, self.on_message = on_connect, on_message
+        self.ids = {str(i[1]) for i in instruments}
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def subscribe_symbols(self, instruments):
+        with self._lock: self.ids.update(str(i[1]) for i in instruments)
+
+    def unsubscribe_symbols(self, instruments):
+        with self._lock: self.ids.difference_update(str(i[1]) for i in instruments)
+
+    def close_connection(self):
+        self._stop.set()
+
+    def _ticks(self):
+        if not self.path or not os.path.exists(self.path): return
+        with open(self.path, encoding='utf-8') as fh:
+            for line in fh:
+                try: rec = json.loads(line)
+                except ValueError: continue
+                yield float(rec.get("t", 0)), rec.get("m")
+
+    def run_forever(self):
+        if self.on_connect: self.on_connect(self)
+        while not self._stop.is_set():
+            start, first = time.monotonic(), None
+            for t, msg in self._ticks():
+                if first is None: first = t
+                wait = (t - first) / self.speed - (time.monotonic() - start)
+                if wait > 0 and self._stop.wait(wait): return
+                if self._stop.is_set(): return
+                if not isinstance(msg, dict): continue
+                sid = str(msg.get('security_id', msg.get('SecurityId')))
+                with self._lock: wanted = sid in self.ids
+                if wanted and self.on_message: self.on_message(self, msg)
+            if not self.loop: break
+            if first is None and self._stop.wait(1.0): return
+
+
+class DataSource:
+    def __init__(self, mode="live", root=".data_replay", latency_ms="0", speed=1.0, loop_ticks=False):
+        if mode not in DATA_MODES: raise ValueError(f"DATA_MODE must be one of {DATA_MODES}, got {mode!r}")
+        self.mode = mode
+        latency = "recorded" if str(latency_ms).strip().lower() == "recorded" else float(latency_ms or 0) / 1000.0
+        self.tape = Tape(root, latency, speed)
+        self.yahoo = _YahooTape(self.tape)
+        self.speed, self.loop_ticks = float(speed), loop_ticks
+        self._recorder = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, default_root):
+        return cls(os.environ.get("DATA_MODE", "live").strip().lower(),
+                   os.environ.get("DATA_DIR", default_root),
+                   os.environ.get("REPLAY_LATENCY_MS", "0"),
+                   float(os.environ.get("REPLAY_SPEED", "1")),
+                   os.environ.get("REPLAY_LOOP_TICKS", "0") == "1")
+
+    @property
+    def replaying(self):
+        return self.mode == "replay"
+
+    @property
+    def stats(self):
+        return dict(self.tape.stats)
+
+    # yfinance
+    def yf_download(self, tickers, **kwargs):
+        tlist = [tickers] if isinstance(tickers, str) else list(tickers)
+        interval = kwargs.get("interval", "1d")
+        if self.mode == "replay":
+            return self.yahoo.replay(tlist, interval, kwargs.get("start"), kwargs.get("group_by"))
+        import yfinance as yf
+        t0 = time.perf_counter()
+        frame = yf.download(tickers, **kwargs)
+        if self.mode == "record": self.yahoo.record(tlist, interval, frame, time.perf_counter() - t0)
+        return frame
+
+    def yf_info(self, symbol):
+        def fetch(sym):
+            import yfinance as yf
+            return dict(yf.Ticker(sym).info)
+        return self.tape.call(self.mode, "yf_info", "info", fetch, (symbol,))
+
+    # HTTP (Dhan scrip master CSV)
+    def read_csv(self, url, **kwargs):
+        return self.tape.call(self.mode, "csv", url, pd.read_csv, (url,), kwargs)
+
+    # mfapi (AsyncHttpClient.get_json)
+    async def get_json(self, http, url, **kwargs):
+        if self.mode == "live": return await http.get_json(url, **kwargs)
+        key = self.tape.key("http", url, (), kwargs)
+        if self.mode == "record":
+            t0 = time.perf_counter()
+            result = await http.get_json(url, **kwargs)
+            self.tape.save("http", key, result, time.perf_counter() - t0)
+            return result
+        rec = self.tape.lookup("http", key)
+        if rec is None: raise ReplayMiss(key)
+        wait = self.tape.delay(rec.get("elapsed"))
+        if wait > 0: await asyncio.sleep(wait)
+        return rec["result"]
+
+    # Dhan REST క్లయింట్ (replay లో క్లయింట్ అవసరం లేదు)
+    def dhan_client(self, client=None):
+        if self.mode == "replay": return _ReplayProxy(self.tape, "dhan", miss=DHAN_MISS)
+        if self.mode == "record": return _RecordingProxy(client, self.tape, "dhan")
+        return client
+
+    # gspread వర్క్‌షీట్: reads రికార్డ్/replay, replay లో writes no-op
+    def worksheet(self, name, ws=None):
+        if self.mode == "replay": return _ReplayProxy(self.tape, f"sheet_{name}", SHEET_READS, miss=[])
+        if self.mode == "record": return _RecordingProxy(ws, self.tape, f"sheet_{name}", SHEET_READS)
+        return ws
+
+    # DhanFeed టిక్స్
+    def tick_path(self, day=None):
+        day = day or pd.Timestamp.now().strftime('%Y%m%d')
+        return os.path.join(self.tape.root, "ticks", f"{day}.jsonl")
+
+    def latest_tick_path(self):
+        files = sorted(glob.glob(os.path.join(self.tape.root, "ticks", "*.jsonl")))
+        return files[-1] if files else None
+
+    def tap_ticks(self, on_message):
+        if self.mode != "record": return on_message
+        with self._lock:
+            if self._recorder is None: self._recorder = _TickRecorder(self.tick_path())
+        return self._recorder.wrap(on_message)
+
+    def replay_feed(self, instruments, on_connect=None, on_message=None):
+        return ReplayFeed(self.latest_tick_path(), instruments, on_connect, on_message, self.speed, self.loop_ticks)
@@ -0,0 +1,427 @@
+import argparse
+import sys
+import numpy as np
+import pandas as pd
+from synthetic_market import synthetic_symbols, daily_panel, intraday_panel
+from radar_engine import compute_daily_radar
+from intraday_state import IntradayIndicatorState
+from intraday_tags import compute_intraday_tags, TAG_COLUMNS
+from strategy_engine import run_strategies, STRATEGIES, EXTRA_STRATEGIES, SCORE_STRATEGIES
+
+# --- VECTORIZED vs LEGACY LOOP EQUIVALENCE CHECK ---
+# సింథటిక్ మార్కెట్ మీద పాత iterrows() / per-symbol లూప్స్ (new.py నుండి అలాగే కాపీ) మరియు
+# వెక్టరైజ్డ్ వెర్షన్స్ ఒకే ఫలితం ఇస్తున్నాయో చెక్ చేస్తుంది. మాస్క్ / ట్యాగ్ కోడ్ మార్చిన ప్రతిసారీ రన్ చేయండి.
+# వాడకం: python equivalence_check.py --sizes 100 300 --seeds 0 1 2   (మిస్‌మ్యాచ్ ఉంటే exit code 1)
+
+WATCHLIST_MODES = ["Day Trading Stocks 🚀", "High Score Stocks 🔥", "🤖 Today's AI Predictions", "Swing Trading 📈"]
+
+
+def synthetic_inputs(n, seed=0):
+    # రేడార్ (daily) + ఈరోజు 5m చార్ట్స్ {Fetch_T: df_day}, new.py process_5m_panel లాగే
+    symbols = synthetic_symbols(n)
+    radar = compute_daily_radar(daily_panel(symbols, seed=seed), 375)
+    panel_5m = intraday_panel(symbols, seed=seed + 1)
+    charts = {s: IntradayIndicatorState().update(panel_5m[s]) for s in symbols}
+    return radar, charts
+
+
+def nifty_dist_5m(charts):
+    n_day = charts.get("^NSEI", pd.DataFrame())
+    if n_day.empty: return 0.1
+    n_ltp, n_vwap = n_day['Close'].iloc[-1], n_day['VWAP'].iloc[-1]
+    return abs(n_ltp - n_vwap) / n_vwap * 100 if n_vwap > 0 else 0.1
+
+
+# --- LEGACY: new.py per-symbol 5m tag loop (user-019 ముందు) ---
+def legacy_intraday_tags(charts, radar, nifty_dist_5m, watchlist_mode):
+    alpha_tags, trend_scores, retest_tags, orb_tags = {}, {}, {}, {}
+    rows = radar.set_index('Fetch_T')
+    for sym, df_day in charts.items():
+        if sym not in rows.index or df_day.empty: continue
+        sym_row = rows.loc[sym]
+        last_price = df_day['Close'].iloc[-1]
+        last_vwap = df_day['VWAP'].iloc[-1]
+        net_chg = sym_row['C']
+
+        alpha_tag = ""
+        if len(df_day) >= 50:
+            stock_dist_5m = abs(last_price - last_vwap) / last_vwap * 100 if last_vwap > 0 else 0
+            effective_nifty_5m = max(nifty_dist_5m, 0.25)
+            if stock_dist_5m > (effective_nifty_5m * 3): alpha_tag = "🚀Alpha-Mover"
+            elif stock_dist_5m > (effective_nifty_5m * 2): alpha_tag = "💪Nifty-Beater"
+
+        one_sided_tag = ""
+        trend_bonus = 0
+        if len(df_day) >= 12 and last_vwap > 0:
+            if net_chg > 0: trend_candles = (df_day['Low'] >= df_day['VWAP']).sum()
+            else: trend_candles = (df_day['High'] <= df_day['VWAP']).sum()
+            total_candles = len(df_day)
+            if (trend_candles / total_candles) >= 0.85:
+                current_gap_pct = abs(last_price - last_vwap) / last_vwap * 100
+                if current_gap_pct >= 1.50: one_sided_tag = "🌊Mega-1.5%"; trend_bonus = 7
+                elif current_gap_pct >= 1.00: one_sided_tag = "🌊Super-1.0%"; trend_bonus = 5
+                elif current_gap_pct >= 0.50: one_sided_tag = "🌊Trend-0.5%"; trend_bonus = 3
+                else: one_sided_tag = "🌊Trend"; trend_bonus = 1
+
+        trap_tag = ""
+        trap_bonus = 0
+        if watchlist_mode in ["Day Trading Stocks 🚀", "High Score Stocks 🔥"] and len(df_day) >= 6 and last_vwap > 0:
+            curr_open = float(df_day['Open'].iloc[-1])
+            day_open, day_high, day_low = sym_row['O'], sym_row['H'], sym_row['L']
+            morning_spike = (day_high - day_open) / day_open * 100 if day_open > 0 else 0
+            morning_drop = (day_open - day_low) / day_open * 100 if day_open > 0 else 0
+
+            if morning_spike >= 1.0 and last_price < last_vwap:
+                if (last_price < curr_open): trap_tag = "🎯 Reversal Sell 🩸"; trap_bonus = 6
+            elif morning_drop >= 1.0 and last_price > last_vwap:
+                if (last_price > curr_open): trap_tag = "🎯 Reversal Buy 🚀"; trap_bonus = 6
+
+        alpha_tags[sym] = f"{alpha_tag} {one_sided_tag} {trap_tag}".strip()
+        trend_scores[sym] = trend_bonus + trap_bonus
+
+        retest_tag = ""
+        if watchlist_mode in ["Day Trading Stocks 🚀", "🤖 Today's AI Predictions"] and len(df_day) >= 4:
+            c1 = df_day.iloc[-1]
+            c2 = df_day.iloc[-2]
+            if c1['Close'] > c1['VWAP'] and c1['EMA_10'] > c1['VWAP']:
+                if (c2['Low'] <= c2['EMA_10'] * 1.002) and (c2['Close'] >= c2['EMA_10']):
+                    max_allowed_price = c1['EMA_10'] * 1.003
+                    if c1['Close'] > c1['Open'] and (c1['EMA_10'] <= c1['Close'] <= max_allowed_price): retest_tag = "BUY_RETEST"
+            elif c1['Close'] < c1['VWAP'] and c1['EMA_10'] < c1['VWAP']:
+                if (c2['High'] >= c2['EMA_10'] * 0.998) and (c2['Close'] <= c2['EMA_10']):
+                    min_allowed_price = c1['EMA_10'] * 0.997
+                    if c1['Close'] < c1['Open'] and (min_allowed_price <= c1['Close'] <= c1['EMA_10']): retest_tag = "SELL_RETEST"
+        retest_tags[sym] = retest_tag
+
+        orb_tag = ""
+        if watchlist_mode in ["Day Trading Stocks 🚀", "High Score Stocks 🔥", "🤖 Today's AI Predictions"] and len(df_day) >= 3:
+            orb_high = df_day['High'].iloc[0:3].max()
+            orb_low = df_day['Low'].iloc[0:3].min()
+            if last_price > orb_high and last_price > last_vwap:
+                orb_tag = "ORB_BUY"
+            elif last_price < orb_low and last_price < last_vwap:
+                orb_tag = "ORB_SELL"
+        orb_tags[sym] = orb_tag
+    return pd.DataFrame({'AlphaTag': alpha_tags, 'Trend_Score': trend_scores, 'Retest_Tag': retest_tags, 'ORB_Tag': orb_tags}, columns=TAG_COLUMNS)
+
+
+# --- LEGACY: new.py AI Predictions strategy loop (user-020 ముందు) ---
+# fno_mask = UNIVERSE.contains(df_filtered, U_FNO). Max Fire S ని .at తో మారుస్తుంది, అందుకే ప్రతి స్ట్రాటజీ తర్వాత S కాపీ.
+def legacy_strategies(df_filtered, strats_to_run, processed_charts, fno_mask, nifty_dist, apply_fib_strict):
+    df_filtered = df_filtered.copy()
+    base_buy = (df_filtered['P'] > df_filtered['W_EMA10']) & (df_filtered['P'] > df_filtered['W_EMA50']) & (df_filtered['P'] > df_filtered['VWAP'])
+    base_sell = (df_filtered['P'] < df_filtered['W_EMA10']) & (df_filtered['P'] < df_filtered['W_EMA50']) & (df_filtered['P'] < df_filtered['VWAP'])
+
+    s_vwap = (df_filtered['H'] + df_filtered['L'] + df_filtered['P']) / 3
+    stock_vwap_dist = (df_filtered['P'] - s_vwap).abs() / s_vwap * 100
+
+    open_drive_bull = pd.Series(False, index=df_filtered.index)
+    open_drive_bear = pd.Series(False, index=df_filtered.index)
+    for idx, r in df_filtered.iterrows():
+        tkr = r['Fetch_T']
+        if tkr in processed_charts and len(processed_charts[tkr]) >= 2:
+            df_hist = processed_charts[tkr]
+
+            day_open = df_hist['Open'].iloc[0]
+            low_after_1st = df_hist['Low'].iloc[1:].min()
+            high_after_1st = df_hist['High'].iloc[1:].max()
+
+            if (day_open - low_after_1st) <= (r['P'] * 0.003):
+                open_drive_bull[idx] = True
+            if (high_after_1st - day_open) <= (r['P'] * 0.003):
+                open_drive_bear[idx] = True
+        else:
+            if (r['O'] - r['L']) <= (r['P'] * 0.003):
+                open_drive_bull[idx] = True
+            if (r['H'] - r['O']) <= (r['P'] * 0.003):
+                open_drive_bear[idx] = True
+
+    fib_range = (df_filtered['H'] - df_filtered['L'])
+    fib_buy_0382 = df_filtered['H'] - (fib_range * 0.382)
+    fib_buy_0618 = df_filtered['H'] - (fib_range * 0.618)
+    fib_sell_0382 = df_filtered['L'] + (fib_range * 0.382)
+    fib_sell_0618 = df_filtered['L'] + (fib_range * 0.618)
+
+    fib_buy_mask = (df_filtered['P'] > df_filtered['VWAP']) & (df_filtered['P'] <= fib_buy_0382) & (df_filtered['P'] >= fib_buy_0618) & (fib_range > 0)
+    fib_sell_mask = (df_filtered['P'] < df_filtered['VWAP']) & (df_filtered['P'] >= fib_sell_0382) & (df_filtered['P'] <= fib_sell_0618) & (fib_range > 0)
+
+    out = []
+    for strat in strats_to_run:
+        c_buy = pd.Series(False, index=df_filtered.index)
+        c_sell = pd.Series(False, index=df_filtered.index)
+        icon_str = ""
+
+        if strat == "🔥 Live Power Mover (Last 2 Candles)":
+            buy_mask = pd.Series(False, index=df_filtered.index)
+            sell_mask = pd.Series(False, index=df_filtered.index)
+
+            for idx, r in df_filtered.iterrows():
+                tkr = r['Fetch_T']
+                if tkr in processed_charts and len(processed_charts[tkr]) >= 2:
+                    df_hist = processed_charts[tkr]
+                    if 'Volume' in df_hist.columns and 'Vol_SMA_89' in df_hist.columns and 'EMA_10' in df_hist.columns:
+                        vol_fire = df_hist['Volume'] > (df_hist['Vol_SMA_89'] * 1.618)
+                        b_cond = vol_fire & (df_hist['Close'] >= df_hist['EMA_10'])
+                        s_cond = vol_fire & (df_hist['Close'] < df_hist['EMA_10'])
+                        if b_cond.iloc[-2:].sum() >= 1: buy_mask[idx] = True
+                        if s_cond.iloc[-2:].sum() >= 1: sell_mask[idx] = True
+
+            c_buy = base_buy & buy_mask
+            c_sell = base_sell & sell_mask
+            icon_str = "🔥 Live Breakout"
+
+        if strat == "🔥 Live Power Mover (Last 2 Candles)":
+            buy_mask = pd.Series(False, index=df_filtered.index)
+            sell_mask = pd.Series(False, index=df_filtered.index)
+
+            for idx, r in df_filtered.iterrows():
+                tkr = r['Fetch_T']
+                if tkr in processed_charts and len(processed_charts[tkr]) >= 2:
+                    df_hist = processed_charts[tkr]
+                    if 'Volume' in df_hist.columns and 'Vol_SMA_375' in df_hist.columns and 'EMA_10' in df_hist.columns:
+                        vol_fire = df_hist['Volume'] > (df_hist['Vol_SMA_375'].shift(1) * 1.5)
+                        b_cond = vol_fire & (df_hist['Close'] > df_hist['Close'].shift(1)) & (df_hist['Close'] >= df_hist['EMA_10'])
+                        s_cond = vol_fire & (df_hist['Close'] < df_hist['Close'].shift(1)) & (df_hist['Close'] <= df_hist['EMA_10'])
+                        if b_cond.iloc[-2:].sum() >= 1: buy_mask[idx] = True
+                        if s_cond.iloc[-2:].sum() >= 1: sell_mask[idx] = True
+
+            c_buy = base_buy & buy_mask
+            c_sell = base_sell & sell_mask
+            icon_str = "🔥 Live Breakout"
+
+        elif strat == "🚀 All-Day Volume Spikes (Max Fire)":
+            buy_mask = pd.Series(False, index=df_filtered.index)
+            sell_mask = pd.Series(False, index=df_filtered.index)
+
+            df_fno = df_filtered[fno_mask]
+
+            for idx, r in df_fno.iterrows():
+                tkr = r['Fetch_T']
+                if tkr in processed_charts and len(processed_charts[tkr]) >= 2:
+                    df_hist = processed_charts[tkr]
+
+                    if 'Volume' in df_hist.columns and 'Vol_SMA_375' in df_hist.columns and 'EMA_10' in df_hist.columns:
+                        ltp = df_hist['Close'].iloc[-1]
+                        vwap = df_hist['VWAP'].iloc[-1]
+                        ema10 = df_hist['EMA_10'].iloc[-1]
+
+                        is_buy_trend = (ltp > vwap) and (ltp > ema10)
+                        is_sell_trend = (ltp < vwap) and (ltp < ema10)
+
+                        vol_fire = df_hist['Volume'] > (df_hist['Vol_SMA_375'].shift(1) * 1.5)
+
+                        valid_buy_fire = vol_fire & (df_hist['Close'] > df_hist['Close'].shift(1)) & (df_hist['Close'] >= df_hist['EMA_10'])
+                        valid_sell_fire = vol_fire & (df_hist['Close'] < df_hist['Close'].shift(1)) & (df_hist['Close'] <= df_hist['EMA_10'])
+
+                        tot_buy = valid_buy_fire.sum()
+                        tot_sell = valid_sell_fire.sum()
+
+                        fire_score = 0
+
+                        if is_buy_trend and tot_buy >= 1 and tot_buy > tot_sell:
+                            buy_mask[idx] = True
+                            fire_score = (tot_buy - tot_sell) * 10
+                        elif is_sell_trend and tot_sell >= 1 and tot_sell > tot_buy:
+                            sell_mask[idx] = True
+                            fire_score = (tot_sell - tot_buy) * 10
+
+                        if fire_score > 0:
+                            price_score = int(abs(r['Day_C']) * 5)
+                            s_vwap = r.get('VWAP', r['P'])
+                            s_dist = abs(r['P'] - s_vwap) / s_vwap * 100 if s_vwap > 0 else 0
+                            safe_nifty = max(nifty_dist, 0.2)
+
+                            rs_score = 0
+                            if s_dist >= (safe_nifty * 4): rs_score = 20
+                            elif s_dist >= (safe_nifty * 3): rs_score = 15
+                            elif s_dist >= (safe_nifty * 2): rs_score = 10
+                            elif s_dist >= (safe_nifty * 1.5): rs_score = 5
+
+                            df_filtered.at[idx, 'S'] = df_filtered.at[idx, 'S'] + fire_score + price_score + rs_score
+
+            c_buy = base_buy & buy_mask & (df_filtered['Day_C'] >= 1.0)
+            c_sell = base_sell & sell_mask & (df_filtered['Day_C'] <= -1.0)
+            icon_str = "🚀 Max Fire"
+        elif strat == "⚡ Intraday Pro Breakout (Top 5)":
+            c_buy = base_buy & (df_filtered['P'] > df_filtered['O']) & ((df_filtered['H'] - df_filtered['P']) <= (df_filtered['H'] - df_filtered['L']) * 0.30)
+            c_sell = base_sell & (df_filtered['P'] < df_filtered['O']) & ((df_filtered['P'] - df_filtered['L']) <= (df_filtered['H'] - df_filtered['L']) * 0.30)
+            icon_str = "⚡"
+        elif strat == "🌊 One Sided Only":
+            c_buy = base_buy & (~df_filtered['AlphaTag'].str.contains("Reversal", na=False)) & (df_filtered['Day_C'] >= 1.5) & (stock_vwap_dist >= (nifty_dist * 1.5)) & (df_filtered['Trend_Score'] >= 3) & open_drive_bull
+            c_sell = base_sell & (~df_filtered['AlphaTag'].str.contains("Reversal", na=False)) & (df_filtered['Day_C'] <= -1.5) & (stock_vwap_dist >= (nifty_dist * 1.5)) & (df_filtered['Trend_Score'] >= 3) & open_drive_bear
+            icon_str = "🌊"
+        elif strat == "🔄 VWAP Reversal":
+            c_buy = base_buy & (df_filtered['AlphaTag'].str.contains("Reversal Buy", na=False)) & (df_filtered['Day_C'] >= 1.5) & (stock_vwap_dist >= (nifty_dist * 1.5))
+            c_sell = base_sell & (df_filtered['AlphaTag'].str.contains("Reversal Sell", na=False)) & (df_filtered['Day_C'] <= -1.5) & (stock_vwap_dist >= (nifty_dist * 1.5))
+            icon_str = "🔄"
+        elif strat == "🎯 Reversals Only":
+            c_buy = base_buy & (df_filtered['AlphaTag'].str.contains("Reversal Buy", na=False)) & (df_filtered['Day_C'] >= 1.0)
+            c_sell = base_sell & (df_filtered['AlphaTag'].str.contains("Reversal Sell", na=False)) & (df_filtered['Day_C'] <= -1.0)
+            icon_str = "🎯"
+        elif strat == "🏹 Rubber Band Stretch":
+            c_buy = base_buy & (~df_filtered['AlphaTag'].str.contains("Reversal", na=False)) & (df_filtered['Day_C'] >= 2.5)
+            c_sell = base_sell & (~df_filtered['AlphaTag'].str.contains("Reversal", na=False)) & (df_filtered['Day_C'] <= -2.5)
+            icon_str = "🏹"
+        elif strat == "🏄‍♂️ Momentum Ignition":
+            c_buy = base_buy & (~df_filtered['AlphaTag'].str.contains("Reversal", na=False)) & (df_filtered['P'] > df_filtered['O']) & (df_filtered['Day_C'] >= 2.0) & ((df_filtered['H'] - df_filtered['P']) <= (df_filtered['H'] - df_filtered['L']) * 0.15)
+            c_sell = base_sell & (~df_filtered['AlphaTag'].str.contains("Reversal", na=False)) & (df_filtered['P'] < df_filtered['O']) & (df_filtered['Day_C'] <= -2.0) & ((df_filtered['P'] - df_filtered['L']) <= (df_filtered['H'] - df_filtered['L']) * 0.15)
+            icon_str = "🏄‍♂️"
+        elif strat == "💥 Narrow CPR Breakout":
+            c_buy = base_buy & (df_filtered['Narrow_CPR'] == True) & (df_filtered['Day_C'] >= 1.0)
+            c_sell = base_sell & (df_filtered['Narrow_CPR'] == True) & (df_filtered['Day_C'] <= -1.0)
+            icon_str = "💥"
+        elif strat == "🧲 10-EMA Retest (Best Entry)":
+            ai_buy = (df_filtered['P'] > df_filtered['VWAP']) & (df_filtered['VolX'] >= 1.5) & (df_filtered.get('Bull_P', 0) >= 75)
+            ai_sell = (df_filtered['P'] < df_filtered['VWAP']) & (df_filtered['VolX'] >= 1.5) & (df_filtered.get('Bear_P', 0) >= 75)
+            dt_buy = ((df_filtered['Trend_Score'] >= 3) | (df_filtered['Narrow_CPR'] == True) | (df_filtered['AlphaTag'].str.contains("Reversal Buy", na=False)) | (df_filtered['Day_C'] >= 1.5))
+            dt_sell = ((df_filtered['Trend_Score'] >= 3) | (df_filtered['Narrow_CPR'] == True) | (df_filtered['AlphaTag'].str.contains("Reversal Sell", na=False)) | (df_filtered['Day_C'] <= -1.5))
+            c_buy = base_buy & (ai_buy | dt_buy) & (df_filtered['Retest_Tag'] == "BUY_RETEST")
+            c_sell = base_sell & (ai_sell | dt_sell) & (df_filtered['Retest_Tag'] == "SELL_RETEST")
+            icon_str = "🧲"
+        elif strat == "📉 FIB Retracement (0.382)":
+            c_buy = base_buy & fib_buy_mask
+            c_sell = base_sell & fib_sell_mask
+            icon_str = "📉 FIB"
+        elif strat == "📈 Minervini Trend Template (VCP)":
+            cond1 = (df_filtered['P'] > df_filtered['SMA150']) & (df_filtered['P'] > df_filtered['SMA200'])
+            cond2 = df_filtered['SMA150'] > df_filtered['SMA200']
+            cond3 = df_filtered['SMA200'] > df_filtered['SMA200_20D']
+            cond4 = (df_filtered['SMA50'] > df_filtered['SMA150']) & (df_filtered['SMA50'] > df_filtered['SMA200'])
+            cond5 = df_filtered['P'] > df_filtered['SMA50']
+            cond6 = df_filtered['P'] >= (df_filtered['Low52W'] * 1.30)
+            cond7 = df_filtered['P'] >= (df_filtered['High52W'] * 0.75)
+
+            c_buy = base_buy & cond1 & cond2 & cond3 & cond4 & cond5 & cond6 & cond7
+            c_sell = pd.Series(False, index=df_filtered.index)
+            icon_str = "📈 M-VCP"
+
+        elif strat == "📉 Strict VCP (Price & Vol Contraction)":
+            cond1 = (df_filtered['P'] > df_filtered['SMA150']) & (df_filtered['P'] > df_filtered['SMA200'])
+            cond2 = df_filtered['SMA150'] > df_filtered['SMA200']
+            cond3 = df_filtered['SMA200'] > df_filtered['SMA200_20D']
+            cond4 = (df_filtered['SMA50'] > df_filtered['SMA150']) & (df_filtered['SMA50'] > df_filtered['SMA200'])
+            cond5 = df_filtered['P'] > df_filtered['SMA50']
+            cond6 = df_filtered['P'] >= (df_filtered['Low52W'] * 1.30)
+            cond7 = df_filtered['P'] >= (df_filtered['High52W'] * 0.75)
+            vcp_cond = (df_filtered['VCP_Contract'] == True) & (df_filtered['VCP_Vol_Dry'] == True)
+
+            c_buy = base_buy & cond1 & cond2 & cond3 & cond4 & cond5 & cond6 & cond7 & vcp_cond
+            c_sell = pd.Series(False, index=df_filtered.index)
+            icon_str = "📉 VCP"
+        elif strat == "🌅 15-Min ORB (Opening Range Breakout)":
+            c_buy = base_buy & (df_filtered['ORB_Tag'] == "ORB_BUY") & (df_filtered['VolX'] >= 1.2)
+            c_sell = base_sell & (df_filtered['ORB_Tag'] == "ORB_SELL") & (df_filtered['VolX'] >= 1.2)
+            icon_str = "🌅 ORB"
+
+        if apply_fib_strict and strat != "📉 FIB Retracement (0.382)":
+            c_buy = c_buy & fib_buy_mask
+            c_sell = c_sell & fib_sell_mask
+            icon_str = icon_str + " + 📉FIB"
+        out.append((strat, icon_str, c_buy, c_sell, df_filtered['S'].copy()))
+    return out
+
+
+def vector_strategies(df_filtered, strats_to_run, processed_charts, fno_mask, nifty_dist, apply_fib_strict):
+    # new.py లో run_strategies + SCORE_STRATEGIES కి S += fire_delta లాగే
+    df_filtered = df_filtered.copy()
+    results, fire_delta = run_strategies(df_filtered, strats_to_run, processed_charts, fno_mask, nifty_dist=nifty_dist, fib_strict=apply_fib_strict)
+    out = []
+    for strat, icon_str, c_buy, c_sell in results:
+        if strat in SCORE_STRATEGIES: df_filtered['S'] = df_filtered['S'] + fire_delta
+        out.append((strat, icon_str, c_buy, c_sell, df_filtered['S'].copy()))
+    return out
+
+
+def vector_intraday_tags(charts, radar, nifty_dist_5m, watchlist_mode):
+    # new.py లో compute_intraday_tags కాల్ లాగే (watchlist మోడ్ -> with_* ఫ్లాగ్స్)
+    rows = radar.set_index('Fetch_T')
+    syms = [s for s, df_day in charts.items() if s in rows.index and not df_day.empty]
+    c = rows.loc[syms]
+    return compute_intraday_tags(
+        charts, syms, net_chg=c['C'].to_numpy(), day_o=c['O'].to_numpy(), day_h=c['H'].to_numpy(), day_l=c['L'].to_numpy(),
+        nifty_dist_5m=nifty_dist_5m,
+        with_trap=watchlist_mode in ["Day Trading Stocks 🚀", "High Score Stocks 🔥"],
+        with_retest=watchlist_mode in ["Day Trading Stocks 🚀", "🤖 Today's AI Predictions"],
+        with_orb=watchlist_mode in ["Day Trading Stocks 🚀", "High Score Stocks 🔥", "🤖 Today's AI Predictions"])
+
+
+def diff_frames(old, new):
+    # కాలమ్ వారీ మిస్‌మ్యాచ్ అయిన సింబల్స్ {కాలమ్: [సింబల్స్]}
+    new = new.reindex(old.index)
+    out = {}
+    for c in old.columns:
+        a, b = old[c], new[c]
+        bad = ~((a == b) | (a.isna() & b.isna()))
+        if bad.any(): out[c] = list(old.index[bad])
+    return out
+
+
+def check_tags(radar, charts):
+    rows, fired = [], {}
+    nd = nifty_dist_5m(charts)
+    for mode in WATCHLIST_MODES:
+        old = legacy_intraday_tags(charts, radar, nd, mode)
+        bad = diff_frames(old, vector_intraday_tags(charts, radar, nd, mode))
+        for c in TAG_COLUMNS: fired[c] = fired.get(c, 0) + int((old[c] != (0 if pd.api.types.is_numeric_dtype(old[c]) else "")).sum())
+        rows.append(dict(check=f"tags / {mode}", items=len(old), mismatches=sum(len(v) for v in bad.values()), detail=bad))
+    return rows, fired
+
+
+def strategy_frame(radar, charts, seed=0):
+    # new.py df_filtered లాగే: రేడార్ + 5m ట్యాగ్స్ (అన్ని ట్యాగ్స్ ఆన్ ఉండే మోడ్) + ర్యాండమ్ FNO మాస్క్
+    f = radar[~radar['Fetch_T'].str.startswith('^')].copy()
+    tags = vector_intraday_tags(charts, radar, nifty_dist_5m(charts), "Day Trading Stocks 🚀")
+    for c in TAG_COLUMNS: f[c] = f['Fetch_T'].map(tags[c])
+    f['AlphaTag'] = f['AlphaTag'].fillna("")
+    f['Trend_Score'] = f['Trend_Score'].fillna(0)
+    fno_mask = pd.Series(np.random.default_rng(seed).random(len(f)) < 0.3, index=f.index)
+    return f, fno_mask
+
+
+def check_strategies(radar, charts, seed=0):
+    f, fno_mask = strategy_frame(radar, charts, seed)
+    names = list(STRATEGIES) + list(EXTRA_STRATEGIES)
+    rows, fired = [], {}
+    for nifty_dist in (0.1, 0.5):
+        for fib_strict in (False, True):
+            old = legacy_strategies(f, names, charts, fno_mask, nifty_dist, fib_strict)
+            new = vector_strategies(f, names, charts, fno_mask, nifty_dist, fib_strict)
+            for (name, o_icon, o_buy, o_sell, o_s), (_, n_icon, n_buy, n_sell, n_s) in zip(old, new):
+                bad = {}
+                if o_icon != n_icon: bad['icon'] = [o_icon, n_icon]
+                for side, a, b in (('buy', o_buy, n_buy), ('sell', o_sell, n_sell)):
+                    a, b = a.fillna(False).astype(bool), b.fillna(False).astype(bool)
+                    if not a.equals(b): bad[side] = list(f.loc[a != b, 'Fetch_T'])
+                s_bad = ~np.isclose(o_s.to_numpy(dtype=float), n_s.to_numpy(dtype=float), rtol=1e-12, atol=1e-9, equal_nan=True)
+                if s_bad.any(): bad['S'] = list(f.loc[s_bad, 'Fetch_T'])
+                fired[name] = fired.get(name, 0) + int(o_buy.fillna(False).sum() + o_sell.fillna(False).sum())
+                rows.append(dict(check=f"{name} / nifty={nifty_dist} fib={fib_strict}", items=len(f),
+                                 mismatches=sum(len(v) for k, v in bad.items() if k != 'icon') + ('icon' in bad), detail=bad))
+    return rows, fired
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Check vectorized tags and strategy masks against the legacy per-symbol loops")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[300])
+    ap.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2])
+    args = ap.parse_args(argv)
+
+    failed = 0
+    for n in args.sizes:
+        for seed in args.seeds:
+            radar, charts = synthetic_inputs(n, seed)
+            for label, (rows, fired) in (("tags", check_tags(radar, charts)), ("strategies", check_strategies(radar, charts, seed))):
+                bad = [r for r in rows if r['mismatches']]
+                failed += sum(r['mismatches'] for r in rows)
+                print(f"{n:>6} seed={seed:<3} {label:<11}{len(rows):>4} checks  {len(bad):>4} failing", flush=True)
+                for r in bad:
+                    print(f"         {r['check']}: {r['mismatches']} mismatches")
+                    for c, syms in r['detail'].items(): print(f"           {c}: {syms[:10]}")
+                # 0 అంటే ఆ కండిషన్ ఈ డేటా మీద అసలు ఫైర్ కాలేదు (టెస్ట్ కాలేదు)
+                print(f"{'':>17}fired: " + ", ".join(f"{c}={k}" for c, k in fired.items()))
+    print("OK" if not failed else f"FAILED: {failed} mismatches")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
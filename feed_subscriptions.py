@@ -0,0 +1,98 @@
+import threading
+from datetime import datetime
+
+# --- LIVE FEED SUBSCRIPTION MANAGER (sharded websocket connections) ---
+# స్కాన్ చేసే యూనివర్స్ (Nifty50 + F&O + Mid + Small + Portfolio) + pins/alerts కి మాత్రమే సబ్‌స్క్రైబ్.
+# ఒక కనెక్షన్ లిమిట్ దాటితే ఇంకో కనెక్షన్ (shard) ఓపెన్ చేస్తుంది. లిస్ట్ మారితే ఆ shard మాత్రమే రీసబ్‌స్క్రైబ్.
+
+FEED_MAX_PER_CONNECTION = 5000
+FEED_MAX_CONNECTIONS = 5
+NSE_EQ, QUOTE_MODE = 1, 17
+
+
+def _instruments(sec_ids):
+    return [(NSE_EQ, str(s), QUOTE_MODE) for s in sec_ids]
+
+
+class _Shard:
+    def __init__(self, make_feed, sec_ids):
+        self.make_feed = make_feed
+        self.ids = list(sec_ids)
+        self.feed, self.thread = None, None
+
+    def start(self):
+        self.feed = self.make_feed(_instruments(self.ids))
+        self.thread = threading.Thread(target=self.feed.run_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        close = getattr(self.feed, 'close_connection', None)
+        if close:
+            try: close()
+            except Exception: pass
+        self.feed, self.thread = None, None
+
+    def apply(self, added, removed):
+        # DhanFeed subscribe/unsubscribe సపోర్ట్ చేస్తే లైవ్ కనెక్షన్ లోనే, లేకపోతే shard రీస్టార్ట్
+        sub = getattr(self.feed, 'subscribe_symbols', None)
+        unsub = getattr(self.feed, 'unsubscribe_symbols', None)
+        if self.feed is not None and sub and unsub:
+            try:
+                if removed: unsub(_instruments(removed))
+                if added: sub(_instruments(added))
+                return
+            except Exception: pass
+        self.stop()
+        if self.ids: self.start()
+
+
+class FeedSubscriptionManager:
+    def __init__(self, make_feed, per_connection=FEED_MAX_PER_CONNECTION, max_connections=FEED_MAX_CONNECTIONS):
+        self.make_feed = make_feed
+        self.per_connection = per_connection
+        self.max_connections = max_connections
+        self.shards = []
+        self._sticky, self._sticky_day = set(), None
+        self._lock = threading.Lock()
+
+    def subscribed(self):
+        return [s for shard in self.shards for s in shard.ids]
+
+    def sync(self, universe_ids, extra_ids=()):
+        # pins/alerts ఏ సెషన్ నుండి వచ్చినా ఆ రోజంతా ఉంచుతాం (సెషన్స్ మధ్య flapping రాకుండా)
+        with self._lock:
+            today = datetime.now().date()
+            if self._sticky_day != today: self._sticky, self._sticky_day = set(), today
+            self._sticky.update(str(s) for s in extra_ids)
+
+            wanted = list(dict.fromkeys([str(s) for s in universe_ids] + sorted(self._sticky)))
+            wanted = wanted[:self.per_connection * self.max_connections]
+            wanted_set, current = set(wanted), set(self.subscribed())
+            if wanted_set == current: return False
+
+            added = [s for s in wanted if s not in current]
+            changed = {}
+            for shard in self.shards:
+                gone = [s for s in shard.ids if s not in wanted_set]
+                if gone:
+                    shard.ids = [s for s in shard.ids if s in wanted_set]
+                    changed[id(shard)] = (shard, [], gone)
+
+            for shard in self.shards:
+                room = self.per_connection - len(shard.ids)
+                if room <= 0 or not added: continue
+                take, added = added[:room], added[room:]
+                shard.ids.extend(take)
+                _, _, gone = changed.get(id(shard), (shard, [], []))
+                changed[id(shard)] = (shard, take, gone)
+
+            for shard, take, gone in changed.values(): shard.apply(take, gone)
+            while added:
+                shard = _Shard(self.make_feed, added[:self.per_connection])
+                added = added[self.per_connection:]
+                shard.start()
+                self.shards.append(shard)
+
+            for shard in [sh for sh in self.shards if not sh.ids]: shard.stop()
+            self.shards = [sh for sh in self.shards if sh.ids]
+            return True
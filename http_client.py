@@ -0,0 +1,104 @@
+import asyncio
+import random
+import threading
+import time
+import weakref
+import concurrent.futures
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+
+# --- ASYNC HTTP FETCH LAYER (keep-alive pool + per-host limits) ---
+# asyncio తో కోరౌటీన్స్, అసలు I/O ఒకే requests.Session (keep-alive కనెక్షన్ పూల్) మీద.
+# ప్రతి హోస్ట్ కి: concurrency లిమిట్ (semaphore), token-bucket రేట్ లిమిట్, jitter తో retries.
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    # థ్రెడ్-సేఫ్: టోకెన్ ఎప్పుడు దొరుకుతుందో రిజర్వ్ చేసి, అంతసేపు asyncio.sleep
+    def __init__(self, rate, burst):
+        self.rate, self.burst = float(rate), float(burst)
+        self.tokens, self.stamp = float(burst), time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    async def acquire(self):
+        wait = self.reserve()
+        if wait > 0: await asyncio.sleep(wait)
+
+
+class RetryableResult(Exception):
+    pass
+
+
+def is_retryable(e):
+    # తాత్కాలిక ఫెయిల్యూర్స్ మాత్రమే retry: నెట్‌వర్క్ / టైమ్‌అవుట్ / 429 & 5xx / retry_if చెప్పిన రిజల్ట్.
+    # 404, తప్పు JSON, SDK ఎర్రర్స్ వెంటనే raise (backoff & రేట్ లిమిట్ టోకెన్స్ వృధా కాకుండా)
+    if isinstance(e, (RetryableResult, requests.ConnectionError, requests.Timeout)): return True
+    if isinstance(e, requests.HTTPError):
+        return e.response is not None and e.response.status_code in RETRY_STATUS
+    return False
+
+
+class AsyncHttpClient:
+    def __init__(self, host_limits, default_limit=(5, 5, 4), retries=3, backoff=0.5, pool_size=32):
+        # host_limits: {host: (requests/sec, burst, max concurrent)}
+        self.host_limits = host_limits
+        self.default_limit = default_limit
+        self.retries, self.backoff = retries, backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=pool_size)
+        self._buckets = {}
+        self._sems = weakref.WeakKeyDictionary()   # event loop -> {host: Semaphore}
+        self._lock = threading.Lock()
+
+    def _limits(self, host):
+        rate, burst, conc = self.host_limits.get(host, self.default_limit)
+        with self._lock:
+            if host not in self._buckets: self._buckets[host] = TokenBucket(rate, burst)
+            bucket = self._buckets[host]
+        sems = self._sems.setdefault(asyncio.get_running_loop(), {})
+        if host not in sems: sems[host] = asyncio.Semaphore(conc)
+        return bucket, sems[host]
+
+    async def call(self, host, func, *args, retry_if=None, **kwargs):
+        bucket, sem = self._limits(host)
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.retries + 1):
+            try:
+                async with sem:
+                    await bucket.acquire()
+                    result = await loop.run_in_executor(self.executor, lambda: func(*args, **kwargs))
+                if retry_if is not None and retry_if(result): raise RetryableResult(result)
+                return result
+            except Exception as e:
+                if not is_retryable(e): raise
+                if attempt == self.retries:
+                    if isinstance(e, RetryableResult): return e.args[0]
+                    raise
+                # exponential backoff + full jitter (అన్నీ ఒకేసారి మళ్ళీ కొట్టకుండా)
+                await asyncio.sleep(random.uniform(0, self.backoff * (2 ** attempt)))
+
+    async def get_json(self, url, timeout=10, **kwargs):
+        def _get():
+            res = self.session.get(url, timeout=timeout, **kwargs)
+            res.raise_for_status()
+            return res.json()
+        return await self.call(urlparse(url).netloc, _get)
+
+    def run(self, coros):
+        # Streamlit స్క్రిప్ట్ థ్రెడ్ నుండి సింక్ గా పిలవడానికి: అన్నీ gather చేసి ఆర్డర్ లోనే రిజల్ట్స్
+        async def _gather():
+            return await asyncio.gather(*coros, return_exceptions=True)
+        return asyncio.run(_gather())
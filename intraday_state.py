@@ -0,0 +1,204 @@
+import threading
+from collections import deque
+import numpy as np
+import pandas as pd
+
+# --- INCREMENTAL 5-MIN INDICATOR STATE ---
+# ప్రతి స్టాక్ కి EMA / ATR / Vol SMA / VWAP accumulators దాచి ఉంచుతుంది.
+# కొత్త క్యాండిల్ వచ్చినా, లాస్ట్ క్యాండిల్ అప్డేట్ అయినా O(1) లో లెక్కిస్తుంది (లాస్ట్ commit క్యాండిల్ తర్వాత రోస్ మాత్రమే చదువుతుంది).
+# రోజు మారినప్పుడు లేదా హిస్టరీ మారినప్పుడు (correction) మాత్రమే పూర్తి రీకాల్క్యులేషన్.
+
+OHLC = ['Open', 'High', 'Low', 'Close']
+EMA_SPANS = (10, 20, 50)
+VOL_WINDOW = 375
+ATR_ALPHA = 2 / 14
+INDICATOR_COLS = ['EMA_10', 'EMA_20', 'EMA_50', 'Vol_SMA_375', 'TR', 'ATR_13', 'Typical_Price', 'VWAP']
+
+
+def compute_5m_indicators(df_s):
+    # పూర్తి హిస్టరీ మీద ఒకేసారి (పాత process_5m_data లాజిక్)
+    df_s['EMA_10'] = df_s['Close'].ewm(span=10, adjust=False).mean()
+    df_s['EMA_20'] = df_s['Close'].ewm(span=20, adjust=False).mean()
+    df_s['EMA_50'] = df_s['Close'].ewm(span=50, adjust=False).mean()
+
+    if 'Volume' in df_s.columns:
+        df_s['Vol_SMA_375'] = df_s['Volume'].rolling(window=VOL_WINDOW, min_periods=1).mean()
+    else:
+        df_s['Vol_SMA_375'] = 0
+
+    df_s['TR'] = pd.concat([
+        df_s['High'] - df_s['Low'],
+        (df_s['High'] - df_s['Close'].shift(1)).abs(),
+        (df_s['Low'] - df_s['Close'].shift(1)).abs()
+    ], axis=1).max(axis=1)
+    df_s['ATR_13'] = df_s['TR'].ewm(span=13, adjust=False).mean()
+
+    df_s.index = pd.to_datetime(df_s.index)
+    target_date = df_s.index[-1].date()
+    df_day = df_s[df_s.index.date == target_date].copy()
+
+    if not df_day.empty:
+        df_day['Typical_Price'] = (df_day['High'] + df_day['Low'] + df_day['Close']) / 3
+        if 'Volume' in df_day.columns and df_day['Volume'].sum() > 0:
+            vol_cumsum = df_day['Volume'].cumsum()
+            df_day['VWAP'] = (df_day['Typical_Price'] * df_day['Volume']).cumsum() / vol_cumsum.replace(0, np.nan)
+            df_day['VWAP'] = df_day['VWAP'].fillna(df_day['Typical_Price'].expanding().mean())
+        else:
+            df_day['VWAP'] = df_day['Typical_Price'].expanding().mean()
+    return df_s, df_day
+
+
+class IntradayIndicatorState:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.last_ts, self.last_bar = None, None          # లాస్ట్ commit అయిన క్యాండిల్ (correction చెక్ కి ఇది ఒక్కటే)
+        self.cols, self.ohlc_pos, self.vol_pos = None, None, None
+        self.day = None
+        self.has_volume = False
+        self.ema = {span: np.nan for span in EMA_SPANS}
+        self.atr, self.prev_close = np.nan, np.nan
+        self.vol_win, self.vol_sum, self.vol_cnt = deque(), 0.0, 0
+        self.cum_pv, self.cum_v, self.cum_tp, self.tp_cnt = 0.0, 0.0, 0.0, 0
+        # ఈరోజు commit అయిన క్యాండిల్స్: ముందే allocate చేసిన అర్రేస్ (రా కాలమ్స్ + ఇండికేటర్స్), m = వాడిన రోస్
+        self.ts_dtype, self.index_name = 'datetime64[ns]', None
+        self.day_ts = np.empty(0, dtype=self.ts_dtype)
+        self.day_vals = np.empty((0, 0))
+        self.m = 0
+        self.frame_index, self.frame_vals, self.frame_m = None, None, -1
+
+    def update(self, df_raw):
+        with self._lock:
+            try:
+                out = self._advance(df_raw) if self.last_ts is not None else None
+                return out if out is not None else self._rebuild(df_raw)
+            except Exception:
+                self.reset()
+                return pd.DataFrame()
+
+    def _advance(self, df_raw):
+        # ఫాస్ట్ పాత్: లాస్ట్ commit క్యాండిల్ తర్వాత రోస్ మాత్రమే చదువుతుంది. None = పూర్తి రీబిల్డ్ కావాలి
+        idx = df_raw.index
+        if list(df_raw.columns) != self.cols or not isinstance(idx, pd.DatetimeIndex) or not idx.is_monotonic_increasing: return None
+        pos = idx.searchsorted(self.last_ts)
+        if pos >= len(idx) or idx[pos] != self.last_ts: return None
+        vals = df_raw.iloc[pos:].to_numpy(dtype=float)
+        # హిస్టరీ correction: లాస్ట్ commit క్యాండిల్ మారితే (టైమ్‌స్టాంప్ / వాల్యూస్)
+        if not np.array_equal(vals[0], self.last_bar, equal_nan=True): return None
+        ts, vals = idx[pos + 1:], vals[1:]
+        ok = ~np.isnan(vals[:, self.ohlc_pos]).any(axis=1)
+        if not ok.all(): ts, vals = ts[ok], vals[ok]
+        if len(vals) == 0 or ts[-1].date() != self.day: return None
+
+        for k in range(len(vals) - 1): self._commit(ts[k], vals[k])
+        return self._output(ts[-1], vals[-1])
+
+    def _rebuild(self, df_raw):
+        self.reset()
+        df_s = df_raw.dropna(subset=OHLC)
+        if df_s.empty: return pd.DataFrame()
+        if not df_s.index.is_monotonic_increasing: df_s = df_s.sort_index()
+        df_full, df_day = compute_5m_indicators(df_s.copy())
+        n = len(df_full)
+        self.cols = list(df_raw.columns)
+        self.ohlc_pos = [self.cols.index(c) for c in OHLC]
+        self.has_volume = 'Volume' in self.cols
+        self.vol_pos = self.cols.index('Volume') if self.has_volume else None
+        self.day = df_full.index[-1].date()
+        self.ts_dtype, self.index_name = df_full.index.dtype, df_full.index.name
+        out = df_day.bfill().ffill()
+
+        # లాస్ట్ క్యాండిల్ ఇంకా ఫార్మ్ అవుతోంది, దాని ముందు వరకు మాత్రమే commit చేస్తాం
+        committed = n - 1
+        if committed > 0:
+            last = df_full.iloc[committed - 1]
+            self.last_ts = df_full.index[committed - 1]
+            self.last_bar = df_full[self.cols].iloc[committed - 1].to_numpy(dtype=float)
+            self.ema = {span: float(last[f'EMA_{span}']) for span in EMA_SPANS}
+            self.atr, self.prev_close = float(last['ATR_13']), float(last['Close'])
+            if self.has_volume:
+                vols = df_full['Volume'].iloc[max(0, committed - VOL_WINDOW):committed].to_numpy(dtype=float)
+                self.vol_win = deque(vols)
+                self.vol_sum, self.vol_cnt = float(np.nansum(vols)), int((~np.isnan(vols)).sum())
+
+            committed_day = df_day.iloc[:-1]
+            self.cum_tp, self.tp_cnt = float(committed_day['Typical_Price'].sum()), len(committed_day)
+            if self.has_volume:
+                self.cum_pv = float((committed_day['Typical_Price'] * committed_day['Volume']).sum())
+                self.cum_v = float(committed_day['Volume'].sum())
+            self.m = len(committed_day)
+            self.day_ts = np.empty(max(2 * self.m, 128), dtype=self.ts_dtype)
+            self.day_vals = np.empty((len(self.day_ts), len(self.cols) + len(INDICATOR_COLS)))
+            self.day_ts[:self.m] = committed_day.index.to_numpy()
+            self.day_vals[:self.m] = committed_day[self.cols + INDICATOR_COLS].to_numpy(dtype=float)
+            if all(dt == np.float64 for dt in out.dtypes) and not df_day.isna().to_numpy().any():
+                self.frame_index, self.frame_vals, self.frame_m = out.index, out.to_numpy(copy=True), self.m
+        return out
+
+    def _commit(self, ts, row):
+        ind = self._step(row, commit=True)
+        if self.m == len(self.day_ts):
+            grow = max(2 * self.m, 128)
+            self.day_ts = np.concatenate([self.day_ts, np.empty(grow - self.m, dtype=self.ts_dtype)])
+            self.day_vals = np.vstack([self.day_vals, np.empty((grow - self.m, self.day_vals.shape[1]))])
+        self.day_ts[self.m] = ts.to_datetime64()
+        self.day_vals[self.m, :len(row)] = row
+        self.day_vals[self.m, len(row):] = ind
+        self.m += 1
+        self.last_ts, self.last_bar = ts, row.copy()
+
+    def _output(self, ts, row):
+        full = np.concatenate([row, self._step(row, commit=False)])
+        # అదే క్యాండిల్ మీద టిక్ అప్డేట్: ముందు ఫ్రేమ్ ఇండెక్స్ అలాగే, లాస్ట్ రో మాత్రమే మారుస్తాం
+        # (pandas iloc[-1] = ... కాలమ్ కి కాలమ్ వెళ్తుంది, అందుకే state అర్రే లో పాచ్ చేసి ఒకే బ్లాక్ ఫ్రేమ్ కాపీ ఇస్తాం)
+        if (self.frame_vals is not None and self.frame_m == self.m and self.frame_index[-1] == ts
+                and not np.isnan(full).any()):
+            vals, index = self.frame_vals, self.frame_index
+            vals[-1] = full
+        else:
+            # కొత్త క్యాండిల్: ఈరోజు అర్రేస్ నుండి ఒక్కసారే ఫ్రేమ్ (రోజుకి గరిష్టం ~75 రోస్)
+            vals = np.vstack([self.day_vals[:self.m], full])
+            index = pd.DatetimeIndex(np.append(self.day_ts[:self.m], ts.to_datetime64()).astype(self.ts_dtype), name=self.index_name)
+            if np.isnan(vals).any():
+                self.frame_index, self.frame_vals, self.frame_m = None, None, -1
+                return pd.DataFrame(vals, index=index, columns=self.cols + INDICATOR_COLS).bfill().ffill()
+        out = pd.DataFrame(vals, index=index, columns=self.cols + INDICATOR_COLS, copy=True)   # బయటకి ఇచ్చే ఫ్రేమ్ state అర్రే ని షేర్ చేయదు
+        self.frame_index, self.frame_vals, self.frame_m = index, vals, self.m
+        return out
+
+    def _step(self, row, commit):
+        o, h, l, c = (float(row[p]) for p in self.ohlc_pos)
+        v = float(row[self.vol_pos]) if self.has_volume else np.nan
+
+        ema = {span: c if np.isnan(prev) else prev + (2 / (span + 1)) * (c - prev) for span, prev in self.ema.items()}
+
+        vol_sum, vol_cnt, vol_sma = self.vol_sum, self.vol_cnt, 0
+        if self.has_volume:
+            if len(self.vol_win) == VOL_WINDOW and not np.isnan(self.vol_win[0]):
+                vol_sum -= self.vol_win[0]; vol_cnt -= 1
+            if not np.isnan(v):
+                vol_sum += v; vol_cnt += 1
+            vol_sma = vol_sum / vol_cnt if vol_cnt else np.nan
+
+        tr = h - l if np.isnan(self.prev_close) else max(h - l, abs(h - self.prev_close), abs(l - self.prev_close))
+        atr = tr if np.isnan(self.atr) else self.atr + ATR_ALPHA * (tr - self.atr)
+
+        tp = (h + l + c) / 3
+        cum_tp, tp_cnt = self.cum_tp + tp, self.tp_cnt + 1
+        cum_pv, cum_v = self.cum_pv, self.cum_v
+        vwap = cum_tp / tp_cnt
+        if self.has_volume and not np.isnan(v):
+            cum_pv, cum_v = cum_pv + tp * v, cum_v + v
+            if cum_v != 0: vwap = cum_pv / cum_v
+
+        ind = np.array([ema[10], ema[20], ema[50], vol_sma, tr, atr, tp, vwap])   # INDICATOR_COLS ఆర్డర్
+        if commit:
+            self.ema, self.atr, self.prev_close = ema, atr, c
+            if self.has_volume:
+                self.vol_win.append(v)
+                if len(self.vol_win) > VOL_WINDOW: self.vol_win.popleft()
+                self.vol_sum, self.vol_cnt = vol_sum, vol_cnt
+            self.cum_tp, self.tp_cnt, self.cum_pv, self.cum_v = cum_tp, tp_cnt, cum_pv, cum_v
+        return ind
@@ -0,0 +1,101 @@
+import warnings
+import numpy as np
+import pandas as pd
+
+# --- VECTORIZED INTRADAY TAGS (5m) ---
+# ప్రతి సింబల్ df_day మీద పైథాన్ లూప్ బదులు, ఈరోజు 5m బార్స్ అన్నీ ఒకే (time x symbol) మ్యాట్రిక్స్ లో
+# కిందకి అలైన్ చేసి (row -1 = అందరికీ లాస్ట్ క్యాండిల్) ప్రతి ట్యాగ్ ని సింబల్ axis మీద ఒకే పాస్ లో లెక్కిస్తుంది.
+
+TAG_FIELDS = ['Open', 'High', 'Low', 'Close', 'VWAP', 'EMA_10']
+TAG_COLUMNS = ['AlphaTag', 'Trend_Score', 'Retest_Tag', 'ORB_Tag']
+
+
+def stack_5m(charts, symbols, fields=TAG_FIELDS):
+    # {Fetch_T: df_day} -> {field: (max_len x len(symbols)) మ్యాట్రిక్స్}, n = ప్రతి సింబల్ బార్స్ సంఖ్య
+    frames = [charts.get(s) for s in symbols]
+    n = np.array([0 if f is None else len(f) for f in frames], dtype=int)
+    rows = int(n.max()) if len(n) else 0
+    out = {f: np.full((rows, len(symbols)), np.nan) for f in fields}
+    for j, df_day in enumerate(frames):
+        if not n[j]: continue
+        for f in fields:
+            if f in df_day.columns: out[f][rows - n[j]:, j] = df_day[f].to_numpy(dtype=float)
+    return out, n
+
+
+def _row(mat, k):
+    return mat[-k] if mat.shape[0] >= k else np.full(mat.shape[1], np.nan)
+
+
+def compute_intraday_tags(charts, symbols, net_chg, day_o, day_h, day_l, nifty_dist_5m=0.1,
+                          with_trap=False, with_retest=False, with_orb=False):
+    symbols = list(symbols)
+    m, n = stack_5m(charts, symbols)
+    O, H, L, C, VW, E10 = (m[f] for f in TAG_FIELDS)
+    net_chg, day_o, day_h, day_l = (np.asarray(a, dtype=float) for a in (net_chg, day_o, day_h, day_l))
+    rows = C.shape[0]
+
+    with np.errstate(all='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        last_price, last_vwap, curr_open = _row(C, 1), _row(VW, 1), _row(O, 1)
+        vwap_ok = last_vwap > 0
+
+        # ALPHA MOVER (నిఫ్టీ VWAP దూరం తో పోలిక)
+        stock_dist = np.where(vwap_ok, np.abs(last_price - last_vwap) / last_vwap * 100, 0)
+        eff_nifty = max(nifty_dist_5m, 0.25)
+        alpha = np.where(n >= 50, np.where(stock_dist > eff_nifty * 3, "🚀Alpha-Mover",
+                                           np.where(stock_dist > eff_nifty * 2, "💪Nifty-Beater", "")), "")
+
+        # ONE-SIDED TREND (VWAP పైన / కింద ఉన్న క్యాండిల్స్ షేర్)
+        above = np.sum(L >= VW, axis=0)
+        below = np.sum(H <= VW, axis=0)
+        trend_candles = np.where(net_chg > 0, above, below)
+        one_sided = (n >= 12) & vwap_ok & (trend_candles / np.maximum(n, 1) >= 0.85)
+        gap = np.abs(last_price - last_vwap) / last_vwap * 100
+        gap_tag = np.select([gap >= 1.50, gap >= 1.00, gap >= 0.50], ["🌊Mega-1.5%", "🌊Super-1.0%", "🌊Trend-0.5%"], "🌊Trend")
+        gap_bonus = np.select([gap >= 1.50, gap >= 1.00, gap >= 0.50], [7, 5, 3], 1)
+        one_sided_tag = np.where(one_sided, gap_tag, "")
+        trend_bonus = np.where(one_sided, gap_bonus, 0)
+
+        # REVERSAL TRAP (మార్నింగ్ స్పైక్ / డ్రాప్ తర్వాత VWAP క్రాస్)
+        trap_tag = np.full(len(symbols), "", dtype=object)
+        trap_bonus = np.zeros(len(symbols), dtype=int)
+        if with_trap:
+            base = (n >= 6) & vwap_ok
+            spike = np.where(day_o > 0, (day_h - day_o) / day_o * 100, 0)
+            drop = np.where(day_o > 0, (day_o - day_l) / day_o * 100, 0)
+            sell_side = base & (spike >= 1.0) & (last_price < last_vwap)
+            sell = sell_side & (last_price < curr_open)
+            buy = base & ~sell_side & (drop >= 1.0) & (last_price > last_vwap) & (last_price > curr_open)
+            trap_tag = np.where(sell, "🎯 Reversal Sell 🩸", np.where(buy, "🎯 Reversal Buy 🚀", ""))
+            trap_bonus = np.where(sell | buy, 6, 0)
+
+        # 10-EMA RETEST (లాస్ట్ రెండు క్యాండిల్స్)
+        retest = np.full(len(symbols), "", dtype=object)
+        if with_retest:
+            c1o, c1c, c1v, c1e = curr_open, last_price, last_vwap, _row(E10, 1)
+            c2l, c2h, c2c, c2e = _row(L, 2), _row(H, 2), _row(C, 2), _row(E10, 2)
+            up = (c1c > c1v) & (c1e > c1v)
+            dn = ~up & (c1c < c1v) & (c1e < c1v)
+            buy_rt = up & (c2l <= c2e * 1.002) & (c2c >= c2e) & (c1c > c1o) & (c1e <= c1c) & (c1c <= c1e * 1.003)
+            sell_rt = dn & (c2h >= c2e * 0.998) & (c2c <= c2e) & (c1c < c1o) & (c1e * 0.997 <= c1c) & (c1c <= c1e)
+            retest = np.where((n >= 4) & buy_rt, "BUY_RETEST", np.where((n >= 4) & sell_rt, "SELL_RETEST", ""))
+
+        # OPENING RANGE BREAKOUT (మొదటి 3 బార్స్)
+        orb = np.full(len(symbols), "", dtype=object)
+        if with_orb:
+            bar_no = np.arange(rows)[:, None] - (rows - n)[None, :]
+            first3 = (bar_no >= 0) & (bar_no < 3)
+            orb_high = np.nanmax(np.where(first3, H, np.nan), axis=0) if rows else np.full(len(symbols), np.nan)
+            orb_low = np.nanmin(np.where(first3, L, np.nan), axis=0) if rows else np.full(len(symbols), np.nan)
+            ok = n >= 3
+            orb = np.where(ok & (last_price > orb_high) & (last_price > last_vwap), "ORB_BUY",
+                           np.where(ok & (last_price < orb_low) & (last_price < last_vwap), "ORB_SELL", ""))
+
+    alpha_tag = pd.Series([f"{a} {o} {t}".strip() for a, o, t in zip(alpha, one_sided_tag, trap_tag)], index=symbols, dtype=object)
+    return pd.DataFrame({
+        'AlphaTag': alpha_tag,
+        'Trend_Score': pd.Series(trend_bonus + trap_bonus, index=symbols),
+        'Retest_Tag': pd.Series(np.asarray(retest).tolist(), index=symbols, dtype=object),
+        'ORB_Tag': pd.Series(np.asarray(orb).tolist(), index=symbols, dtype=object),
+    }, columns=TAG_COLUMNS)
@@ -0,0 +1,121 @@
+import threading
+import time
+import pandas as pd
+from shared_snapshot import freeze, view, FrozenCharts
+
+# --- BACKGROUND MARKET DATA REFRESHER ---
+# డేటా రీఫ్రెష్ Streamlit rerun లో కాకుండా ఒకే బ్యాక్‌గ్రౌండ్ థ్రెడ్ లో, ప్రతి job తన సొంత టైమింగ్ తో.
+# ప్రతి రన్ తర్వాత కొత్త MarketSnapshot పబ్లిష్ అవుతుంది - సెషన్స్ లాస్ట్ స్నాప్‌షాట్ ని చదువుతాయి మాత్రమే.
+
+
+class MarketSnapshot:
+    # ఒకసారి పబ్లిష్ అయ్యాక మారదు (కొత్త డేటా = కొత్త స్నాప్‌షాట్). లోపలి DataFrames రీడ్-ఓన్లీ (shared_snapshot.freeze),
+    # సెషన్స్ frame() / charts() / column() తో zero-copy గా చదువుతాయి.
+    __slots__ = ('version', 'built_at', 'data')
+
+    def __init__(self, version=0, data=None, built_at=None):
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, 'data', dict(data or {}))
+        object.__setattr__(self, 'built_at', dict(built_at or {}))
+
+    def __setattr__(self, key, value):
+        raise AttributeError("MarketSnapshot is immutable")
+
+    def get(self, name, default=None):
+        # రా వాల్యూ (ఫ్రోజెన్, రీడ్-ఓన్లీ) - మార్చాల్సి వస్తే frame() / charts() వాడాలి
+        return self.data.get(name, default)
+
+    # --- సెషన్స్ కి accessors (zero-copy) ---
+    def frame(self, name):
+        # DataFrame view: రీడ్-ఓన్లీ numpy బ్లాక్స్ పైన, మార్చితే ఆ సెషన్ లో మాత్రమే (CoW)
+        value = self.data.get(name)
+        return view(value) if isinstance(value, pd.DataFrame) else pd.DataFrame()
+
+    def charts(self, name):
+        # {Fetch_T: df} రీడ్-ఓన్లీ మ్యాపింగ్, ప్రతి df చదివినప్పుడు view
+        value = self.data.get(name)
+        return value if isinstance(value, FrozenCharts) else FrozenCharts(value or {})
+
+    def column(self, name, col):
+        value = self.data.get(name)
+        return value[col].to_numpy() if isinstance(value, pd.DataFrame) and col in value.columns else None
+
+    def with_value(self, name, value):
+        # పబ్లిష్ టైమ్ లో ఒక్కసారే ఫ్రీజ్ (కాపీ) - తర్వాత అన్ని సెషన్స్ అదే మెమరీ ని చదువుతాయి
+        data, built_at = dict(self.data), dict(self.built_at)
+        data[name], built_at[name] = freeze(value), time.time()
+        return MarketSnapshot(self.version + 1, data, built_at)
+
+
+class MarketRefresher:
+    def __init__(self, idle_after=600, want_ttl=600):
+        self.idle_after = idle_after     # ఎవరూ చూడకపోతే రీఫ్రెష్ ఆపేస్తుంది
+        self.want_ttl = want_ttl         # సెషన్స్ అడిగిన సింబల్స్ ఇంత సేపు లిస్ట్ లో ఉంటాయి
+        self._snapshot = MarketSnapshot()
+        self._jobs = {}                  # name -> [interval, func, next_due]
+        self._wanted = {}                # name -> {key: last asked time}
+        self._job_locks = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._last_seen = time.time()
+        self._thread = None
+
+    def add_job(self, name, interval, func):
+        # func(refresher) -> కొత్త వాల్యూ; None ఇస్తే పాత వాల్యూ నే ఉంచుతుంది
+        self._jobs[name] = [interval, func, 0.0]
+        self._job_locks[name] = threading.Lock()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def latest(self):
+        self._last_seen = time.time()
+        return self._snapshot
+
+    def want(self, name, keys):
+        now = time.time()
+        with self._lock:
+            bucket = self._wanted.setdefault(name, {})
+            new = [k for k in keys if k not in bucket]
+            for k in keys: bucket[k] = now
+        if new: self.trigger(name)
+
+    def wanted(self, name):
+        cutoff = time.time() - self.want_ttl
+        with self._lock:
+            bucket = self._wanted.get(name, {})
+            for k in [k for k, t in bucket.items() if t < cutoff]: del bucket[k]
+            return list(bucket)
+
+    def trigger(self, name):
+        if name in self._jobs:
+            self._jobs[name][2] = 0.0
+            self._wake.set()
+
+    def run_now(self, name):
+        # కోల్డ్ స్టార్ట్: స్నాప్‌షాట్ లో ఇంకా లేకపోతే ఒక్క సెషన్ మాత్రమే రన్ చేస్తుంది, మిగతావి వెయిట్
+        with self._job_locks[name]:
+            if self._snapshot.get(name) is None: self._run_job(name)
+        return self._snapshot
+
+    def _run_job(self, name):
+        interval, func, _ = self._jobs[name]
+        try: value = func(self)
+        except Exception: value = None
+        self._jobs[name][2] = time.time() + interval
+        if value is not None:
+            with self._lock: self._snapshot = self._snapshot.with_value(name, value)
+
+    def _run(self):
+        while True:
+            now = time.time()
+            if now - self._last_seen < self.idle_after:
+                for name, (_, _, due) in list(self._jobs.items()):
+                    if due <= now:
+                        with self._job_locks[name]: self._run_job(name)
+            next_due = min([job[2] for job in self._jobs.values()] or [now + 5])
+            self._wake.wait(timeout=max(0.5, min(5.0, next_due - time.time())))
+            self._wake.clear()
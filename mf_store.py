@@ -0,0 +1,85 @@
+import os
+import json
+import threading
+import numpy as np
+import pandas as pd
+
+# --- PERSISTENT MUTUAL FUND STORE ---
+# ఫండ్ పేరు -> scheme code ఒక్కసారి resolve చేసి JSON లో దాచుతుంది.
+# NAV హిస్టరీ ప్రతి scheme కి ఒక .npy ఫైల్, రోజూ కొత్త తేదీలు మాత్రమే append.
+
+NAV_DTYPE = np.dtype([('ts', 'i8'), ('nav', 'f8')])
+
+
+def parse_nav_rows(nav_data):
+    # mfapi "data": [{"date": "dd-mm-yyyy", "nav": "123.45"}, ...] -> క్లీన్ చేసిన Series
+    df = pd.DataFrame(nav_data)
+    if df.empty or 'date' not in df.columns or 'nav' not in df.columns: return pd.Series(dtype=float)
+    dates = pd.to_datetime(df['date'], dayfirst=True, errors='coerce')
+    navs = pd.to_numeric(df['nav'], errors='coerce')
+    s = pd.Series(navs.to_numpy(), index=dates).dropna()
+    s = s[s.index.notna() & (s > 0)]
+    return s
+
+
+def cagr_table(nav, years=(1, 3, 5)):
+    # ప్రతి horizon కి target తేదీ ముందు ఉన్న లాస్ట్ NAV - ఒకే searchsorted తో
+    ts, vals = nav['ts'], nav['nav']
+    last = pd.Timestamp(int(ts[-1]))
+    targets = np.array([(last - pd.DateOffset(years=y)).value for y in years], dtype='i8')
+    pos = np.searchsorted(ts, targets, side='right') - 1
+    ok = pos >= 0
+    past = np.where(ok, vals[np.clip(pos, 0, None)], np.nan)
+    cagr = ((vals[-1] / past) ** (1 / np.array(years, dtype=float)) - 1) * 100
+    return {y: (round(float(c), 2) if k else "N/A") for y, c, k in zip(years, cagr, ok)}
+
+
+class MFStore:
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+        self._codes_path = os.path.join(root, "scheme_codes.json")
+        self._codes = {}
+        try:
+            with open(self._codes_path) as fh: self._codes = json.load(fh)
+        except (OSError, ValueError): pass
+
+    def _write(self, path, write):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as fh: write(fh)
+        os.replace(tmp, path)
+
+    def scheme_code(self, name):
+        return self._codes.get(name)
+
+    def set_scheme_code(self, name, code):
+        with self._lock:
+            self._codes[name] = str(code)
+            self._write(self._codes_path, lambda fh: fh.write(json.dumps(self._codes, indent=1).encode()))
+
+    def _nav_path(self, code):
+        return os.path.join(self.root, "nav", f"{code}.npy")
+
+    def load_nav(self, code):
+        path = self._nav_path(code)
+        if not os.path.exists(path): return np.empty(0, dtype=NAV_DTYPE)
+        try: return np.load(path)
+        except (OSError, ValueError): return np.empty(0, dtype=NAV_DTYPE)
+
+    def last_nav_date(self, code):
+        nav = self.load_nav(code)
+        return pd.Timestamp(int(nav['ts'][-1])) if len(nav) else None
+
+    def merge_nav(self, code, series):
+        if series.empty: return self.load_nav(code)
+        new = np.empty(len(series), dtype=NAV_DTYPE)
+        new['ts'] = pd.DatetimeIndex(series.index).as_unit('ns').asi8
+        new['nav'] = series.to_numpy(dtype=float)
+        with self._lock:
+            merged = np.concatenate([self.load_nav(code), new])
+            # అదే తేదీ రెండుసార్లు వస్తే కొత్తది ఉంచుతుంది
+            _, last_pos = np.unique(merged['ts'][::-1], return_index=True)
+            merged = merged[len(merged) - 1 - last_pos]
+            self._write(self._nav_path(code), lambda fh: np.save(fh, merged))
+        return merged
@@ -1,20 +1,43 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import gspread
 from google.oauth2.service_account import Credentials
 import json
+import functools
 import numpy as np
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import os
-import requests
 import time
 from datetime import datetime, time as dt_time
 from streamlit_autorefresh import st_autorefresh
-import threading
 import concurrent.futures
+from collections import ChainMap
 from dhanhq import dhanhq, marketfeed
+from radar_engine import compute_daily_radar, RADAR_COLUMNS
+from bar_store import BarStore
+from intraday_state import IntradayIndicatorState
+from tick_store import TickStore, parse_tick
+from bar_builder import BarBuilder
+from feed_subscriptions import FeedSubscriptionManager
+from http_client import AsyncHttpClient
+from mf_store import MFStore, parse_nav_rows, cagr_table
+from sheets_sync import SheetWriter
+from portfolio_db import PortfolioDB, SheetsMirror, PORTFOLIO_COLS, TRADE_COLS
+from market_refresher import MarketRefresher
+from radar_index import RadarIndex
+from intraday_tags import compute_intraday_tags
+from strategy_engine import run_strategies, STRATEGIES, SCORE_STRATEGIES
+from universe import UniverseIndex, U_NIFTY50, U_FNO, U_MIDCAP, U_SMALLCAP, U_INDEX, U_SECTOR, U_COMMODITY, U_STOCKS
+from render_cache import RenderCache, FigureCache, fingerprint
+from chart_decimation import bucket_ohlc, max_bars_for_width
+from chart_figures import build_chart_figure, patch_chart_figure, CHART_COLS
+from terminal_tables import generate_status, term_table_html
+from data_sources import DataSource
+from perf_metrics import PerfMetrics
+from compact_snapshot import compact_frame, compact_charts as compact_chart_frames, compact_radar, expand_radar, frame_nbytes
+from shared_snapshot import SharedCache
+
+# 🔥 షేర్డ్ స్నాప్‌షాట్ views సేఫ్ గా ఉండాలంటే Copy-on-Write కావాలి (pandas 3 లో ఎప్పుడూ ఆన్)
+if int(pd.__version__.split(".")[0]) < 3: pd.set_option("mode.copy_on_write", True)
 
 # 🔥 ధన్ కొత్త అప్‌డేట్ కోసం క్యాచ్
 try:
@@ -22,6 +45,8 @@ try:
 except ImportError:
     DhanContext = None
 
+RERUN_T0 = time.perf_counter() # ప్రతి రీరన్ మొత్తం టైమ్ (పెర్ఫార్మెన్స్ ప్యానెల్ కోసం)
+
 # --- 1. PAGE CONFIGURATION ---
 st.set_page_config(page_title="Market Heatmap", page_icon="📊", layout="wide")
 
@@ -43,9 +68,61 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# --- DATA SOURCE (live / record / replay) ---
+# 🔥 DATA_MODE=replay అయితే yfinance, Dhan, mfapi, Sheets అన్నీ DATA_DIR లో రికార్డ్ అయిన రెస్పాన్సెస్ నుండే
+@st.cache_resource(show_spinner=False)
+def get_data_source():
+    return DataSource.from_env(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data_replay"))
+
+DATA = get_data_source()
+
+# --- PERF METRICS (స్టేజ్ టైమింగ్స్ + కాష్ hit/miss, సైడ్‌బార్ ప్యానెల్ & JSONL లాగ్) ---
+@st.cache_resource(show_spinner=False)
+def get_perf_metrics():
+    # JSONL లాగ్ డీఫాల్ట్ గా ఆఫ్ (సైడ్‌బార్ ప్యానెల్ కి మెమరీ చాలు) - PERF_LOG=/tmp/perf.jsonl తో ఆన్, PERF_LOG_MAX_MB దాటితే రొటేట్
+    return PerfMetrics(os.environ.get("PERF_LOG", "") or None, window=int(os.environ.get("PERF_WINDOW", "500")),
+                       max_bytes=int(float(os.environ.get("PERF_LOG_MAX_MB", "16")) * (1 << 20)))
+
+PERF = get_perf_metrics()
+
+def tracked_cache_data(**cache_kwargs):
+    # st.cache_data + hit/miss: లోపలి బాడీ రన్ అయితే miss, కాష్ నుండి వస్తే hit
+    def wrap(func):
+        @functools.wraps(func)
+        def body(*args, **kwargs):
+            PERF.miss()
+            return func(*args, **kwargs)
+        cached = st.cache_data(**cache_kwargs)(body)
+        @functools.wraps(func)
+        def inner(*args, **kwargs):
+            with PERF.cache_call(func.__name__): return cached(*args, **kwargs)
+        inner.clear = cached.clear
+        return inner
+    return wrap
+
+@st.cache_resource(show_spinner=False)
+def get_shared_cache(name, ttl, max_items):
+    return SharedCache(ttl, max_items)
+
+def shared_data(ttl, max_items=64):
+    # st.cache_data లాగే కానీ ప్రతి రీరన్ కి pickle కాపీ లేదు: ప్రాసెస్ లో ఒకే రీడ్-ఓన్లీ కాపీ, కాలర్స్ కి zero-copy view
+    def wrap(func):
+        @functools.wraps(func)
+        def inner(*args):
+            cache = get_shared_cache(func.__name__, ttl, max_items)
+            def build():
+                PERF.miss()
+                return func(*args)
+            with PERF.cache_call(func.__name__): return cache.get_or_build(fingerprint(args), build)
+        inner.cache = lambda: get_shared_cache(func.__name__, ttl, max_items)
+        inner.clear = lambda: inner.cache().clear()
+        return inner
+    return wrap
+
 # --- 2. GOOGLE SHEETS CONNECTION ---
 @st.cache_resource(show_spinner=False)
 def init_connection():
+    if DATA.replaying: return DATA.worksheet("Portfolio"), DATA.worksheet("TradeBook")
     creds_json = st.secrets["gcp_service_account"]
     creds_dict = json.loads(creds_json)
     scopes = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
@@ -55,7 +132,7 @@ def init_connection():
     db_sheet = client.open("Trading_DB")
     p_ws = db_sheet.worksheet("Portfolio")
     t_ws = db_sheet.worksheet("TradeBook")
-    return p_ws, t_ws
+    return DATA.worksheet("Portfolio", p_ws), DATA.worksheet("TradeBook", t_ws)
 
 try:
     port_ws, trade_ws = init_connection()
@@ -63,45 +140,66 @@ except Exception as e:
     st.error(f"గూగుల్ షీట్ కనెక్ట్ అవ్వలేదు బాస్! Error: {e}")
     st.stop()
 
+# 🔥 షీట్ మొత్తం clear చేసి రాయకుండా, మారిన రోస్ మాత్రమే (జర్నల్ తో సేఫ్ గా)
+@st.cache_resource(show_spinner=False)
+def get_sheet_writer():
+    journal = os.environ.get("SHEETS_JOURNAL", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sheets_journal.jsonl"))
+    writer = SheetWriter({"Portfolio": port_ws, "TradeBook": trade_ws}, journal)
+    writer.flush() # క్రితం సారి ఫెయిల్ అయిన రైట్స్ ఉంటే ముందు అవి పంపిస్తుంది
+    return writer
+
 # --- 3. DATA LOAD & SAVE FUNCTIONS ---
-@st.cache_data(ttl=300, show_spinner=False)
-def load_portfolio():
+# 🔥 హోల్డింగ్స్ & ట్రేడ్ బుక్ కి లోకల్ SQLite నే అసలు స్టోర్, Google Sheets బ్యాక్‌గ్రౌండ్ మిర్రర్ మాత్రమే
+@st.cache_resource(show_spinner=False)
+def get_portfolio_db():
+    db_path = os.environ.get("PORTFOLIO_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".portfolio.db"))
+    db = PortfolioDB(db_path)
+    SheetsMirror(db, get_sheet_writer())
+    return db
+
+def read_sheet_portfolio():
+    # DB మొదటిసారి క్రియేట్ అయినప్పుడు మాత్రమే షీట్ నుండి సీడ్ చేస్తాం
+    records = port_ws.get_all_records()
+    df = pd.DataFrame(records) if records else pd.DataFrame(columns=PORTFOLIO_COLS)
+    if records: get_sheet_writer().remember("Portfolio", df)
+    legacy = not df.empty and 'Stock Name' in df.columns
+    if legacy:
+        df.rename(columns={'Stock Name': 'Symbol', 'Buy Price': 'Buy_Price', 'Buy Date': 'Date'}, inplace=True)
+        for col in ['SL', 'T1', 'T2']:
+            if col not in df.columns: df[col] = 0.0
+    return df, legacy
+
+def read_sheet_trades():
+    records = trade_ws.get_all_records()
+    df = pd.DataFrame(records) if records else pd.DataFrame(columns=TRADE_COLS)
+    if records: get_sheet_writer().remember("TradeBook", df)
+    legacy = not df.empty and 'Stock Name' in df.columns
+    if legacy:
+        df.rename(columns={'Stock Name': 'Symbol', 'Buy Price': 'Buy_Price', 'Sell Price': 'Sell_Price', 'Sell Date': 'Sell_Date', 'Profit/Loss': 'PnL_Rs'}, inplace=True)
+        if 'PnL_Pct' not in df.columns: df['PnL_Pct'] = 0.0
+    return df, legacy
+
+def load_table(table, read_sheet, empty_cols):
     try:
-        records = port_ws.get_all_records()
-        df = pd.DataFrame(records) if records else pd.DataFrame(columns=['Symbol', 'Buy_Price', 'Quantity', 'Date', 'SL', 'T1', 'T2'])
-        if not df.empty and 'Stock Name' in df.columns:
-            df.rename(columns={'Stock Name': 'Symbol', 'Buy Price': 'Buy_Price', 'Buy Date': 'Date'}, inplace=True)
-            for col in ['SL', 'T1', 'T2']:
-                if col not in df.columns: df[col] = 0.0
-            save_portfolio(df)
-        return df
+        db = get_portfolio_db()
+        if not db.is_seeded(table):
+            df, legacy = read_sheet()
+            db.replace(table, df, notify=legacy) # పాత కాలమ్ పేర్లు ఉంటే షీట్ కూడా అప్డేట్ అవుతుంది
+        return db.read(table)
     except:
-        return pd.DataFrame(columns=['Symbol', 'Buy_Price', 'Quantity', 'Date', 'SL', 'T1', 'T2'])
+        return pd.DataFrame(columns=empty_cols)
+
+def load_portfolio():
+    return load_table("holdings", read_sheet_portfolio, PORTFOLIO_COLS)
 
-@st.cache_data(ttl=30, show_spinner=False)
 def load_closed_trades():
-    try:
-        records = trade_ws.get_all_records()
-        df = pd.DataFrame(records) if records else pd.DataFrame(columns=['Sell_Date', 'Symbol', 'Quantity', 'Buy_Price', 'Sell_Price', 'PnL_Rs', 'PnL_Pct'])
-        if not df.empty and 'Stock Name' in df.columns:
-            df.rename(columns={'Stock Name': 'Symbol', 'Buy Price': 'Buy_Price', 'Sell Price': 'Sell_Price', 'Sell Date': 'Sell_Date', 'Profit/Loss': 'PnL_Rs'}, inplace=True)
-            if 'PnL_Pct' not in df.columns: df['PnL_Pct'] = 0.0
-            save_closed_trades(df)
-        return df
-    except:
-        return pd.DataFrame(columns=['Sell_Date', 'Symbol', 'Quantity', 'Buy_Price', 'Sell_Price', 'PnL_Rs', 'PnL_Pct'])
+    return load_table("trades", read_sheet_trades, TRADE_COLS)
 
 def save_portfolio(df):
-    port_ws.clear()
-    df = df.fillna("")
-    port_ws.update([df.columns.values.tolist()] + df.values.tolist())
-    load_portfolio.clear()
+    get_portfolio_db().replace("holdings", df)
 
 def save_closed_trades(df):
-    trade_ws.clear()
-    df = df.fillna("")
-    trade_ws.update([df.columns.values.tolist()] + df.values.tolist())
-    load_closed_trades.clear()
+    get_portfolio_db().replace("trades", df)
 
 # --- 4. AUTO RUN & STATE MANAGEMENT ---
 if 'pause_refresh' not in st.session_state:
@@ -113,6 +211,8 @@ if 'custom_alerts' not in st.session_state:
     st.session_state.custom_alerts = {}
 if 'active_sec' not in st.session_state:
     st.session_state.active_sec = None
+if 'grid_limits' not in st.session_state:
+    st.session_state.grid_limits = {} # చార్ట్ గ్రిడ్ -> ఎన్ని చార్ట్స్ చూపించాలి ("Load more")
 
 TOP_SECTOR_STOCKS = {
     "NIFTY IT": ["TCS", "INFY", "HCLTECH", "WIPRO", "TECHM", "COFORGE", "PERSISTENT", "LTIM"],
@@ -287,7 +387,20 @@ MUTUAL_FUNDS = {
         "Tata Large Cap Fund Direct Growth"
     ]
 }
-@st.cache_data(ttl=86400, show_spinner=False)
+# --- SHARED ASYNC HTTP CLIENT (keep-alive pool + per-host rate limits) ---
+# (requests/sec, burst, max concurrent) - Dhan Data APIs 5 req/sec
+HTTP_HOST_LIMITS = {"dhan": (5, 5, 5), "api.mfapi.in": (10, 10, 8)}
+
+@st.cache_resource(show_spinner=False)
+def get_http_client():
+    return AsyncHttpClient(HTTP_HOST_LIMITS)
+
+@st.cache_resource(show_spinner=False)
+def get_mf_store():
+    store_dir = os.environ.get("MF_STORE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".mf_store"))
+    return MFStore(store_dir)
+
+@tracked_cache_data(ttl=86400, show_spinner=False)
 def fetch_mf_performance():
     tasks = []
     # 🔥 ఇక్కడ లిస్ట్ ని లూప్ చేసేలా మార్చాను (పాత ఎర్రర్ రాదు)
@@ -295,50 +408,40 @@ def fetch_mf_performance():
         for name in funds_list:
             tasks.append((name, cat))
             
-    def fetch_single(name, cat):
+    http = get_http_client()
+    store = get_mf_store()
+    today = pd.Timestamp.now().normalize()
+    
+    async def fetch_single(name, cat):
         short_name = name.replace(" Direct Plan Growth", "").replace(" Direct Growth", "")
         try:
-            # 1. పేరుతో సెర్చ్ చేసి ఫండ్ కోడ్ (Scheme Code) పట్టుకోవడం
-            search_url = f"https://api.mfapi.in/mf/search?q={name}"
-            search_res = requests.get(search_url, timeout=10).json()
-            if not search_res: raise ValueError("Not Found")
-            code = search_res[0]['schemeCode'] # ఫస్ట్ వచ్చిన కోడ్ ని తీసుకుంటుంది
+            # 1. scheme code లోకల్ ఇండెక్స్ లో లేకపోతే మాత్రమే పేరుతో సెర్చ్ (ఒక్కసారే)
+            code = store.scheme_code(name)
+            if code is None:
+                search_res = await DATA.get_json(http, "https://api.mfapi.in/mf/search", params={"q": name}, timeout=10)
+                if not search_res: raise ValueError("Not Found")
+                code = search_res[0]['schemeCode'] # ఫస్ట్ వచ్చిన కోడ్ ని తీసుకుంటుంది
+                store.set_scheme_code(name, code)
             
-            # 2. ఆ కోడ్ తో NAV హిస్టరీ లాగడం
-            url = f"https://api.mfapi.in/mf/{code}"
-            res = requests.get(url, timeout=12)
-            if res.status_code == 200:
-                data = res.json()
-                nav_data = data.get("data", [])
-                if not nav_data: raise ValueError("No Data")
-                
-                df = pd.DataFrame(nav_data)
-                df['date'] = pd.to_datetime(df['date'], dayfirst=True, errors='coerce')
-                df['nav'] = pd.to_numeric(df['nav'], errors='coerce')
-                
-                # క్లీనింగ్
-                df = df.dropna(subset=['nav', 'date'])
-                df = df[df['nav'] > 0]
-                
-                if df.empty: raise ValueError("Empty after clean")
-                
-                df = df.sort_values('date').set_index('date')
-                last_price = float(df['nav'].iloc[-1])
-                
-                def get_cagr(years):
-                    try:
-                        target_date = df.index[-1] - pd.DateOffset(years=years)
-                        closest_date = df.index[df.index <= target_date].max()
-                        if pd.isna(closest_date): return "N/A"
-                        past_price = float(df.loc[closest_date, 'nav'])
-                        cagr = ((last_price / past_price) ** (1 / years)) - 1
-                        return round(cagr * 100, 2)
-                    except: return "N/A"
-                
-                return {
-                    "Category": cat, "Fund Name": short_name, "NAV (₹)": round(last_price, 2),
-                    "1Y (%)": get_cagr(1), "3Y CAGR (%)": get_cagr(3), "5Y CAGR (%)": get_cagr(5)
-                }
+            # 2. NAV: మొదటిసారి పూర్తి హిస్టరీ, తర్వాత లాస్ట్ స్టోర్ అయిన తేదీ నుండి కొత్తవి మాత్రమే
+            last_date = store.last_nav_date(code)
+            nav = store.load_nav(code)
+            if last_date is None or last_date < today:
+                params = {} if last_date is None else {"startDate": (last_date + pd.Timedelta(days=1)).strftime('%Y-%m-%d'), "endDate": today.strftime('%Y-%m-%d')}
+                try:
+                    data = await DATA.get_json(http, f"https://api.mfapi.in/mf/{code}", params=params, timeout=12)
+                    nav = store.merge_nav(code, parse_nav_rows((data or {}).get("data", [])))
+                except Exception:
+                    if last_date is None: raise
+            
+            if len(nav) == 0: raise ValueError("No Data")
+            last_price = float(nav['nav'][-1])
+            cagr = cagr_table(nav)
+            
+            return {
+                "Category": cat, "Fund Name": short_name, "NAV (₹)": round(last_price, 2),
+                "1Y (%)": cagr[1], "3Y CAGR (%)": cagr[3], "5Y CAGR (%)": cagr[5]
+            }
         except Exception:
             pass # ఏదైనా ఫెయిల్ అయితే సైలెంట్ గా కిందకి వెళ్తుంది
             
@@ -348,14 +451,8 @@ def fetch_mf_performance():
             "1Y (%)": "N/A", "3Y CAGR (%)": "N/A", "5Y CAGR (%)": "N/A"
         }
 
-    results = []
-    # 5 థ్రెడ్స్ తో ప్యారలల్ గా రన్ అవుతుంది (ఫాస్ట్ కోసం)
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-        futures = [executor.submit(fetch_single, name, cat) for name, cat in tasks]
-        for future in concurrent.futures.as_completed(futures):
-            res = future.result()
-            if res: results.append(res)
-            
+    # async క్లయింట్ తో ప్యారలల్ గా రన్ అవుతుంది (mfapi రేట్ లిమిట్ లోపల)
+    results = [res for res in http.run([fetch_single(name, cat) for name, cat in tasks]) if isinstance(res, dict)]
     return pd.DataFrame(results)
 NIFTY_50_SECTORS = {
     "PHARMA": ["SUNPHARMA", "CIPLA", "DRREDDY", "APOLLOHOSP"],
@@ -452,6 +549,18 @@ SMALLCAP_250 = [
     "VTL", "WABAG", "WELCORP", "WELENT", "WELSPUNLIV", "WSTCSTPAPR", "XYLEM", 
     "YATHARTH", "ZENSARTECH", "ZENTEC", "ZYDUSWELL"
 ]
+
+# 🔥 యూనివర్స్ ఇండెక్స్: Fetch_T -> మెంబర్‌షిప్ బిట్స్ & సెక్టార్ (ఇంపోర్ట్ టైమ్ లో ఒక్కసారే)
+UNIVERSE = UniverseIndex({
+    U_NIFTY50: [f"{s}.NS" for s in NIFTY_50],
+    U_FNO: [f"{s}.NS" for s in FNO_STOCKS],
+    U_MIDCAP: [f"{s}.NS" for s in MIDCAP_150],
+    U_SMALLCAP: [f"{s}.NS" for s in SMALLCAP_250],
+    U_INDEX: list(INDICES_MAP.keys()),
+    U_SECTOR: list(SECTOR_INDICES_MAP.keys()),
+    U_COMMODITY: list(COMMODITY_MAP.keys()),
+}, {f"{stock}.NS": sec for sec, stocks in NIFTY_50_SECTORS.items() for stock in stocks})
+UNIVERSE_STOCK_NAMES = frozenset(NIFTY_50 + FNO_STOCKS + MIDCAP_150 + SMALLCAP_250)
 # --- DHAN API INITIALIZATION ---
 # Session state initialization (app start lo okasari run avtundi)
 if 'shown_dhan_status' not in st.session_state:
@@ -464,15 +573,16 @@ except ImportError:
 
 @st.cache_resource(show_spinner=False)
 def init_dhan_client():
+    if DATA.replaying: return DATA.dhan_client()
     try:
         c_id = str(st.secrets["dhan"]["client_id"]).strip()
         a_token = str(st.secrets["dhan"]["access_token"]).strip()
         
         if DhanContext:
             context = DhanContext(c_id, a_token)
-            return dhanhq(context)
+            return DATA.dhan_client(dhanhq(context))
         else:
-            return dhanhq(c_id, a_token)
+            return DATA.dhan_client(dhanhq(c_id, a_token))
             
     except Exception as e:
         return f"ERROR: {e}"
@@ -495,11 +605,11 @@ else:
     st.sidebar.error("❌ Dhan API Connection Failed")
     dhan = None
 
-@st.cache_data(ttl=86400)
+@shared_data(ttl=86400, max_items=1)
 def get_dhan_security_map():
     try:
         url = "https://images.dhan.co/api-data/api-scrip-master.csv"
-        df = pd.read_csv(url, low_memory=False)
+        df = DATA.read_csv(url, low_memory=False)
         nse_eq = df[(df['SEM_EXM_EXCH_ID'] == 'NSE') & (df['SEM_INSTRUMENT_NAME'] == 'EQUITY')]
         return dict(zip(nse_eq['SEM_TRADING_SYMBOL'], nse_eq['SEM_SMST_SECURITY_ID'].astype(str)))
     except: return {}
@@ -508,34 +618,82 @@ sec_map = get_dhan_security_map()
 rev_sec_map = {str(v): k for k, v in sec_map.items()} 
 
 # --- WEBSOCKET LIVE TICKER (BACKGROUND THREAD) ---
-if 'LIVE_PRICES' not in st.session_state:
-    st.session_state.LIVE_PRICES = {}
+# 🔥 టిక్స్ session_state లో కాకుండా process-wide TickStore లో, అన్ని సెషన్స్ ఒకే సాకెట్ నుండి చదువుతాయి
+@st.cache_resource(show_spinner=False)
+def get_tick_store():
+    return TickStore(sec_map.values())
+
+@st.cache_resource(show_spinner=False)
+def get_bar_builder():
+    return BarBuilder()
 
 @st.cache_resource
 def start_live_ticker():
     try:
-        c_id = st.secrets["dhan"]["client_id"]
-        a_token = st.secrets["dhan"]["access_token"]
-        instruments = [(1, str(sec_id)) for sec_id in list(sec_map.values())[:500]]
+        tick_store = get_tick_store()
+        bar_builder = get_bar_builder()
         
         def on_connect(instance):
             pass
             
         def on_message(instance, message):
-            if 'LTP' in message and 'SecurityId' in message:
-                sec_id = str(message['SecurityId'])
-                if sec_id in rev_sec_map:
-                    sym = rev_sec_map[sec_id]
-                    st.session_state.LIVE_PRICES[sym] = float(message['LTP'])
-                    
-        feed = marketfeed.DhanFeed(c_id, a_token, instruments, "v2", on_connect=on_connect, on_message=on_message)
-        t = threading.Thread(target=feed.run_forever, daemon=True)
-        t.start()
-        return True
+            tick = parse_tick(message)
+            tick_store.on_tick(tick)
+            bar_builder.on_tick(tick)
+        
+        # replay: రికార్డ్ అయిన టిక్ స్ట్రీమ్ నే అదే టైమింగ్ తో (క్రెడెన్షియల్స్ అవసరం లేదు)
+        if DATA.replaying:
+            return FeedSubscriptionManager(lambda instruments: DATA.replay_feed(instruments, on_connect, on_message))
+        c_id = st.secrets["dhan"]["client_id"]
+        a_token = st.secrets["dhan"]["access_token"]
+        on_message = DATA.tap_ticks(on_message)
+        
+        # 🔥 ఒక్కో shard కి ఒక DhanFeed కనెక్షన్, ఇన్స్ట్రుమెంట్స్ లిస్ట్ SubscriptionManager ఇస్తుంది
+        def make_feed(instruments):
+            return marketfeed.DhanFeed(c_id, a_token, instruments, "v2", on_connect=on_connect, on_message=on_message)
+        return FeedSubscriptionManager(make_feed)
     except Exception as e:
-        return False
-
-start_live_ticker()
+        return None
+
+def live_feed_universe():
+    # fetch_all_data స్కాన్ చేసే స్టాక్స్ + పోర్ట్‌ఫోలియో, pins & alerts వేరుగా
+    port_stocks = [str(sym).upper().strip() for sym in load_portfolio()['Symbol'].tolist() if str(sym).strip() != ""]
+    base = NIFTY_50 + FNO_STOCKS + MIDCAP_150 + SMALLCAP_250 + port_stocks
+    extra = [t.replace(".NS", "") for t in list(st.session_state.pinned_stocks) + list(st.session_state.custom_alerts.keys())]
+    return [sec_map[s] for s in dict.fromkeys(base) if s in sec_map], [sec_map[s] for s in extra if s in sec_map]
+
+def overlay_live_ticks(df):
+    ticks = get_tick_store().lookup([sec_map.get(t.replace(".NS", "")) for t in df['Fetch_T']])
+    has_tick = ~np.isnan(ticks['ltp'])
+    # సింబల్ -> లాస్ట్ టిక్ seq (గ్లోబల్ కౌంటర్) - రెండర్ మెమో కీ కోసం
+    seq = pd.Series(ticks['seq'], index=df['Fetch_T'].to_numpy())
+    seq = seq[~seq.index.duplicated()]
+    if not has_tick.any(): return df, seq
+    ltp = pd.Series(ticks['ltp'], index=df.index)
+    df['P'] = df['P'].where(~has_tick, ltp)
+    df['Day_C'] = df['Day_C'].where(~(has_tick & (df['O'] > 0)), (ltp - df['O']) / df['O'] * 100)
+    df['C'] = df['C'].where(~(has_tick & (df['Prev_C'] > 0)), (ltp - df['Prev_C']) / df['Prev_C'] * 100)
+    has_atp = ticks['avg_price'] > 0
+    df['VWAP'] = df['VWAP'].where(~has_atp, pd.Series(ticks['avg_price'], index=df.index))
+    return df, seq
+
+def rows_version(fetch_syms):
+    # 🔥 టేబుల్ రోస్ కి మాత్రమే: స్నాప్‌షాట్ వెర్షన్ + ఆ సింబల్స్ లాస్ట్ టిక్ seq లో max
+    # (టిక్ వచ్చిన ప్రతి సింబల్ కి seq = కొత్త గ్లోబల్ వెర్షన్, అందుకే max మారితే ఈ రోస్ లో ఏదో ఒకటి టిక్ అయినట్టే)
+    seq = tick_seq.reindex(pd.Index(fetch_syms)).fillna(0) if len(fetch_syms) and not tick_seq.empty else None
+    return market_snapshot.version, int(seq.max()) if seq is not None else 0
+
+def table_version(df_subset, *args, **kwargs):
+    return rows_version(df_subset['Fetch_T'] if 'Fetch_T' in df_subset.columns else [])
+
+def portfolio_version(df_port, *args, **kwargs):
+    syms = [str(s).upper().strip() + ".NS" for s in df_port['Symbol']] if 'Symbol' in df_port.columns else []
+    return get_portfolio_db().version, rows_version(syms)
+
+feed_manager = start_live_ticker()
+if feed_manager:
+    try: feed_manager.sync(*live_feed_universe())
+    except Exception: pass
 
 def get_minutes_passed():
     now = datetime.now()
@@ -544,13 +702,20 @@ def get_minutes_passed():
     return min(375, max(1, int((now - open_time).total_seconds() / 60)))
 
 # --- 5-MIN CACHED FETCH ENGINE (FAST PAGE LOADS) ---
-def fetch_single_dhan_5m(symbol, sec_id):
+def dhan_rate_limited(res):
+    # Dhan రేట్ లిమిట్ (DH-904 / 429) వస్తే మాత్రమే retry, "no data" లాంటి వాటికి కాదు
+    if not isinstance(res, dict) or res.get('status') == 'success': return False
+    msg = str(res.get('remarks', '')) + str(res.get('data', ''))
+    return 'DH-904' in msg or '429' in msg or 'Too many' in msg
+
+async def fetch_single_dhan_5m(symbol, sec_id):
     try:
+        http = get_http_client()
         to_date = datetime.now().strftime('%Y-%m-%d')
         from_date = (datetime.now() - pd.Timedelta(days=5)).strftime('%Y-%m-%d')
-        res = dhan.intraday_minute_data(symbol=sec_id, exchange_segment='NSE_EQ', instrument_type='EQUITY', from_date=from_date, to_date=to_date)
+        res = await http.call("dhan", dhan.intraday_minute_data, symbol=sec_id, exchange_segment='NSE_EQ', instrument_type='EQUITY', from_date=from_date, to_date=to_date, retry_if=dhan_rate_limited)
         if not isinstance(res, dict) or res.get('status') != 'success' or not res.get('data'):
-            res = dhan.historical_minute_charts(symbol=sec_id, exchange_segment='NSE_EQ', instrument_type='EQUITY', expiry_code=0, from_date=from_date, to_date=to_date)
+            res = await http.call("dhan", dhan.historical_minute_charts, symbol=sec_id, exchange_segment='NSE_EQ', instrument_type='EQUITY', expiry_code=0, from_date=from_date, to_date=to_date, retry_if=dhan_rate_limited)
         
         if isinstance(res, dict) and res.get('status') == 'success' and res.get('data'):
             df = pd.DataFrame(res['data'])
@@ -567,8 +732,16 @@ def fetch_single_dhan_5m(symbol, sec_id):
     except: pass
     return symbol, pd.DataFrame()
 
-@st.cache_data(ttl=30, show_spinner=False)
-def fetch_cached_5m_data(tkrs_list):
+async def fetch_dhan_5m_live(symbol, sec_id):
+    # 🔥 ఉదయం ఒకసారి REST backfill, తర్వాత వెబ్‌సాకెట్ టిక్స్ తో తయారైన లైవ్ 5m క్యాండిల్స్
+    builder = get_bar_builder()
+    if builder.needs_backfill(sec_id):
+        _, df = await fetch_single_dhan_5m(symbol, sec_id)
+        if df.empty: return symbol, df
+        builder.seed(sec_id, df)
+    return symbol, builder.frame(sec_id)
+
+def fetch_5m_panel(tkrs_list):
     dhan_tasks, yf_tkrs, results_dict = {}, [], {}
     for tkr in tkrs_list:
         clean_sym = tkr.replace(".NS", "")
@@ -583,15 +756,17 @@ def fetch_cached_5m_data(tkrs_list):
         dhan_tasks = {} # Dhan లిస్ట్ క్లియర్ చేస్తున్నాం
         
     if dhan and dhan_tasks:
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            futures = {executor.submit(fetch_single_dhan_5m, tkr, data[1]): tkr for tkr, data in dhan_tasks.items()}
-            for future in concurrent.futures.as_completed(futures):
-                tkr, df = future.result()
-                if not df.empty: results_dict[tkr] = df
-                else: yf_tkrs.append(tkr)
+        # 🔥 థ్రెడ్ పూల్ బదులు async క్లయింట్: Dhan రేట్ లిమిట్ వరకు మాత్రమే ప్యారలల్
+        with PERF.span("fetch.dhan.5m", symbols=len(dhan_tasks)):
+            results = get_http_client().run([fetch_dhan_5m_live(tkr, data[1]) for tkr, data in dhan_tasks.items()])
+        for tkr, res in zip(dhan_tasks.keys(), results):
+            df = res[1] if isinstance(res, tuple) else pd.DataFrame()
+            if not df.empty: results_dict[tkr] = df
+            else: yf_tkrs.append(tkr)
 
     if yf_tkrs:
-        yf_data = yf.download(yf_tkrs, period="5d", interval="5m", progress=False, group_by='ticker', threads=10)
+        with PERF.span("fetch.yahoo.5m", symbols=len(yf_tkrs)):
+            yf_data = DATA.yf_download(yf_tkrs, period="5d", interval="5m", progress=False, group_by='ticker', threads=10)
         if len(yf_tkrs) == 1:
             if not yf_data.empty: 
                 yf_data.index = yf_data.index.tz_localize(None)
@@ -608,289 +783,142 @@ def fetch_cached_5m_data(tkrs_list):
     if valid_results:
         return pd.concat(valid_results.values(), axis=1, keys=valid_results.keys(), sort=False)
     return pd.DataFrame()
+
+@shared_data(ttl=30)
+def fetch_cached_5m_data(tkrs_list):
+    # బ్యాక్‌గ్రౌండ్ స్నాప్‌షాట్ లో ఇంకా లేని సింబల్స్ కి మాత్రమే (ఉదా: కొత్తగా సెర్చ్ చేసిన స్టాక్)
+    # కాష్ లో కాంపాక్ట్ (float32 / int వాల్యూమ్) ఫార్మాట్ లో
+    return compact_frame(fetch_5m_panel(tkrs_list))
+# --- LOCAL BAR STORE (ఒకసారి backfill, తర్వాత డెల్టా మాత్రమే) ---
+BAR_BACKFILL_PERIOD = {"1d": "2y", "1wk": "2y"}
+
+@st.cache_resource(show_spinner=False)
+def get_bar_store():
+    store_dir = os.environ.get("BAR_STORE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".bar_store"))
+    return BarStore(store_dir)
+
+def yf_download_bars(chunk, interval="1d", **kwargs):
+    # ప్రతి చంక్ విడిగా టైమ్ (backfill = period, delta = start)
+    with PERF.span(f"fetch.yahoo.{interval}", symbols=len(chunk), kind="backfill" if 'period' in kwargs else "delta"):
+        temp_data = DATA.yf_download(chunk, interval=interval, progress=False, group_by='ticker', threads=5, **kwargs)
+    # సింగిల్ స్టాక్ వస్తే MultiIndex ఎర్రర్ రాకుండా సేఫ్టీ చెక్
+    if not temp_data.empty and len(chunk) == 1 and not isinstance(temp_data.columns, pd.MultiIndex):
+        temp_data.columns = pd.MultiIndex.from_product([chunk, temp_data.columns])
+    return temp_data
+
+def load_stored_bars(tkrs, interval, since):
+    store = get_bar_store()
+    store.top_up(tkrs, interval, BAR_BACKFILL_PERIOD[interval], lambda chunk, **kw: yf_download_bars(chunk, interval, **kw))
+    return store.load_panel(tkrs, interval, since=since)
+
 # ==========================================
 # 🔥 NEW: HISTORICAL CHARTS CACHE FUNCTION 🔥
 # ==========================================
-@st.cache_data(ttl=3600, show_spinner=False)
+@shared_data(ttl=3600)
 def fetch_historical_charts_data(tkrs, timeframe):
     # 🔥 Yahoo Finance టైమ్‌జోన్ బగ్ ని కంట్రోల్ చేయడానికి విడివిడిగా లాగుతున్నాం
     idx_list = [t for t in tkrs if "^" in t or "=" in t]
     stk_list = [t for t in tkrs if t not in idx_list]
     
-    p, i = ("2y", "1wk") if timeframe == "Weekly Chart" else ("1y", "1d")
+    yrs, i = (2, "1wk") if timeframe == "Weekly Chart" else (1, "1d")
+    since = pd.Timestamp.now().normalize() - pd.DateOffset(years=yrs)
     
     res = []
-    if idx_list: res.append(yf.download(idx_list, period=p, interval=i, progress=False, group_by='ticker', threads=5))
-    if stk_list: res.append(yf.download(stk_list, period=p, interval=i, progress=False, group_by='ticker', threads=5))
+    if idx_list: res.append(load_stored_bars(idx_list, i, since))
+    if stk_list: res.append(load_stored_bars(stk_list, i, since))
+    res = [r for r in res if not r.empty]
     
-    if len(res) == 2: return pd.concat(res, axis=1)
-    elif len(res) == 1: return res[0]
+    if len(res) == 2: return compact_frame(pd.concat(res, axis=1))
+    elif len(res) == 1: return compact_frame(res[0])
     return pd.DataFrame()
 # --- DAILY DATA FETCH ---
-@st.cache_data(ttl=180, show_spinner=False)
-def fetch_all_data():
+def portfolio_extra_symbols():
+    # యూనివర్స్ లో లేని పోర్ట్‌ఫోలియో స్టాక్స్ మాత్రమే - ఇవి మారితేనే రేడార్ లో కొత్త సింబల్స్ కావాలి
     port_df = load_portfolio()
-    port_stocks = [str(sym).upper().strip() for sym in port_df['Symbol'].tolist() if str(sym).strip() != ""]
-    
+    port_stocks = {str(sym).upper().strip() for sym in port_df['Symbol'].tolist() if str(sym).strip() != ""}
+    return tuple(sorted(port_stocks - UNIVERSE_STOCK_NAMES))
+
+# 🔥 ఇది ఇప్పుడు MarketRefresher బ్యాక్‌గ్రౌండ్ థ్రెడ్ లో రన్ అవుతుంది (cache_data TTL అవసరం లేదు)
+def fetch_all_data(port_extra=()):
     # 🔥 Nifty 50, F&O మరియు పైన గ్లోబల్ గా ఇచ్చిన Mid & Small Cap స్టాక్స్ అన్నీ తీసుకుంటున్నాం
-    base_stocks = NIFTY_50.copy() + FNO_STOCKS + MIDCAP_150 + SMALLCAP_250
-        
-    all_stocks = set(base_stocks + port_stocks)
-    tkrs = list(INDICES_MAP.keys()) + list(SECTOR_INDICES_MAP.keys()) + list(COMMODITY_MAP.keys()) + [f"{t}.NS" for t in all_stocks if t]
-    
-    # 🔥 యాహూ ఫైనాన్స్ కనెక్షన్ కట్ అవ్వకుండా 200 స్టాక్స్ ని ఒక బ్యాచ్ లాగా డౌన్‌లోడ్ చేస్తున్నాం
-    chunk_size = 200
-    data_frames = []
+    all_stocks = UNIVERSE_STOCK_NAMES.union(port_extra)
+    tkrs = list(INDICES_MAP.keys()) + list(SECTOR_INDICES_MAP.keys()) + list(COMMODITY_MAP.keys()) + [f"{t}.NS" for t in sorted(all_stocks) if t]
     
-    for i in range(0, len(tkrs), chunk_size):
-        chunk = tkrs[i : i + chunk_size]
-        temp_data = yf.download(chunk, period="15mo", progress=False, group_by='ticker', threads=5)
-        if not temp_data.empty:
-            # సింగిల్ స్టాక్ వస్తే MultiIndex ఎర్రర్ రాకుండా సేఫ్టీ చెక్
-            if len(chunk) == 1:
-                temp_data.columns = pd.MultiIndex.from_product([chunk, temp_data.columns])
-            data_frames.append(temp_data)
+    # 🔥 యాహూ నుండి ప్రతిసారి 15 నెలలు లాగకుండా, లోకల్ స్టోర్ లో లేని కొత్త బార్స్ మాత్రమే (200 స్టాక్స్ బ్యాచ్ లుగా)
+    with PERF.span("fetch_all_data.bars", symbols=len(tkrs)):
+        data = load_stored_bars(tkrs, "1d", since=pd.Timestamp.now().normalize() - pd.DateOffset(months=15))
             
     # డేటా మొత్తం ఫెయిల్ అయితే, ఎర్రర్ రాకుండా ఎంప్టీ యాప్ చూపిస్తుంది
-    if not data_frames:
+    if data.empty:
         return pd.DataFrame()
-        
-    data = pd.concat(data_frames, axis=1)
-
-    results = []
-    minutes = get_minutes_passed()
-
-    # MultiIndex ఎర్రర్ రాకుండా సేఫ్టీ చెక్
-    fetched_symbols = data.columns.levels[0] if isinstance(data.columns, pd.MultiIndex) else data.columns
 
-    nifty_dist = 0.1
-    if "^NSEI" in fetched_symbols:
-        try:
-            n_df = data["^NSEI"].dropna(subset=['Close'])
-            if not n_df.empty:
-                n_ltp = float(n_df['Close'].iloc[-1])
-                n_vwap = (float(n_df['High'].iloc[-1]) + float(n_df['Low'].iloc[-1]) + n_ltp) / 3
-                if n_vwap > 0: nifty_dist = abs(n_ltp - n_vwap) / n_vwap * 100
-        except: pass
-
-    for symbol in data.columns.levels[0]:
-        try:
-            df = data[symbol].dropna(subset=['Close'])
-            if len(df) < 2: continue
-            
-            ltp = float(df['Close'].iloc[-1])
-            open_p = float(df['Open'].iloc[-1])
-            prev_c = float(df['Close'].iloc[-2])
-            prev_h = float(df['High'].iloc[-2])
-            prev_l = float(df['Low'].iloc[-2])
-            low = float(df['Low'].iloc[-1])
-            high = float(df['High'].iloc[-1])
-            
-            day_chg = ((ltp - open_p) / open_p) * 100
-            net_chg = ((ltp - prev_c) / prev_c) * 100
-            
-            p_pivot = (prev_h + prev_l + prev_c) / 3
-            p_bc = (prev_h + prev_l) / 2
-            p_tc = (p_pivot - p_bc) + p_pivot
-            cpr_width_pct = abs(p_tc - p_bc) / p_pivot * 100
-            is_narrow_cpr = bool(cpr_width_pct <= 0.30) 
-            
-            high_low = df['High'] - df['Low']
-            high_prev_close = (df['High'] - df['Close'].shift(1)).abs()
-            low_prev_close = (df['Low'] - df['Close'].shift(1)).abs()
-            tr = pd.concat([high_low, high_prev_close, low_prev_close], axis=1).max(axis=1)
-            atr = tr.ewm(span=14, adjust=False).mean().iloc[-1]
-
-            if 'Volume' in df.columns and not df['Volume'].isna().all() and len(df) >= 6:
-                avg_vol_5d = df['Volume'].iloc[-6:-1].mean()
-                curr_vol = float(df['Volume'].iloc[-1])
-                vol_x = round(curr_vol / ((avg_vol_5d/375) * minutes), 1) if avg_vol_5d > 0 else 0.0
-            else: 
-                vol_x = 0.0; curr_vol = 0.0
-                
-            vwap = (high + low + ltp) / 3
-            
-            high_low_range = high - low
-            bull_power = 0; bear_power = 0
-            if high_low_range > 0:
-                bull_power = ((ltp - low) / high_low_range) * 100
-                bear_power = ((high - ltp) / high_low_range) * 100
+    # 🔥 పాత per-symbol లూప్ బదులు అన్ని స్టాక్స్ కి ఒకే పాస్ లో ఇండికేటర్స్ (radar_engine)
+    with PERF.span("radar.compute", symbols=len(tkrs)):
+        res_df = compute_daily_radar(data, get_minutes_passed(), benchmark="^NSEI")
+    if res_df.empty: return res_df
+
+    res_df['T'] = res_df['Fetch_T'].map(lambda s: INDICES_MAP.get(s, SECTOR_INDICES_MAP.get(s, COMMODITY_MAP.get(s, s.replace(".NS", "")))))
+    # 🔥 మెంబర్‌షిప్ బిట్స్ & సెక్టార్ యూనివర్స్ ఇండెక్స్ నుండి ఒకే లుక్అప్ లో (తర్వాత ఫిల్టర్స్ అన్నీ U_Mask మీదే)
+    u_mask = UNIVERSE.mask_of(res_df['Fetch_T'])
+    res_df['Is_Index'] = (u_mask & U_INDEX) != 0
+    res_df['Is_Sector'] = (u_mask & U_SECTOR) != 0
+    res_df['Is_Commodity'] = (u_mask & U_COMMODITY) != 0
+    res_df['Sector'] = UNIVERSE.sector_of(res_df['Fetch_T'])
+    res_df['U_Mask'] = u_mask
+    return res_df[RADAR_COLUMNS + ['U_Mask']]
+# --- INTRADAY 5-MIN INDICATORS (incremental state per symbol) ---
+@st.cache_resource(show_spinner=False)
+def get_intraday_states():
+    return {}
+
+def process_5m_data(df_raw, sym=None):
+    # 🔥 ప్రతి రీరన్ కి 5 రోజుల EMA/ATR/VWAP మళ్ళీ లెక్కించకుండా, లాస్ట్ క్యాండిల్ మాత్రమే అప్డేట్
+    if sym is None: return IntradayIndicatorState().update(df_raw)
+    states = get_intraday_states()
+    state = states.get(sym) or states.setdefault(sym, IntradayIndicatorState())
+    return state.update(df_raw)
+
+@PERF.timed("process_5m_data")
+def process_5m_panel(panel, tkrs):
+    # రా 5m ప్యానెల్ -> {Fetch_T: ఈరోజు df_day (EMA/VWAP/ATR తో)}
+    is_multi = isinstance(panel.columns, pd.MultiIndex)
+    fetched = set(panel.columns.levels[0]) if is_multi else set()
+    charts = {}
+    for sym in tkrs:
+        if is_multi and sym in fetched: df_raw = panel[sym]
+        elif not is_multi and len(tkrs) == 1 and not panel.empty: df_raw = panel
+        else: df_raw = pd.DataFrame()
+        charts[sym] = process_5m_data(df_raw, sym) if not df_raw.empty else pd.DataFrame()
+    return charts
+
+# --- BACKGROUND MARKET REFRESHER (రీరన్స్ స్నాప్‌షాట్ ని చదువుతాయి మాత్రమే) ---
+@PERF.timed("refresh.radar")
+def refresh_radar(refresher):
+    port_extra = portfolio_extra_symbols()
+    df = fetch_all_data(port_extra)
+    if df.empty: return None
+    df.attrs['port_extra'] = port_extra
+    # స్నాప్‌షాట్ లో కాంపాక్ట్ ఫార్మాట్ (float32, categorical సింబల్స్/సెక్టార్స్, Flags బిట్‌ఫీల్డ్)
+    return compact_radar(df)
+
+@PERF.timed("refresh.intraday")
+def refresh_intraday(refresher):
+    tkrs = refresher.wanted("intraday")
+    if not tkrs: return None
+    return compact_chart_frames(process_5m_panel(fetch_5m_panel(tkrs), tkrs))
 
-            ema50_d = float(df['Close'].ewm(span=50, adjust=False).mean().iloc[-1]) if len(df) >= 50 else 0.0
-            
-            
-            # MINERVINI METRICS
-            sma50_d = float(df['Close'].rolling(window=50).mean().iloc[-1]) if len(df) >= 50 else 0.0
-            sma150_d = float(df['Close'].rolling(window=150).mean().iloc[-1]) if len(df) >= 150 else 0.0
-            sma200_d = float(df['Close'].rolling(window=200).mean().iloc[-1]) if len(df) >= 200 else 0.0
-            high_52w = float(df['High'].rolling(window=252).max().iloc[-1]) if len(df) >= 252 else float(df['High'].max())
-            low_52w = float(df['Low'].rolling(window=252).min().iloc[-1]) if len(df) >= 252 else float(df['Low'].min())
-            sma200_20d = float(df['Close'].rolling(window=200).mean().iloc[-21]) if len(df) >= 220 else 0.0
-            # VCP CONTRACTION & VOLUME DRY-UP LOGIC (Practical & Relaxed)
-            vcp_price_contraction = False
-            vcp_vol_dry = False
-            if len(df) >= 60:
-                # 60 Days (3 Months) Range
-                max_60 = float(df['High'].iloc[-60:].max()); min_60 = float(df['Low'].iloc[-60:].min())
-                range_60 = (max_60 - min_60) / min_60 if min_60 > 0 else 0
-                
-                # 10 Days (2 Weeks) Tight Range - (Relaxed to 15%)
-                max_10 = float(df['High'].iloc[-10:].max()); min_10 = float(df['Low'].iloc[-10:].min())
-                range_10 = (max_10 - min_10) / min_10 if min_10 > 0 else 0
-                
-                # ప్రైస్ కన్సాలిడేషన్: 10 రోజుల రేంజ్ 15% లోపు ఉండాలి & 60 రోజుల రేంజ్ లో 75% కన్నా తక్కువ ఉండాలి
-                if (range_60 > 0) and (range_10 <= (range_60 * 0.75)) and (range_10 <= 0.15):
-                    vcp_price_contraction = True
-                    
-                # వాల్యూమ్ డ్రై అప్: లాస్ట్ 5 రోజుల వాల్యూమ్, 50 రోజుల యావరేజ్ దరిదాపుల్లో లేదా తక్కువ ఉండాలి (Relaxed to 1.05x)
-                if 'Volume' in df.columns and len(df) >= 50:
-                    vol_avg_5 = float(df['Volume'].iloc[-5:].mean())
-                    vol_avg_50 = float(df['Volume'].iloc[-50:].mean())
-                    if vol_avg_5 <= (vol_avg_50 * 1.05):
-                        vcp_vol_dry = True
-            
-            is_swing = False; is_w_pullback = False
-            latest_w_ema10 = 0; latest_w_ema50 = 0
-            
-            df_w = df.resample('W').agg({'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}).dropna()
-            weekly_net_chg = net_chg
-            if len(df_w) >= 2: 
-                prev_w_c = float(df_w['Close'].iloc[-2])
-                if prev_w_c > 0: weekly_net_chg = ((ltp - prev_w_c) / prev_w_c) * 100
-                    
-            if len(df_w) >= 75: 
-                df_w['EMA_10'] = df_w['Close'].ewm(span=10, adjust=False).mean()
-                df_w['EMA_50'] = df_w['Close'].ewm(span=50, adjust=False).mean()
-                latest_w_ema10 = float(df_w['EMA_10'].iloc[-1])
-                latest_w_ema50 = float(df_w['EMA_50'].iloc[-1])
-                df_w['Trend_Up'] = np.where(df_w['EMA_10'] > df_w['EMA_50'], 1, 0)
-                continuous_4w = df_w['Trend_Up'].rolling(window=4).min().iloc[-1] == 1
-                w_tr = pd.concat([df_w['High'] - df_w['Low'], (df_w['High'] - df_w['Close'].shift(1)).abs(), (df_w['Low'] - df_w['Close'].shift(1)).abs()], axis=1).max(axis=1)
-                w_atr14 = w_tr.ewm(alpha=1/14, adjust=False).mean()
-                w_plus_dm = df_w['High'].diff()
-                w_minus_dm = df_w['Low'].shift(1) - df_w['Low']
-                w_plus_dm = w_plus_dm.where((w_plus_dm > w_minus_dm) & (w_plus_dm > 0), 0.0)
-                w_minus_dm = w_minus_dm.where((w_minus_dm > w_plus_dm) & (w_minus_dm > 0), 0.0)
-                w_plus_di = 100 * (w_plus_dm.ewm(alpha=1/14, adjust=False).mean() / w_atr14)
-                w_minus_di = 100 * (w_minus_dm.ewm(alpha=1/14, adjust=False).mean() / w_atr14)
-                w_dx = (w_plus_di - w_minus_di).abs() / (w_plus_di + w_minus_di) * 100
-                w_adx = w_dx.ewm(alpha=1/14, adjust=False).mean().iloc[-1]
-                recent_w_low = df_w['Low'].iloc[-2:].min()
-                touch_ema = recent_w_low <= (latest_w_ema10 * 1.002) 
-                bounce = ltp > latest_w_ema10 
-                catch_early = ltp <= (latest_w_ema10 * 1.02)
-                if continuous_4w and touch_ema and bounce and catch_early and (w_adx >= 15):
-                    is_w_pullback = True
-
-            if len(df) >= 100:
-                ema20_w = latest_w_ema10 if latest_w_ema10 > 0 else 0
-                delta = df['Close'].diff()
-                gain = delta.clip(lower=0).ewm(alpha=1/14, adjust=False).mean()
-                loss = -delta.clip(upper=0).ewm(alpha=1/14, adjust=False).mean()
-                loss = loss.replace(0, np.nan)
-                rs = gain / loss
-                rsi = 100 - (100 / (1 + rs))
-                current_rsi = rsi.fillna(100).iloc[-1]
-                if (ltp > ema50_d) and (ltp > ema20_w) and (current_rsi >= 55) and (net_chg > 0):
-                    is_swing = True
-
-            score = 0
-            stock_dist = abs(ltp - vwap) / vwap * 100 if vwap > 0 else 0
-            effective_nifty = max(nifty_dist, 0.25) 
-            
-            if stock_dist > (effective_nifty * 3): score += 5
-            elif stock_dist > (effective_nifty * 2): score += 3
-            if abs(open_p - low) <= (ltp * 0.003) or abs(open_p - high) <= (ltp * 0.003): score += 3 
-            if vol_x > 1.0: score += 3 
-            if (ltp >= high * 0.998 and day_chg > 0.5) or (ltp <= low * 1.002 and day_chg < -0.5): score += 1
-            if (ltp > (low * 1.01) and ltp > vwap) or (ltp < (high * 0.99) and ltp < vwap): score += 1
-            if bull_power >= 85 and day_chg > 1.0: score += 3 
-            if bear_power >= 85 and day_chg < -1.0: score += 3
-            
-            is_index = symbol in INDICES_MAP
-            is_sector = symbol in SECTOR_INDICES_MAP
-            is_commodity = symbol in COMMODITY_MAP
-            disp_name = INDICES_MAP.get(symbol, SECTOR_INDICES_MAP.get(symbol, COMMODITY_MAP.get(symbol, symbol.replace(".NS", ""))))
-            
-            stock_sector = "OTHER"
-            if not is_index and not is_sector and not is_commodity:
-                for sec, stocks in NIFTY_50_SECTORS.items():
-                    if disp_name in stocks:
-                        stock_sector = sec
-                        break
-            
-            results.append({
-                "VCP_Contract": vcp_price_contraction, "VCP_Vol_Dry": vcp_vol_dry,
-                "Fetch_T": symbol, "T": disp_name, "P": ltp, "O": open_p, "H": high, "L": low, "Prev_C": prev_c,
-                "Prev_H": prev_h, "Prev_L": prev_l, "W_EMA10": latest_w_ema10, "W_EMA50": latest_w_ema50, "D_EMA50": ema50_d,
-                "SMA50": sma50_d, "SMA150": sma150_d, "SMA200": sma200_d, "High52W": high_52w, "Low52W": low_52w, "SMA200_20D": sma200_20d,
-                "Day_C": day_chg, "C": net_chg, "W_C": float(weekly_net_chg), "S": score, "VolX": vol_x, "Is_Swing": is_swing,
-                "Is_W_Pullback": is_w_pullback, "VWAP": vwap,
-                "ATR": atr, "Narrow_CPR": is_narrow_cpr,
-                "Bull_P": bull_power, "Bear_P": bear_power,
-                "Is_Index": is_index, "Is_Sector": is_sector, "Sector": stock_sector, "Is_Commodity": is_commodity
-            })
-        except: continue
-    return pd.DataFrame(results)
-def process_5m_data(df_raw):
-    try:
-        df_s = df_raw.dropna(subset=['Open', 'High', 'Low', 'Close']).copy()
-        if df_s.empty: return pd.DataFrame()
-        df_s = df_s.sort_index()
-        
-        df_s['EMA_10'] = df_s['Close'].ewm(span=10, adjust=False).mean()
-        df_s['EMA_20'] = df_s['Close'].ewm(span=20, adjust=False).mean()
-        df_s['EMA_50'] = df_s['Close'].ewm(span=50, adjust=False).mean()
+@st.cache_resource(show_spinner=False)
+def get_market_refresher():
+    refresher = MarketRefresher()
+    refresher.add_job("radar", 180, refresh_radar)
+    refresher.add_job("intraday", 30, refresh_intraday)
+    return refresher.start()
 
-        # ఇక్కడ మార్చండి:
-        if 'Volume' in df_s.columns:
-            df_s['Vol_SMA_375'] = df_s['Volume'].rolling(window=375, min_periods=1).mean()
-        else:
-            df_s['Vol_SMA_375'] = 0
-            
-        df_s['TR'] = pd.concat([
-            df_s['High'] - df_s['Low'],
-            (df_s['High'] - df_s['Close'].shift(1)).abs(),
-            (df_s['Low'] - df_s['Close'].shift(1)).abs()
-        ], axis=1).max(axis=1)
-        df_s['ATR_13'] = df_s['TR'].ewm(span=13, adjust=False).mean()
-
-        df_s.index = pd.to_datetime(df_s.index)
-        unique_dates = sorted(list(set(df_s.index.date)))
-        target_date = unique_dates[-1] 
-        df_day = df_s[df_s.index.date == target_date].copy()
-        
-        if not df_day.empty:
-            df_day['Typical_Price'] = (df_day['High'] + df_day['Low'] + df_day['Close']) / 3
-            if 'Volume' in df_day.columns and df_day['Volume'].sum() > 0:
-                vol_cumsum = df_day['Volume'].cumsum()
-                df_day['VWAP'] = (df_day['Typical_Price'] * df_day['Volume']).cumsum() / vol_cumsum.replace(0, np.nan)
-                df_day['VWAP'] = df_day['VWAP'].fillna(df_day['Typical_Price'].expanding().mean())
-            else: 
-                df_day['VWAP'] = df_day['Typical_Price'].expanding().mean()
-            df_day = df_day.bfill().ffill()
-            return df_day
-        return pd.DataFrame()
-    except: return pd.DataFrame()
-
-def generate_status(row):
-    status = ""
-    p = row.get('P', 0)
-    if row.get('Bull_P', 0) >= 80: status += f"🐂Bulls {int(row['Bull_P'])}% "
-    elif row.get('Bear_P', 0) >= 80: status += f"🐻Bears {int(row['Bear_P'])}% "
-    if 'AlphaTag' in row and row['AlphaTag']: status += f"{row['AlphaTag']} "
-    if 'O' in row and 'L' in row and abs(row['O'] - row['L']) < (p * 0.002): status += "O=L🔥 "
-    if 'O' in row and 'H' in row and abs(row['O'] - row['H']) < (p * 0.002): status += "O=H🩸 "
-    if row.get('C', 0) > 0 and row.get('Day_C', 0) > 0 and row.get('VolX', 0) > 1.5: status += "Rec⇈ "
-    if row.get('VolX', 0) > 1.5: status += "VOL🟢 "
-    return status.strip()
-
-@st.cache_data(ttl=86400, show_spinner=False)
+@tracked_cache_data(ttl=86400, show_spinner=False)
 def fetch_fundamentals_data(symbols_list):
     def get_info(sym):
         try:
-            tkr = yf.Ticker(f"{sym}")
-            info = tkr.info
+            info = DATA.yf_info(f"{sym}")
             return {
                 "Fetch_T": sym,
                 "Sector": info.get('sector', 'N/A'),
@@ -914,6 +942,27 @@ def fetch_fundamentals_data(symbols_list):
                 
     return pd.DataFrame(fund_data)   
 
+# --- RENDER MEMO ---
+# 🔥 ఆటో-రీఫ్రెష్ లో డేటా మారకపోతే టేబుల్స్ / చార్ట్స్ మళ్ళీ బిల్డ్ చేయదు (అన్ని సెషన్స్ కి ఒకటే)
+@st.cache_resource(show_spinner=False)
+def get_render_cache():
+    return RenderCache(max_items=int(os.environ.get("RENDER_CACHE_ITEMS", "512")))
+
+def render_memo(name, extra=None, shallow=False):
+    # మెమో హిట్ అయినా మిస్ అయినా render_* మొత్తం టైమ్ ప్యానెల్ లో కనిపిస్తుంది
+    memo = get_render_cache().memo(name, extra, shallow)
+    return lambda func: PERF.timed(f"render.{name}")(memo(func))
+
+# 🔥 చార్ట్ కార్డ్ వెడల్పు (px) - 8 కాలమ్స్ డెస్క్‌టాప్ / 2 కాలమ్స్ మొబైల్ లో ~200px
+CHART_MAX_BARS = max_bars_for_width(os.environ.get("CHART_CARD_PX", "220"))
+# 🔥 ఒక్కో గ్రిడ్ లో మొదట ఇన్ని చార్ట్స్ మాత్రమే (పిన్ చేసినవి ఎప్పుడూ అన్నీ)
+CHART_PAGE_SIZE = int(os.environ.get("CHART_PAGE_SIZE", "6"))
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    return FigureCache(max_bytes=int(os.environ.get("FIGURE_CACHE_MB", "64")) << 20)
+
+@render_memo("mf_table")
 def render_mf_table(df_mf):
     if df_mf.empty: return "<div style='padding:20px; text-align:center;'>No Mutual Fund data available.</div>"
     html = f'<table class="term-table"><thead><tr><th colspan="7" class="term-head-swing" style="background-color: #005a9e; color: white;">🏆 MUTUAL FUNDS SCREEENER (LIVE PERFORMANCE)</th></tr><tr style="background-color: #21262d;"><th style="width:5%;">RANK</th><th style="text-align:left; width:25%;">FUND NAME</th><th style="width:15%; color:#ffd700;">CATEGORY</th><th style="width:10%;">NAV (₹)</th><th style="width:15%;">1Y RETURN</th><th style="width:15%;">3Y CAGR</th><th style="width:15%;">5Y CAGR</th></tr></thead><tbody>'
@@ -935,24 +984,20 @@ def render_mf_table(df_mf):
         
     html += "</tbody></table>"
     return html
+# 🔥 మార్కెట్ టేబుల్స్: కీ = స్నాప్‌షాట్ వెర్షన్ + ఆ టేబుల్ సింబల్స్ టిక్ seq + సెషన్ ఇన్‌పుట్స్ (ఫుల్ ఫ్రేమ్ హాష్ లేదు)
+# వేరే సింబల్ కి టిక్ వచ్చినా ఈ టేబుల్ మళ్ళీ బిల్డ్ కాదు
+@render_memo("html_table", extra=table_version, shallow=True)
 def render_html_table(df_subset, title, color_class):
-    if df_subset.empty: return ""
-    html = f'<table class="term-table"><thead><tr><th colspan="7" class="{color_class}">{title}</th></tr><tr style="background-color: #21262d;"><th style="text-align:left; width:20%;">STOCK</th><th style="width:12%;">PRICE</th><th style="width:12%;">DAY%</th><th style="width:12%;">NET%</th><th style="width:10%;">VOL</th><th style="width:26%;">STATUS</th><th style="width:8%;">SCORE</th></tr></thead><tbody>'
-    for i, (_, row) in enumerate(df_subset.iterrows()):
-        bg_class = "row-dark" if i % 2 == 0 else "row-light"
-        day_color = "text-green" if row['Day_C'] >= 0 else "text-red"
-        net_color = "text-green" if row['C'] >= 0 else "text-red"
-        status = generate_status(row)
-        html += f'<tr class="{bg_class}"><td class="t-symbol {net_color}"><a href="https://in.tradingview.com/chart/?symbol=NSE:{row["T"]}" target="_blank">{row["T"]}</a></td><td>{row["P"]:.2f}</td><td class="{day_color}">{row["Day_C"]:.2f}%</td><td class="{net_color}">{row["C"]:.2f}%</td><td>{row["VolX"]:.1f}x</td><td style="font-size:10px;">{status}</td><td style="color:#ffd700;">{int(row["S"])}</td></tr>'
-    html += "</tbody></table>"
-    return html
+    return term_table_html(df_subset, title, color_class)
 
+@render_memo("portfolio_table", extra=portfolio_version, shallow=True)
 def render_portfolio_table(df_port, df_stocks, weekly_trends, port_sort="Default"):
     if df_port.empty: return "<div style='padding:20px; text-align:center; color:#8b949e; border: 1px dashed #30363d; border-radius:8px;'>Portfolio is empty. Add a stock using the option below!</div>"
     
     rows_data = []
     total_invested, total_current, total_day_pnl = 0, 0, 0
     
+    live_idx = RadarIndex(df_stocks, keys=('T',))
     for i, (_, row) in enumerate(df_port.iterrows()):
         sym = str(row['Symbol']).upper().strip()
         try: qty = float(row['Quantity'])
@@ -963,13 +1008,13 @@ def render_portfolio_table(df_port, df_stocks, weekly_trends, port_sort="Default
         date_val = str(row.get('Date', '-'))
         if date_val in ['nan', 'NaN', '']: date_val = '-'
         
-        live_row = df_stocks[df_stocks['T'] == sym]
+        live_row = live_idx.row(sym, key='T')
         trend_html = "➖"
         
-        if not live_row.empty:
-            ltp = float(live_row['P'].iloc[0])
-            prev_c = float(live_row['Prev_C'].iloc[0])
-            fetch_t = live_row['Fetch_T'].iloc[0]
+        if live_row is not None:
+            ltp = float(live_row['P'])
+            prev_c = float(live_row['Prev_C'])
+            fetch_t = live_row['Fetch_T']
             
             trend_state = weekly_trends.get(fetch_t, "Neutral")
             if trend_state == 'Bullish': trend_html = "🟢 Bullish"
@@ -1020,8 +1065,7 @@ def render_portfolio_table(df_port, df_stocks, weekly_trends, port_sort="Default
     
     # 🔥 ACTUAL P&L CALCULATION (Open P&L + Closed P&L)
     try:
-        df_closed = load_closed_trades()
-        total_realized_pnl = pd.to_numeric(df_closed['PnL_Rs'], errors='coerce').sum() if not df_closed.empty else 0
+        total_realized_pnl = get_portfolio_db().realized_pnl() # SQL SUM, షీట్ మళ్ళీ చదవకుండా
     except:
         total_realized_pnl = 0
         
@@ -1034,19 +1078,20 @@ def render_portfolio_table(df_port, df_stocks, weekly_trends, port_sort="Default
     html += "</tbody></table>"
     return html
 
+@render_memo("portfolio_swing_advice", extra=portfolio_version, shallow=True)
 def render_portfolio_swing_advice_table(df_port, df_stocks, weekly_trends):
     if df_port.empty: return ""
     html = f'<table class="term-table"><thead><tr><th colspan="8" class="term-head-swing">🤖 PORTFOLIO SWING ADVISOR (ACTION & LEVELS)</th></tr><tr style="background-color: #21262d;"><th style="text-align:left; width:15%;">STOCK</th><th style="width:10%;">AVG PRICE</th><th style="width:10%;">LTP</th><th style="width:10%;">P&L %</th><th style="width:12%;">WK TREND</th><th style="width:13%; color:#f85149;">🛑 TRAILING SL</th><th style="width:13%; color:#3fb950;">🎯 NEXT TARGET</th><th style="width:17%;">💡 ACTION ADVICE</th></tr></thead><tbody>'
     
+    live_idx = RadarIndex(df_stocks, keys=('T',))
     for i, (_, row) in enumerate(df_port.iterrows()):
         bg_class = "row-dark" if i % 2 == 0 else "row-light"
         sym = str(row['Symbol']).upper().strip()
         try: buy_p = float(row['Buy_Price'])
         except: buy_p = 0
         
-        live_row = df_stocks[df_stocks['T'] == sym]
-        if live_row.empty: continue
-        live_data = live_row.iloc[0]
+        live_data = live_idx.row(sym, key='T')
+        if live_data is None: continue
         ltp = float(live_data['P'])
         
         pnl_pct = ((ltp - buy_p) / buy_p * 100) if buy_p > 0 else 0
@@ -1091,6 +1136,7 @@ def render_portfolio_swing_advice_table(df_port, df_stocks, weekly_trends):
     html += "</tbody></table>"
     return html
 
+@render_memo("swing_terminal", extra=table_version, shallow=True)
 def render_swing_terminal_table(df_subset):
     if df_subset.empty: return "<div style='padding:20px; text-align:center; color:#8b949e; border: 1px dashed #30363d; border-radius:8px;'>No Swing Trading Setups found right now.</div>"
     df_sorted = df_subset.reset_index(drop=True)
@@ -1123,6 +1169,7 @@ def render_swing_terminal_table(df_subset):
     html += "</tbody></table>"
     return html
 
+@render_memo("highscore_terminal", extra=table_version, shallow=True)
 def render_highscore_terminal_table(df_subset):
     if df_subset.empty: return "<div style='padding:20px; text-align:center; color:#8b949e; border: 1px dashed #30363d; border-radius:8px;'>No High Score Stocks found right now.</div>"
     is_ai = 'AI_Prob' in df_subset.columns
@@ -1156,6 +1203,7 @@ def render_highscore_terminal_table(df_subset):
     html += "</tbody></table>"
     return html
 
+@render_memo("levels_table", extra=table_version, shallow=True)
 def render_levels_table(df_subset):
     if df_subset.empty: return "<div style='padding:20px; text-align:center; color:#8b949e; border: 1px dashed #30363d; border-radius:8px;'>No Stocks found right now.</div>"
     df_sorted = df_subset.reset_index(drop=True)
@@ -1180,7 +1228,33 @@ def render_levels_table(df_subset):
     html += "</tbody></table>"
     return html
 
-def render_chart(row, df_chart, show_pin=True, key_suffix="", timeframe="Intraday (5m)", show_crosshair=False, show_vol=False):
+def cached_chart_figure(df_chart, fetch_sym, title_html, timeframe, show_crosshair, show_vol, alert_data=None, compact=False):
+    # 🔥 (సింబల్, టైమ్‌ఫ్రేమ్, ఆప్షన్స్, లాస్ట్ బార్ టైమ్) కీ తో ఫిగర్ క్యాచ్ - అన్ని సెషన్స్ కి ఒకటే
+    cache = get_figure_cache()
+    alert_key = (alert_data['price'], alert_data['type']) if alert_data else None
+    key = (fetch_sym, timeframe, show_vol, show_crosshair, compact, alert_key, df_chart.index[-1])
+    cols = [c for c in CHART_COLS if c in df_chart.columns]
+    values = df_chart[cols].to_numpy(dtype=float)
+    with cache.lock:
+        entry = cache.get(key)
+        if (entry is not None and entry['cols'] == cols and entry['index'].equals(df_chart.index)
+                and np.array_equal(entry['values'][:-1], values[:-1], equal_nan=True)):
+            if entry['title'] == title_html and np.array_equal(entry['values'][-1], values[-1], equal_nan=True):
+                return entry['fig']
+            # కాష్ లో ఉన్న ఫిగర్ ఇచ్చేశాక మారదు: ప్యాచ్ కొత్త కాపీ మీద, ఎంట్రీ స్వాప్
+            patched = patch_chart_figure(entry['fig'], df_chart, title_html)
+            if patched is not None:
+                entry.update(fig=patched, values=values, title=title_html)
+                cache.patches += 1
+                return patched
+    fig = build_chart_figure(df_chart, fetch_sym, title_html, timeframe, show_crosshair, show_vol, alert_data, compact)
+    # సీరియలైజ్డ్ JSON సైజ్ అంచనా (ప్రతి ట్రేస్ పాయింట్ ~ 5 నంబర్స్, హోవర్ టెక్స్ట్ ~ 120 బైట్స్)
+    nbytes = len(df_chart) * (len(fig.data) * 100 + 120) + len(title_html)
+    cache.put(key, dict(fig=fig, cols=cols, index=df_chart.index, values=values, title=title_html), nbytes)
+    return fig
+
+@PERF.timed("render_chart")
+def render_chart(row, df_chart, show_pin=True, key_suffix="", timeframe="Intraday (5m)", show_crosshair=False, show_vol=False, compact=False):
     display_sym = row['T']
     fetch_sym = row['Fetch_T']
     pct_val = float(row.get('W_C', row['Day_C'])) if timeframe == "Weekly Chart" else float(row['Day_C'])
@@ -1203,246 +1277,27 @@ def render_chart(row, df_chart, show_pin=True, key_suffix="", timeframe="Intrada
     
     try:
         if not df_chart.empty:
-            min_val = df_chart['Low'].min()
-            max_val = df_chart['High'].max()
-            y_padding = (max_val - min_val) * 0.15 if (max_val - min_val) != 0 else min_val * 0.005 
-            chart_times = pd.to_datetime(df_chart.index)
-            if chart_times.tz is not None: chart_times = chart_times.tz_convert('Asia/Kolkata')
-            else: chart_times = chart_times.tz_localize('UTC').tz_convert('Asia/Kolkata')
-                
-            hover_data = (
-                "🕒 " + chart_times.strftime('%d-%b %I:%M %p') + 
-                "<br>🟢 O: ₹" + df_chart['Open'].round(2).astype(str) + 
-                "<br>📈 H: ₹" + df_chart['High'].round(2).astype(str) + 
-                "<br>📉 L: ₹" + df_chart['Low'].round(2).astype(str) + 
-                "<br>🔴 C: ₹" + df_chart['Close'].round(2).astype(str)
-            )
-            
-            # 🔥 Advanced Price Candles (Volume Based Colors directly on Price)
-            def apply_standard_candles(fig_obj, is_subplot):
-                rc = dict(row=1, col=1) if is_subplot else dict()
-                
-                if 'Volume' in df_chart.columns:
-                    vol_sma = df_chart.get('Vol_SMA_89', df_chart['Volume'].rolling(window=20, min_periods=1).mean())
-                    hv_mask = df_chart['Volume'] > (vol_sma * 1.618)
-                    
-                    vwap_val = df_chart.get('VWAP', pd.Series(0, index=df_chart.index))
-                    ema10_val = df_chart.get('EMA_10', pd.Series(0, index=df_chart.index))
-                    
-                    strong_up = (df_chart['Close'] > vwap_val) & (df_chart['Close'] > ema10_val)
-                    strong_down = (df_chart['Close'] < vwap_val) & (df_chart['Close'] < ema10_val)
-                    
-                    bull = df_chart['Close'] >= df_chart['Open']
-                    bear = df_chart['Close'] < df_chart['Open']
-                    
-                    # సెపరేట్ మాస్క్‌లు
-                    mask_hv_bull = hv_mask & strong_up & bull
-                    mask_hv_bear = hv_mask & strong_down & bear
-                    mask_norm = ~(mask_hv_bull | mask_hv_bear)
-                else:
-                    mask_hv_bull = pd.Series(False, index=df_chart.index)
-                    mask_hv_bear = pd.Series(False, index=df_chart.index)
-                    mask_norm = pd.Series(True, index=df_chart.index)
-
-                def am(col, mask): return np.where(mask, df_chart[col], np.nan)
-
-                # 1. Normal Candles (మ్యూటెడ్ కలర్స్)
-                fig_obj.add_trace(go.Candlestick(
-                    x=df_chart.index, open=am('Open', mask_norm), high=am('High', mask_norm), low=am('Low', mask_norm), close=am('Close', mask_norm), 
-                    increasing_line_color='#2ea043', increasing_fillcolor='#2ea043', increasing_line_width=1,
-                    decreasing_line_color='#da3633', decreasing_fillcolor='#da3633', decreasing_line_width=1,
-                    showlegend=False, hoverinfo='skip'
-                ), **rc)
-                
-                # 2. High Volume Bullish Candles (బ్రైట్ గ్రీన్)
-                if mask_hv_bull.any():
-                    fig_obj.add_trace(go.Candlestick(
-                        x=df_chart.index, open=am('Open', mask_hv_bull), high=am('High', mask_hv_bull), low=am('Low', mask_hv_bull), close=am('Close', mask_hv_bull), 
-                        increasing_line_color='#00FF00', increasing_fillcolor='#00FF00', increasing_line_width=2,
-                        decreasing_line_color='#00FF00', decreasing_fillcolor='#00FF00', decreasing_line_width=2,
-                        showlegend=False, hoverinfo='skip'
-                    ), **rc)
-                    
-                # 3. High Volume Bearish Candles (బ్రైట్ రెడ్)
-                if mask_hv_bear.any():
-                    fig_obj.add_trace(go.Candlestick(
-                        x=df_chart.index, open=am('Open', mask_hv_bear), high=am('High', mask_hv_bear), low=am('Low', mask_hv_bear), close=am('Close', mask_hv_bear), 
-                        increasing_line_color='#FF0000', increasing_fillcolor='#FF0000', increasing_line_width=2,
-                        decreasing_line_color='#FF0000', decreasing_fillcolor='#FF0000', decreasing_line_width=2,
-                        showlegend=False, hoverinfo='skip'
-                    ), **rc)
-
-            if show_vol:
-                fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.02, row_heights=[0.75, 0.25])
-                apply_standard_candles(fig, is_subplot=True)
-                fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['High'], mode='lines', line=dict(color='rgba(0,0,0,0)'), showlegend=False, hoverinfo='text' if show_crosshair else 'skip', text=hover_data, hovertemplate="%{text}<extra></extra>" if show_crosshair else None, name=""), row=1, col=1)
-                
-                if timeframe == "Daily Chart":
-                    if 'SMA_50' in df_chart.columns: fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['SMA_50'], mode='lines', line=dict(color='#FFD700', width=1.5), name='50 SMA', showlegend=False, hoverinfo='skip'), row=1, col=1)
-                    if 'SMA_150' in df_chart.columns: fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['SMA_150'], mode='lines', line=dict(color='#00BFFF', width=1.5, dash='dash'), name='150 SMA', showlegend=False, hoverinfo='skip'), row=1, col=1)
-                    if 'SMA_200' in df_chart.columns: fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['SMA_200'], mode='lines', line=dict(color='#FF4500', width=2), name='200 SMA', showlegend=False, hoverinfo='skip'), row=1, col=1)
-                elif timeframe == "Weekly Chart":
-                    if 'SMA_10' in df_chart.columns: fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['SMA_10'], mode='lines', line=dict(color='#FFD700', width=1.5), name='10 Wk SMA', showlegend=False, hoverinfo='skip'), row=1, col=1)
-                    if 'SMA_40' in df_chart.columns: fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['SMA_40'], mode='lines', line=dict(color='#FF4500', width=2), name='40 Wk SMA', showlegend=False, hoverinfo='skip'), row=1, col=1)
-                else:
-                    offset = -4 if len(df_chart) >= 4 else -1
-                    tag_idx = df_chart.index[offset]
-                    last_close = float(df_chart['Close'].iloc[-1])
-                    has_vwap = 'VWAP' in df_chart.columns
-                    has_ema = 'EMA_10' in df_chart.columns
-                    
-                    last_vwap = float(df_chart['VWAP'].iloc[-1]) if has_vwap else 0
-                    last_ema = float(df_chart['EMA_10'].iloc[-1]) if has_ema else 0
-                    tag_y_vwap = float(df_chart['VWAP'].iloc[offset]) if has_vwap else 0
-                    tag_y_ema = float(df_chart['EMA_10'].iloc[offset]) if has_ema else 0
-
-                    v_anchor = "bottom" if last_close <= last_vwap else "top"
-                    e_anchor = "bottom" if last_close <= last_ema else "top"
-                    v_shift = 6 if v_anchor == "bottom" else -6
-                    e_shift = 6 if e_anchor == "bottom" else -6
-
-                    if has_vwap and has_ema and abs(tag_y_vwap - tag_y_ema) / (tag_y_vwap + 0.001) < 0.005:
-                        if tag_y_vwap >= tag_y_ema:
-                            v_anchor, v_shift = "bottom", 6
-                            e_anchor, e_shift = "top", -6
-                        else:
-                            v_anchor, v_shift = "top", -6
-                            e_anchor, e_shift = "bottom", 6
-
-                    if has_vwap: 
-                        fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['VWAP'], mode='lines', line=dict(color='#FFD700', width=1.5, dash='dot'), showlegend=False, hoverinfo='skip'), row=1, col=1)
-                        fig.add_annotation(x=tag_idx, y=tag_y_vwap, text=f"V:{last_vwap:.1f}", showarrow=False, xanchor="right", yanchor=v_anchor, xshift=-5, yshift=v_shift, font=dict(color="#161b22", size=10, family="monospace", weight="bold"), bgcolor="#FFD700", borderpad=2, row=1, col=1)
-                        
-                    if has_ema: 
-                        fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['EMA_10'], mode='lines', line=dict(color='#00BFFF', width=1.5, dash='dash'), showlegend=False, hoverinfo='skip'), row=1, col=1)
-                        fig.add_annotation(x=tag_idx, y=tag_y_ema, text=f"E:{last_ema:.1f}", showarrow=False, xanchor="right", yanchor=e_anchor, xshift=-5, yshift=e_shift, font=dict(color="#161b22", size=10, family="monospace", weight="bold"), bgcolor="#00BFFF", borderpad=2, row=1, col=1)
-            
-                # 🔥 Advanced Volume Bar Colors (VWAP & 10 EMA Based)
-                vol_colors = []
-                if 'Volume' in df_chart.columns:
-                    vol_sma = df_chart.get('Vol_SMA_89', df_chart['Volume'].rolling(window=20, min_periods=1).mean())
-                    for i in range(len(df_chart)):
-                        close_p = df_chart['Close'].iloc[i]
-                        open_p = df_chart['Open'].iloc[i]
-                        bull = close_p >= open_p
-                        hv = df_chart['Volume'].iloc[i] > (vol_sma.iloc[i] * 1.618)
-                        
-                        # Fetch VWAP & EMA values safely
-                        vwap_val = df_chart['VWAP'].iloc[i] if 'VWAP' in df_chart.columns else 0
-                        ema10_val = df_chart['EMA_10'].iloc[i] if 'EMA_10' in df_chart.columns else 0
-                        
-                        # VWAP & 10 EMA పైన ఉంటే బుల్లిష్ ట్రెండ్, కింద ఉంటే బేరిష్ ట్రెండ్
-                        is_strong_up = (close_p > vwap_val) and (close_p > ema10_val)
-                        is_strong_down = (close_p < vwap_val) and (close_p < ema10_val)
-
-                        if hv:
-                            # హై వాల్యూమ్ వచ్చి, ప్రైస్ వ్వాప్ & ఈఎంఏ పైన ఉంటే Dark Green, కింద ఉంటే Dark Red
-                            if is_strong_up and bull: vol_colors.append('#00FF00') # Bright Dark Green
-                            elif is_strong_down and not bull: vol_colors.append('#8B0000') # Deep Dark Red
-                            else: vol_colors.append('#FFD700' if bull else '#FF8C00') # Yellow/Orange for undefined trend high vol
-                        else:
-                            # నార్మల్ వాల్యూమ్ కి మ్యూటెడ్ కలర్స్
-                            vol_colors.append('rgba(46, 160, 67, 0.4)' if bull else 'rgba(218, 54, 51, 0.4)')
-                else:
-                    vol_colors = ['rgba(46, 160, 67, 0.4)' if close >= open_p else 'rgba(218, 54, 51, 0.4)' for close, open_p in zip(df_chart['Close'], df_chart['Open'])]
-                
-                fig.add_trace(go.Bar(x=df_chart.index, y=df_chart['Volume'], marker_color=vol_colors, showlegend=False, hoverinfo='skip'), row=2, col=1)
-                
-                fig.update_layout(margin=dict(l=0, r=45 if show_crosshair else 5, t=0, b=0), height=275, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', xaxis_rangeslider_visible=False)
-                fig.add_annotation(text=title_html, xref="paper", yref="paper", x=0, xanchor="left", xshift=35, y=0.98, yanchor="top", showarrow=False, font=dict(size=13, color="#ffffff"), bgcolor="rgba(0,0,0,0)", borderwidth=0)
-
-                if fetch_sym in st.session_state.custom_alerts:
-                    alert_data = st.session_state.custom_alerts[fetch_sym]
-                    if alert_data['enabled']:
-                        line_c = "#3fb950" if "Above" in alert_data['type'] else "#f85149"
-                        fig.add_hline(y=alert_data['price'], line_dash="dash", line_color=line_c, line_width=1.5, opacity=0.8, row=1, col=1)
-
-                if show_crosshair:
-                    fig.update_layout(hovermode='x', dragmode=False, hoverlabel=dict(bgcolor="#161b22", font_size=12, font_color="#ffffff", bordercolor="#30363d"))
-                    fig.update_xaxes(showspikes=True, spikemode='across', spikethickness=1, spikedash='dot', spikecolor="rgba(255, 255, 255, 0.4)", showgrid=False, zeroline=False, showticklabels=False, showline=False, fixedrange=True)
-                    fig.update_yaxes(showspikes=True, spikemode='across', spikethickness=1, spikedash='dot', spikecolor="rgba(255, 255, 255, 0.4)", showgrid=False, zeroline=False, showticklabels=True, side='right', tickfont=dict(color="#ffffff", size=10), showline=False, fixedrange=True, range=[min_val - y_padding, max_val + (y_padding * 2.5)], row=1, col=1)
-                    fig.update_yaxes(showspikes=False, showgrid=False, zeroline=False, showticklabels=False, showline=False, fixedrange=True, row=2, col=1)
-                else:
-                    fig.update_layout(hovermode=False, dragmode=False)
-                    fig.update_xaxes(showgrid=False, zeroline=False, showticklabels=False, showline=False, fixedrange=True)
-                    fig.update_yaxes(showgrid=False, zeroline=False, showticklabels=False, showline=False, fixedrange=True, range=[min_val - y_padding, max_val + (y_padding * 2.5)], row=1, col=1)
-                    fig.update_yaxes(showgrid=False, zeroline=False, showticklabels=False, showline=False, fixedrange=True, row=2, col=1)
-
-            else:
-                fig = go.Figure()
-                apply_standard_candles(fig, is_subplot=False)
-                fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['High'], mode='lines', line=dict(color='rgba(0,0,0,0)'), showlegend=False, hoverinfo='text' if show_crosshair else 'skip', text=hover_data, hovertemplate="%{text}<extra></extra>" if show_crosshair else None, name=""))
-                
-                if timeframe == "Daily Chart":
-                    if 'SMA_50' in df_chart.columns: fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['SMA_50'], mode='lines', line=dict(color='#FFD700', width=1.5), name='50 SMA', showlegend=False, hoverinfo='skip'))
-                    if 'SMA_150' in df_chart.columns: fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['SMA_150'], mode='lines', line=dict(color='#00BFFF', width=1.5, dash='dash'), name='150 SMA', showlegend=False, hoverinfo='skip'))
-                    if 'SMA_200' in df_chart.columns: fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['SMA_200'], mode='lines', line=dict(color='#FF4500', width=2), name='200 SMA', showlegend=False, hoverinfo='skip'))
-                elif timeframe == "Weekly Chart":
-                    if 'SMA_10' in df_chart.columns: fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['SMA_10'], mode='lines', line=dict(color='#FFD700', width=1.5), name='10 Wk SMA', showlegend=False, hoverinfo='skip'))
-                    if 'SMA_40' in df_chart.columns: fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['SMA_40'], mode='lines', line=dict(color='#FF4500', width=2), name='40 Wk SMA', showlegend=False, hoverinfo='skip'))
-                else:
-                    offset = -4 if len(df_chart) >= 4 else -1
-                    tag_idx = df_chart.index[offset]
-                    last_close = float(df_chart['Close'].iloc[-1])
-                    has_vwap = 'VWAP' in df_chart.columns
-                    has_ema = 'EMA_10' in df_chart.columns
-                    
-                    last_vwap = float(df_chart['VWAP'].iloc[-1]) if has_vwap else 0
-                    last_ema = float(df_chart['EMA_10'].iloc[-1]) if has_ema else 0
-                    tag_y_vwap = float(df_chart['VWAP'].iloc[offset]) if has_vwap else 0
-                    tag_y_ema = float(df_chart['EMA_10'].iloc[offset]) if has_ema else 0
-
-                    v_anchor = "bottom" if last_close <= last_vwap else "top"
-                    e_anchor = "bottom" if last_close <= last_ema else "top"
-                    v_shift = 6 if v_anchor == "bottom" else -6
-                    e_shift = 6 if e_anchor == "bottom" else -6
-
-                    if has_vwap and has_ema and abs(tag_y_vwap - tag_y_ema) / (tag_y_vwap + 0.001) < 0.005:
-                        if tag_y_vwap >= tag_y_ema:
-                            v_anchor, v_shift = "bottom", 6
-                            e_anchor, e_shift = "top", -6
-                        else:
-                            v_anchor, v_shift = "top", -6
-                            e_anchor, e_shift = "bottom", 6
-
-                    if has_vwap: 
-                        fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['VWAP'], mode='lines', line=dict(color='#FFD700', width=1.5, dash='dot'), showlegend=False, hoverinfo='skip'))
-                        fig.add_annotation(x=tag_idx, y=tag_y_vwap, text=f"V:{last_vwap:.1f}", showarrow=False, xanchor="right", yanchor=v_anchor, xshift=-5, yshift=v_shift, font=dict(color="#161b22", size=10, family="monospace", weight="bold"), bgcolor="#FFD700", borderpad=2)
-                        
-                    if has_ema: 
-                        fig.add_trace(go.Scatter(x=df_chart.index, y=df_chart['EMA_10'], mode='lines', line=dict(color='#00BFFF', width=1.5, dash='dash'), showlegend=False, hoverinfo='skip'))
-                        fig.add_annotation(x=tag_idx, y=tag_y_ema, text=f"E:{last_ema:.1f}", showarrow=False, xanchor="right", yanchor=e_anchor, xshift=-5, yshift=e_shift, font=dict(color="#161b22", size=10, family="monospace", weight="bold"), bgcolor="#00BFFF", borderpad=2)
-            
-                fig.update_layout(margin=dict(l=0, r=45 if show_crosshair else 5, t=0, b=0), height=235, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', showlegend=False, xaxis_rangeslider_visible=False)
-                fig.add_annotation(text=title_html, xref="paper", yref="paper", x=0, xanchor="left", xshift=35, y=0.98, yanchor="top", showarrow=False, font=dict(size=13, color="#ffffff"), bgcolor="rgba(0,0,0,0)", borderwidth=0)
-
-                if fetch_sym in st.session_state.custom_alerts:
-                    alert_data = st.session_state.custom_alerts[fetch_sym]
-                    if alert_data['enabled']:
-                        line_c = "#3fb950" if "Above" in alert_data['type'] else "#f85149"
-                        fig.add_hline(y=alert_data['price'], line_dash="dash", line_color=line_c, line_width=1.5, opacity=0.8)
-
-                if show_crosshair:
-                    fig.update_layout(hovermode='x', dragmode=False, hoverlabel=dict(bgcolor="#161b22", font_size=12, font_color="#ffffff", bordercolor="#30363d"))
-                    fig.update_yaxes(showspikes=True, spikemode='across', spikethickness=0.2, spikedash='solid', spikecolor="rgba(255,255,255,0.4)", showgrid=False, zeroline=False, showticklabels=True, side='right', tickfont=dict(color="#ffffff", size=10), showline=False, fixedrange=True, range=[min_val - y_padding, max_val + (y_padding * 2.5)])
-                    fig.update_xaxes(showspikes=False, showgrid=False, zeroline=False, showticklabels=False, showline=False, fixedrange=True)
-                else:
-                    fig.update_layout(hovermode=False, dragmode=False)
-                    fig.update_yaxes(showgrid=False, zeroline=False, showticklabels=False, showline=False, fixedrange=True, range=[min_val - y_padding, max_val + (y_padding * 2.5)])
-                    fig.update_xaxes(showgrid=False, zeroline=False, showticklabels=False, showline=False, fixedrange=True)
-
+            alert_data = st.session_state.custom_alerts.get(fetch_sym)
+            if not (alert_data and alert_data['enabled']): alert_data = None
+            # 🔥 డేటా & ఆప్షన్స్ మారకపోతే పాత ఫిగర్ నే, లాస్ట్ బార్ మాత్రమే మారితే ప్యాచ్ (5s రీరన్ లో రీబిల్డ్ ఉండదు)
+            # 🔥 కాంపాక్ట్ మోడ్ లో కార్డ్ వెడల్పు కి సరిపడా బార్స్ మాత్రమే (1y daily / 2y weekly కి)
+            if compact: df_chart = bucket_ohlc(df_chart, CHART_MAX_BARS)
+            fig = cached_chart_figure(df_chart, fetch_sym, title_html, timeframe, show_crosshair, show_vol, alert_data, compact)
             st.plotly_chart(fig, width="stretch", key=f"plot_{fetch_sym}_{key_suffix}_{timeframe}_{show_vol}_{show_crosshair}")
     except Exception as e: 
         st.markdown(f"<div style='height:150px; display:flex; align-items:center; justify-content:center; color:#888;'>Chart error: {e}</div>", unsafe_allow_html=True)
 
-def render_chart_grid(df_grid, show_pin_option, key_prefix, timeframe="Intraday (5m)", chart_dict=None, show_crosshair=False, show_vol=False, is_sector=False):
+def render_chart_grid(df_grid, show_pin_option, key_prefix, timeframe="Intraday (5m)", chart_dict=None, show_crosshair=False, show_vol=False, is_sector=False, compact=False, page_size=None):
     if df_grid.empty: return
     if chart_dict is None: chart_dict = {}
+    # 🔥 మొదట page_size చార్ట్స్ మాత్రమే బిల్డ్ చేస్తాం, మిగతావి "Load more" నొక్కితేనే (0 = అన్నీ)
+    if page_size is None: page_size = CHART_PAGE_SIZE
+    limit = st.session_state.grid_limits.get(key_prefix, page_size) if page_size else len(df_grid)
     with st.container():
         st.markdown("<div class='fluid-board'></div>", unsafe_allow_html=True)
-        for _, row in df_grid.iterrows():
+        for _, row in df_grid.head(limit).iterrows():
             with st.container():
-                render_chart(row, chart_dict.get(row['Fetch_T'], pd.DataFrame()), show_pin=show_pin_option, key_suffix=key_prefix, timeframe=timeframe, show_crosshair=show_crosshair, show_vol=show_vol)
+                render_chart(row, chart_dict.get(row['Fetch_T'], pd.DataFrame()), show_pin=show_pin_option, key_suffix=key_prefix, timeframe=timeframe, show_crosshair=show_crosshair, show_vol=show_vol, compact=compact)
                 
                 if is_sector:
                     btn_lbl = f"🔽 View Stocks" if st.session_state.active_sec != row['T'] else f"🔼 Hide Stocks"
@@ -1453,6 +1308,13 @@ def render_chart_grid(df_grid, show_pin_option, key_prefix, timeframe="Intraday
                             st.session_state.active_sec = row['T']
                         st.rerun()
 
+    hidden = len(df_grid) - limit
+    if hidden > 0:
+        if st.button(f"⬇️ Load more charts ({hidden} more)", key=f"more_{key_prefix}", width="stretch"):
+            st.session_state.grid_limits[key_prefix] = limit + page_size
+            st.rerun()
+
+@render_memo("closed_trades")
 def render_closed_trades_table(df_closed):
     if df_closed.empty: return "<div style='padding:20px; text-align:center; color:#8b949e; border: 1px dashed #30363d; border-radius:8px;'>No closed trades yet. Sell a stock to book P&L!</div>"
     
@@ -1497,19 +1359,19 @@ def render_closed_trades_table(df_closed):
 st.markdown("<hr style='margin:10px 0; border-color:#30363d;'>", unsafe_allow_html=True)
 # 🔥 మార్కెట్ సెగ్మెంట్ రేడియో బటన్ పీకేశాం
 
-if True: 
-    df = fetch_all_data() # ఆర్గ్యుమెంట్స్ లేకుండా కాల్ చేస్తున్నాం
+market_refresher = get_market_refresher()
+market_snapshot = market_refresher.latest()
+if market_snapshot.get("radar") is None: market_snapshot = market_refresher.run_now("radar") # కోల్డ్ స్టార్ట్ మాత్రమే
+df = expand_radar(market_snapshot.frame("radar")) # zero-copy view + Flags -> bool కాలమ్స్ (స్నాప్‌షాట్ మారదు)
+
+# 🔥 కొత్తగా యాడ్ చేసిన పోర్ట్‌ఫోలియో స్టాక్ రేడార్ లో లేకపోతే బ్యాక్‌గ్రౌండ్ రీఫ్రెష్ వెంటనే
+if not df.empty and df.attrs.get('port_extra') != portfolio_extra_symbols():
+    market_refresher.trigger("radar")
 
-if not df.empty and 'LIVE_PRICES' in st.session_state:
-    for i, row in df.iterrows():
-        clean_sym = str(row['Fetch_T']).replace(".NS", "")
-        if clean_sym in st.session_state.LIVE_PRICES:
-            new_ltp = st.session_state.LIVE_PRICES[clean_sym]
-            df.at[i, 'P'] = new_ltp
-            open_p = df.at[i, 'O']
-            prev_c = df.at[i, 'Prev_C']
-            if open_p > 0: df.at[i, 'Day_C'] = ((new_ltp - open_p) / open_p) * 100
-            if prev_c > 0: df.at[i, 'C'] = ((new_ltp - prev_c) / prev_c) * 100
+tick_seq = pd.Series(dtype='int64') # Fetch_T -> లాస్ట్ టిక్ seq (rows_version కోసం)
+if not df.empty:
+    df, tick_seq = overlay_live_ticks(df)
+radar_idx = RadarIndex(df) # సింబల్ -> రో O(1) లుక్అప్ (లూప్స్ లో df[df['Fetch_T'] == sym] స్కాన్ బదులు)
 
 all_names = []
 if not df.empty:
@@ -1540,6 +1402,7 @@ sort_mode = "Custom Sort"
 chart_timeframe = "Intraday (5m)"
 show_crosshair = False
 show_vol = False
+compact_charts = True
 search_stock = "-- None --"
 
 with st.expander("⚙️ Filters, Sorting, Search & Alerts", expanded=False):
@@ -1570,11 +1433,12 @@ with st.expander("⚙️ Filters, Sorting, Search & Alerts", expanded=False):
 
     if view_mode == "Chart 📈" or watchlist_mode in ["Swing Trading 📈", "My Portfolio 💼", "Commodity 🛢️"]:
         st.markdown("<hr style='margin:10px 0; border-color:#30363d;'>", unsafe_allow_html=True)
-        cc1, cc2, cc3 = st.columns(3)
+        cc1, cc2, cc3, cc4 = st.columns(4)
         with cc1:
             chart_timeframe = st.radio("Timeframe", ["Intraday (5m)", "Daily Chart", "Weekly Chart"], index=1 if watchlist_mode == "Swing Trading 📈" else 0, horizontal=True)
         with cc2: show_crosshair = st.toggle("⌖ Show Crosshair", value=False)
         with cc3: show_vol = st.toggle("📊 Show Vol Bars", value=False)
+        with cc4: compact_charts = st.toggle("📦 Compact Charts", value=True, help="కార్డ్ వెడల్పు కి సరిపడా బార్స్ మాత్రమే పంపిస్తుంది (మొబైల్ లో ఫాస్ట్)")
 
     if not df.empty and (view_mode == "Chart 📈" or watchlist_mode == "Commodity 🛢️"):
         st.markdown("<hr style='margin:10px 0; border-color:#30363d;'>", unsafe_allow_html=True)
@@ -1587,7 +1451,7 @@ with st.expander("⚙️ Filters, Sorting, Search & Alerts", expanded=False):
         with ac5:
             if st.button("➕ Add", width="stretch"):
                 if alert_sym_disp != "-- None --" and alert_price > 0:
-                    f_sym = df[df['T'] == alert_sym_disp]['Fetch_T'].iloc[0]
+                    f_sym = radar_idx.value(alert_sym_disp, 'Fetch_T', key='T')
                     st.session_state.custom_alerts[f_sym] = {'price': alert_price, 'type': alert_cond, 'enabled': alert_enable, 'name': alert_sym_disp}
                     st.rerun()
 
@@ -1608,37 +1472,37 @@ with st.expander("⚙️ Filters, Sorting, Search & Alerts", expanded=False):
 # =========================================================
 
 if not df.empty:
-    df_indices = df[df['Is_Index']].copy()
+    df_indices = df[df['Is_Index']]
     df_indices['Order'] = df_indices['T'].map({"NIFTY": 1, "BANKNIFTY": 2, "INDIA VIX": 3, "SPX": 4, "DAX": 5, "USD/INR": 6})
     df_indices = df_indices.sort_values('Order')
     
-    df_sectors = df[df['Is_Sector']].copy()
+    df_sectors = df[df['Is_Sector']]
     sec_sort_key = "W_C" if chart_timeframe == "Weekly Chart" else "Day_C"
     df_sectors = df_sectors.sort_values(by=sec_sort_key, ascending=False)
     
     # 1. Base Data (All Fetched Stocks)
-    df_all_stocks = df[(~df['Is_Index']) & (~df['Is_Sector']) & (~df['Is_Commodity'])].copy()
-    df_commodities = df[df['Is_Commodity']].copy()
+    df_all_stocks = df[(~df['Is_Index']) & (~df['Is_Sector']) & (~df['Is_Commodity'])]
+    df_commodities = df[df['Is_Commodity']]
     
     df_port_saved = load_portfolio().copy()
 
     # 2. 🔥 STRICT SEGMENT FILTERING (SMART IRON WALL) 🔥
     if watchlist_mode == "Swing Trading 📈":
-        strict_allowed = set(NIFTY_50 + FNO_STOCKS + MIDCAP_150 + SMALLCAP_250)
+        strict_allowed = U_STOCKS
     elif watchlist_mode == "🤖 AI Predictions (F&O)":
-        strict_allowed = set(NIFTY_50 + FNO_STOCKS)
+        strict_allowed = U_NIFTY50 | U_FNO
     elif watchlist_mode == "🤖 AI Predictions (Mid Cap)":
-        strict_allowed = set(MIDCAP_150)
+        strict_allowed = U_MIDCAP
     elif watchlist_mode == "🤖 AI Predictions (Small Cap)":
-        strict_allowed = set(SMALLCAP_250)
+        strict_allowed = U_SMALLCAP
     else:
-        strict_allowed = set(NIFTY_50 + FNO_STOCKS)
+        strict_allowed = U_NIFTY50 | U_FNO
         
     # ఇక్కడే సగం లోడ్ ఆగిపోతుంది!
-    df_stocks = df_all_stocks[df_all_stocks['T'].isin(strict_allowed)].copy()
+    df_stocks = df_all_stocks[UNIVERSE.contains(df_all_stocks, strict_allowed)]
     
     # 3. Sector Calcs (దీనికి ఎప్పుడూ df_all_stocks వాడాలి)
-    df_nifty = df_all_stocks[df_all_stocks['T'].isin(NIFTY_50)].copy()
+    df_nifty = df_all_stocks[UNIVERSE.contains(df_all_stocks, U_NIFTY50)]
     sector_perf = df_nifty.groupby('Sector')['C'].mean().sort_values(ascending=False)
     valid_sectors = [s for s in sector_perf.index if s != "OTHER"]
     
@@ -1648,7 +1512,7 @@ if not df.empty:
     df_buy_sector = df_nifty[df_nifty['Sector'] == top_buy_sector].sort_values(by=['S', 'C'], ascending=[False, False])
     df_sell_sector = df_nifty[df_nifty['Sector'] == top_sell_sector].sort_values(by=['S', 'C'], ascending=[False, True])
     df_independent = df_nifty[(~df_nifty['Sector'].isin([top_buy_sector, top_sell_sector])) & (df_nifty['S'] >= 5)].sort_values(by='S', ascending=False).head(8)
-    df_broader = df_all_stocks[(df_all_stocks['T'].isin(FNO_STOCKS)) & (~df_all_stocks['T'].isin(NIFTY_50)) & (df_all_stocks['S'] >= 5)].sort_values(by='S', ascending=False).head(8)
+    df_broader = df_all_stocks[UNIVERSE.contains(df_all_stocks, U_FNO) & ~UNIVERSE.contains(df_all_stocks, U_NIFTY50) & (df_all_stocks['S'] >= 5)].sort_values(by='S', ascending=False).head(8)
 
     if watchlist_mode == "Terminal Tables 🗃️":
         terminal_tickers = pd.concat([df_buy_sector, df_sell_sector, df_independent, df_broader])['Fetch_T'].unique().tolist()
@@ -1658,18 +1522,18 @@ if not df.empty:
         df_filtered = df_all_stocks[df_all_stocks['Fetch_T'].isin(port_tickers)]
         
     elif watchlist_mode == "Commodity 🛢️":
-        df_filtered = df_commodities.copy()
+        df_filtered = df_commodities.copy(deep=False)
     elif watchlist_mode == "Fundamentals 🏢":
         if fund_filter == "Swing Trading Candidates 📈": df_filtered = df_stocks[(df_stocks['Is_Swing'] == True) | (df_stocks['Is_W_Pullback'] == True)]
-        elif fund_filter == "Nifty 50 Stocks": df_filtered = df_all_stocks[df_all_stocks['T'].isin(NIFTY_50)]
+        elif fund_filter == "Nifty 50 Stocks": df_filtered = df_all_stocks[UNIVERSE.contains(df_all_stocks, U_NIFTY50)]
         elif fund_filter == "My Portfolio 💼":
             port_tickers = [f"{str(sym).upper().strip()}.NS" for sym in df_port_saved['Symbol'].tolist() if str(sym).strip() != ""]
             df_filtered = df_all_stocks[df_all_stocks['Fetch_T'].isin(port_tickers)]
         else: df_filtered = df_stocks[df_stocks['S'] >= 6]
     elif watchlist_mode == "Nifty 50 Heatmap":
-        df_filtered = df_all_stocks[df_all_stocks['T'].isin(NIFTY_50)]
+        df_filtered = df_all_stocks[UNIVERSE.contains(df_all_stocks, U_NIFTY50)]
     elif "AI Predictions" in watchlist_mode:
-        df_filtered = df_stocks.copy()
+        df_filtered = df_stocks.copy(deep=False)
         ai_predictions, ai_probs = [], []
         for _, row in df_filtered.iterrows():
             up_prob, dn_prob = 0, 0
@@ -1690,9 +1554,9 @@ if not df.empty:
         df_filtered['AI_Prob'] = ai_probs
         df_filtered = df_filtered[(df_filtered['Strategy_Icon'] != "Neutral") & (df_filtered['S'] >= 11)]
     elif watchlist_mode == "Day Trading Stocks 🚀":
-        df_filtered = df_stocks[df_stocks['C'].abs() >= 1.0].copy()
+        df_filtered = df_stocks[df_stocks['C'].abs() >= 1.0]
     elif watchlist_mode == "Swing Trading 📈":
-        df_filtered = df_stocks.copy()
+        df_filtered = df_stocks.copy(deep=False)
         dfs_to_concat = []
         
         # ఇవి అన్నింటికీ కామన్ గా ఉండే కండిషన్స్ (IPO స్టాక్స్ కూడా వచ్చేలా)
@@ -1708,30 +1572,30 @@ if not df.empty:
 
         # 1. కేవలం FNO & NIFTY స్టాక్స్
         if "📈 Minervini Trend Template (VCP)" in move_type_filter:
-            cond_fno = df_filtered['T'].isin(NIFTY_50 + FNO_STOCKS)
-            df_min = df_filtered[cond_fno & vcp_base_cond].copy()
+            cond_fno = UNIVERSE.contains(df_filtered, U_NIFTY50 | U_FNO)
+            df_min = df_filtered[cond_fno & vcp_base_cond]
             df_min['Strategy_Icon'] = "📈 M-VCP"
             dfs_to_concat.append(df_min)
 
         # 2. కేవలం MIDCAP 150 స్టాక్స్
         if "🔥 Minervini MidCap 150" in move_type_filter:
-            cond_mid = df_filtered['T'].isin(MIDCAP_150)
-            df_mid = df_filtered[cond_mid & vcp_base_cond].copy()
+            cond_mid = UNIVERSE.contains(df_filtered, U_MIDCAP)
+            df_mid = df_filtered[cond_mid & vcp_base_cond]
             df_mid['Strategy_Icon'] = "🔥 Mid VCP"
             dfs_to_concat.append(df_mid)
 
         # 3. కేవలం SMALLCAP 250 స్టాక్స్
         if "🚀 Minervini SmallCap 250" in move_type_filter:
-            cond_small = df_filtered['T'].isin(SMALLCAP_250)
-            df_small = df_filtered[cond_small & vcp_base_cond].copy()
+            cond_small = UNIVERSE.contains(df_filtered, U_SMALLCAP)
+            df_small = df_filtered[cond_small & vcp_base_cond]
             df_small['Strategy_Icon'] = "🚀 Small VCP"
             dfs_to_concat.append(df_small)
             
         # 4. Strict VCP (FNO వాటికి మాత్రమే)
         if "📉 Strict VCP (Price & Vol Contraction)" in move_type_filter:
-            cond_fno = df_filtered['T'].isin(NIFTY_50 + FNO_STOCKS)
+            cond_fno = UNIVERSE.contains(df_filtered, U_NIFTY50 | U_FNO)
             strict_vcp_cond = (df_filtered['VCP_Contract'] == True) & (df_filtered['VCP_Vol_Dry'] == True)
-            df_vcp = df_filtered[cond_fno & vcp_base_cond & strict_vcp_cond].copy()
+            df_vcp = df_filtered[cond_fno & vcp_base_cond & strict_vcp_cond]
             df_vcp['Strategy_Icon'] = "📉 VCP"
             dfs_to_concat.append(df_vcp)
 
@@ -1755,11 +1619,16 @@ if not df.empty:
         all_display_tickers = list(set(all_display_tickers + sec_tickers))
     
     if search_stock != "-- None --":
-        search_fetch_t = df[df['T'] == search_stock]['Fetch_T'].iloc[0]
+        search_fetch_t = radar_idx.value(search_stock, 'Fetch_T', key='T')
         if search_fetch_t not in all_display_tickers: all_display_tickers.append(search_fetch_t)
             
-    if True: # 5m fetch
-        five_min_data = fetch_cached_5m_data(all_display_tickers)
+    # 5m డేటా బ్యాక్‌గ్రౌండ్ స్నాప్‌షాట్ నుండి; లేని సింబల్స్ మాత్రమే ఇక్కడే ఫెచ్
+    intraday_tkrs = list(dict.fromkeys(all_display_tickers + ["^NSEI"]))
+    market_refresher.want("intraday", intraday_tkrs)
+    intraday_charts = market_refresher.latest().charts("intraday") # రీడ్-ఓన్లీ, చదివిన df మాత్రమే view
+    missing_5m = [t for t in intraday_tkrs if t not in intraday_charts]
+    if missing_5m:
+        intraday_charts = ChainMap(process_5m_panel(fetch_cached_5m_data(missing_5m), missing_5m), intraday_charts)
 
     processed_charts = {}
     weekly_trends = {}
@@ -1770,26 +1639,19 @@ if not df.empty:
 
     nifty_dist_5m = 0.1
     
-    # 🔥 MultiIndex ఎర్రర్ రాకుండా సేఫ్టీ చెక్
-    fetched_5m_symbols = five_min_data.columns.levels[0] if isinstance(five_min_data.columns, pd.MultiIndex) else five_min_data.columns
-
-    if "^NSEI" in fetched_5m_symbols:
-        n_raw = five_min_data["^NSEI"] if isinstance(five_min_data.columns, pd.MultiIndex) else five_min_data
-        n_day = process_5m_data(n_raw)
-        if not n_day.empty:
-            n_ltp = n_day['Close'].iloc[-1]
-            n_vwap = n_day['VWAP'].iloc[-1]
-            if n_vwap > 0: nifty_dist_5m = abs(n_ltp - n_vwap) / n_vwap * 100
+    n_day = intraday_charts.get("^NSEI", pd.DataFrame())
+    if not n_day.empty:
+        n_ltp = n_day['Close'].iloc[-1]
+        n_vwap = n_day['VWAP'].iloc[-1]
+        if n_vwap > 0: nifty_dist_5m = abs(n_ltp - n_vwap) / n_vwap * 100
 
+    filtered_syms = set(df_filtered['Fetch_T'].tolist())
     for sym in all_display_tickers:
-        try: df_raw = five_min_data[sym] if isinstance(five_min_data.columns, pd.MultiIndex) else five_min_data
-        except KeyError: df_raw = pd.DataFrame()
-            
-        df_day = process_5m_data(df_raw)
+        df_day = intraday_charts.get(sym, pd.DataFrame())
         processed_charts[sym] = df_day
         
         try:
-            sym_row = df[df['Fetch_T'] == sym].iloc[0]
+            sym_row = radar_idx.row(sym)
             w_ema10 = float(sym_row['W_EMA10'])
             w_ema50 = float(sym_row['W_EMA50'])
             last_p = float(sym_row['P'])
@@ -1797,80 +1659,31 @@ if not df.empty:
             elif last_p < w_ema10 and w_ema10 <= w_ema50: weekly_trends[sym] = 'Bearish'
             else: weekly_trends[sym] = 'Neutral'
         except: weekly_trends[sym] = 'Neutral'
-            
-        if sym in df_filtered['Fetch_T'].tolist() and not df_day.empty:
-            last_price = df_day['Close'].iloc[-1]
-            last_vwap = df_day['VWAP'].iloc[-1]
-            net_chg = df[df['Fetch_T'] == sym]['C'].iloc[0]
-            
-            alpha_tag = ""
-            if len(df_day) >= 50:
-                stock_dist_5m = abs(last_price - last_vwap) / last_vwap * 100 if last_vwap > 0 else 0
-                effective_nifty_5m = max(nifty_dist_5m, 0.25) 
-                if stock_dist_5m > (effective_nifty_5m * 3): alpha_tag = "🚀Alpha-Mover"
-                elif stock_dist_5m > (effective_nifty_5m * 2): alpha_tag = "💪Nifty-Beater"
-            
-            one_sided_tag = ""
-            trend_bonus = 0
-            if len(df_day) >= 12 and last_vwap > 0:
-                if net_chg > 0: trend_candles = (df_day['Low'] >= df_day['VWAP']).sum()
-                else: trend_candles = (df_day['High'] <= df_day['VWAP']).sum()
-                total_candles = len(df_day)
-                if (trend_candles / total_candles) >= 0.85:
-                    current_gap_pct = abs(last_price - last_vwap) / last_vwap * 100
-                    if current_gap_pct >= 1.50: one_sided_tag = "🌊Mega-1.5%"; trend_bonus = 7
-                    elif current_gap_pct >= 1.00: one_sided_tag = "🌊Super-1.0%"; trend_bonus = 5
-                    elif current_gap_pct >= 0.50: one_sided_tag = "🌊Trend-0.5%"; trend_bonus = 3
-                    else: one_sided_tag = "🌊Trend"; trend_bonus = 1
-            
-            trap_tag = ""
-            trap_bonus = 0
-            if watchlist_mode in ["Day Trading Stocks 🚀", "High Score Stocks 🔥"] and len(df_day) >= 6 and last_vwap > 0:
-                curr_open = float(df_day['Open'].iloc[-1])
-                day_open = df[df['Fetch_T'] == sym]['O'].iloc[0]
-                day_high = df[df['Fetch_T'] == sym]['H'].iloc[0]
-                day_low = df[df['Fetch_T'] == sym]['L'].iloc[0]
-                morning_spike = (day_high - day_open) / day_open * 100 if day_open > 0 else 0
-                morning_drop = (day_open - day_low) / day_open * 100 if day_open > 0 else 0
-
-                if morning_spike >= 1.0 and last_price < last_vwap:
-                    if (last_price < curr_open): trap_tag = f"🎯 Reversal Sell 🩸"; trap_bonus = 6 
-                elif morning_drop >= 1.0 and last_price > last_vwap:
-                    if (last_price > curr_open): trap_tag = f"🎯 Reversal Buy 🚀"; trap_bonus = 6
-
-            alpha_tags[sym] = f"{alpha_tag} {one_sided_tag} {trap_tag}".strip()
-            trend_scores[sym] = trend_bonus + trap_bonus
-            
-            retest_tag = ""
-            if watchlist_mode in ["Day Trading Stocks 🚀", "🤖 Today's AI Predictions"] and len(df_day) >= 4:
-                c1 = df_day.iloc[-1] 
-                c2 = df_day.iloc[-2] 
-                if c1['Close'] > c1['VWAP'] and c1['EMA_10'] > c1['VWAP']:
-                    if (c2['Low'] <= c2['EMA_10'] * 1.002) and (c2['Close'] >= c2['EMA_10']): 
-                        max_allowed_price = c1['EMA_10'] * 1.003
-                        if c1['Close'] > c1['Open'] and (c1['EMA_10'] <= c1['Close'] <= max_allowed_price): retest_tag = "BUY_RETEST"
-                elif c1['Close'] < c1['VWAP'] and c1['EMA_10'] < c1['VWAP']:
-                    if (c2['High'] >= c2['EMA_10'] * 0.998) and (c2['Close'] <= c2['EMA_10']):
-                        min_allowed_price = c1['EMA_10'] * 0.997
-                        if c1['Close'] < c1['Open'] and (min_allowed_price <= c1['Close'] <= c1['EMA_10']): retest_tag = "SELL_RETEST"
-            retest_tags[sym] = retest_tag
-
-            orb_tag = ""
-            if watchlist_mode in ["Day Trading Stocks 🚀", "High Score Stocks 🔥", "🤖 Today's AI Predictions"] and len(df_day) >= 3:
-                orb_high = df_day['High'].iloc[0:3].max()
-                orb_low = df_day['Low'].iloc[0:3].min()
-                if last_price > orb_high and last_price > last_vwap:
-                    orb_tag = "ORB_BUY"
-                elif last_price < orb_low and last_price < last_vwap:
-                    orb_tag = "ORB_SELL"
-            orb_tags[sym] = orb_tag
+
+    # 🔥 5m ట్యాగ్స్ (Alpha / One-Sided / Reversal / Retest / ORB) అన్ని సింబల్స్ కి ఒకే వెక్టరైజ్డ్ పాస్ లో
+    tag_syms = [s for s in all_display_tickers if s in filtered_syms and not processed_charts[s].empty]
+    if tag_syms:
+        tag_pos = [radar_idx.pos(s) for s in tag_syms]
+        with PERF.span("intraday_tags", symbols=len(tag_syms)):
+            tags_df = compute_intraday_tags(
+                processed_charts, tag_syms,
+                net_chg=radar_idx.col('C')[tag_pos], day_o=radar_idx.col('O')[tag_pos],
+                day_h=radar_idx.col('H')[tag_pos], day_l=radar_idx.col('L')[tag_pos],
+                nifty_dist_5m=nifty_dist_5m,
+                with_trap=watchlist_mode in ["Day Trading Stocks 🚀", "High Score Stocks 🔥"],
+                with_retest=watchlist_mode in ["Day Trading Stocks 🚀", "🤖 Today's AI Predictions"],
+                with_orb=watchlist_mode in ["Day Trading Stocks 🚀", "High Score Stocks 🔥", "🤖 Today's AI Predictions"])
+        alpha_tags = tags_df['AlphaTag'].to_dict()
+        trend_scores = tags_df['Trend_Score'].to_dict()
+        retest_tags = tags_df['Retest_Tag'].to_dict()
+        orb_tags = tags_df['ORB_Tag'].to_dict()
 
     alerts_triggered_html = ""
     for sym, a_data in st.session_state.custom_alerts.items():
         if a_data['enabled']:
-            live_r = df[df['Fetch_T'] == sym]
-            if not live_r.empty:
-                current_ltp = float(live_r['P'].iloc[0])
+            current_ltp = radar_idx.value(sym, 'P')
+            if current_ltp is not None:
+                current_ltp = float(current_ltp)
                 if "Above" in a_data['type'] and current_ltp >= a_data['price']:
                     st.toast(f"🔔 ALERT: {a_data['name']} is ABOVE ₹{a_data['price']}! (LTP: {current_ltp})", icon="🚀")
                     alerts_triggered_html += f"<div style='background-color:#1e5f29; color:white; padding:10px; border-radius:5px; margin-bottom:5px;'><b>🔔 ALERT:</b> {a_data['name']} crossed ABOVE ₹{a_data['price']}! (LTP: {current_ltp})</div>"
@@ -1881,8 +1694,7 @@ if not df.empty:
     if alerts_triggered_html: st.markdown(alerts_triggered_html, unsafe_allow_html=True)
 
     if not df_filtered.empty:
-        df_filtered = df_filtered.copy() # 👈 ఈ ఒక్క లైన్ యాడ్ చేయండి బాస్!
-        
+        df_filtered = df_filtered.copy(deep=False) # కొత్త ఆబ్జెక్ట్ మాత్రమే (డేటా కాపీ కాదు, CoW) - df_stocks కి కాలమ్స్ యాడ్ అవ్వకుండా
         df_filtered['AlphaTag'] = df_filtered['Fetch_T'].map(alpha_tags).fillna("")
         df_filtered['Trend_Score'] = df_filtered['Fetch_T'].map(trend_scores).fillna(0)
         df_filtered['Retest_Tag'] = df_filtered['Fetch_T'].map(retest_tags).fillna("") 
@@ -1906,9 +1718,6 @@ if not df.empty:
             ]
         
         if watchlist_mode == "🤖 Today's AI Predictions" and len(move_type_filter) > 0 and "All Moves" not in move_type_filter:
-            base_buy = (df_filtered['P'] > df_filtered['W_EMA10']) & (df_filtered['P'] > df_filtered['W_EMA50']) & (df_filtered['P'] > df_filtered['VWAP'])
-            base_sell = (df_filtered['P'] < df_filtered['W_EMA10']) & (df_filtered['P'] < df_filtered['W_EMA50']) & (df_filtered['P'] < df_filtered['VWAP'])
-            
             nifty_dist = 0.25 
             nifty_row = df_indices[df_indices['T'] == 'NIFTY']
             if not nifty_row.empty:
@@ -1916,45 +1725,8 @@ if not df.empty:
                 n_vwap = (n_h + n_l + n_p) / 3
                 nifty_dist = min(max(abs(n_p - n_vwap) / n_vwap * 100, 0.25), 0.75)
             
-            s_vwap = (df_filtered['H'] + df_filtered['L'] + df_filtered['P']) / 3
-            stock_vwap_dist = (df_filtered['P'] - s_vwap).abs() / s_vwap * 100
-            
-            open_drive_bull = pd.Series(False, index=df_filtered.index)
-            open_drive_bear = pd.Series(False, index=df_filtered.index)
-            
-            for idx, r in df_filtered.iterrows():
-                tkr = r['Fetch_T']
-                if tkr in processed_charts and len(processed_charts[tkr]) >= 2:
-                    df_hist = processed_charts[tkr]
-                    
-                    day_open = df_hist['Open'].iloc[0]
-                    low_after_1st = df_hist['Low'].iloc[1:].min()
-                    high_after_1st = df_hist['High'].iloc[1:].max()
-                    
-                    if (day_open - low_after_1st) <= (r['P'] * 0.003):
-                        open_drive_bull[idx] = True
-                    if (high_after_1st - day_open) <= (r['P'] * 0.003):
-                        open_drive_bear[idx] = True
-                else:
-                    if (r['O'] - r['L']) <= (r['P'] * 0.003):
-                        open_drive_bull[idx] = True
-                    if (r['H'] - r['O']) <= (r['P'] * 0.003):
-                        open_drive_bear[idx] = True
-
-            strategies_list = [
-                "🔥 Live Power Mover (Last 2 Candles)", "🚀 All-Day Volume Spikes (Max Fire)", "⚡ Intraday Pro Breakout (Top 5)", "🌊 One Sided Only", "🔄 VWAP Reversal", "🎯 Reversals Only", 
-                "🏹 Rubber Band Stretch", "🏄‍♂️ Momentum Ignition", "💥 Narrow CPR Breakout", "🧲 10-EMA Retest (Best Entry)", "📉 FIB Retracement (0.382)", "📈 Minervini Trend Template (VCP)", "🌅 15-Min ORB (Opening Range Breakout)"
-            ]
+            strategies_list = list(STRATEGIES) # రిజిస్టర్ అయిన ఆర్డర్ లోనే
             
-            fib_range = (df_filtered['H'] - df_filtered['L'])
-            fib_buy_0382 = df_filtered['H'] - (fib_range * 0.382)
-            fib_buy_0618 = df_filtered['H'] - (fib_range * 0.618)
-            fib_sell_0382 = df_filtered['L'] + (fib_range * 0.382)
-            fib_sell_0618 = df_filtered['L'] + (fib_range * 0.618)
-
-            fib_buy_mask = (df_filtered['P'] > df_filtered['VWAP']) & (df_filtered['P'] <= fib_buy_0382) & (df_filtered['P'] >= fib_buy_0618) & (fib_range > 0)
-            fib_sell_mask = (df_filtered['P'] < df_filtered['VWAP']) & (df_filtered['P'] >= fib_sell_0382) & (df_filtered['P'] <= fib_sell_0618) & (fib_range > 0)
-
             apply_fib_strict = "📉 FIB Retracement (0.382)" in move_type_filter
             other_strats_selected = [s for s in move_type_filter if s not in ["📉 FIB Retracement (0.382)", "All Moves"]]
             
@@ -1962,197 +1734,19 @@ if not df.empty:
             if apply_fib_strict and (len(other_strats_selected) > 0 or "All Moves" in move_type_filter):
                 strats_to_run = [s for s in strats_to_run if s != "📉 FIB Retracement (0.382)"]
 
+            # 🔥 ప్రతి స్ట్రాటజీ ఒక్కసారే, వెక్టరైజ్డ్ మాస్క్ గా (5m ప్యానెల్ ఫీచర్స్ అన్నిటికీ ఒకేసారి)
+            strat_results, fire_delta = run_strategies(
+                df_filtered, strats_to_run, processed_charts, UNIVERSE.contains(df_filtered, U_FNO),
+                nifty_dist=nifty_dist, fib_strict=apply_fib_strict, span=PERF.span)
+
             all_dfs = []
-            for strat in strats_to_run:
-                c_buy = pd.Series(False, index=df_filtered.index)
-                c_sell = pd.Series(False, index=df_filtered.index)
-                icon_str = ""
-
-                if strat == "🔥 Live Power Mover (Last 2 Candles)":
-                    buy_mask = pd.Series(False, index=df_filtered.index)
-                    sell_mask = pd.Series(False, index=df_filtered.index)
-                    
-                    for idx, r in df_filtered.iterrows():
-                        tkr = r['Fetch_T']
-                        if tkr in processed_charts and len(processed_charts[tkr]) >= 2:
-                            df_hist = processed_charts[tkr]
-                            if 'Volume' in df_hist.columns and 'Vol_SMA_89' in df_hist.columns and 'EMA_10' in df_hist.columns:
-                                vol_fire = df_hist['Volume'] > (df_hist['Vol_SMA_89'] * 1.618)
-                                
-                                # బాస్ చెప్పినట్లు: గ్రీన్/రెడ్ రూల్ తీసేశాను. చార్ట్‌లో ఫైర్ పడితే ఇక్కడ కౌంట్ అవుతుంది!
-                                b_cond = vol_fire & (df_hist['Close'] >= df_hist['EMA_10'])
-                                s_cond = vol_fire & (df_hist['Close'] < df_hist['EMA_10'])
-                                
-                                if b_cond.iloc[-2:].sum() >= 1: buy_mask[idx] = True
-                                if s_cond.iloc[-2:].sum() >= 1: sell_mask[idx] = True
-                                
-                    c_buy = base_buy & buy_mask
-                    c_sell = base_sell & sell_mask
-                    icon_str = "🔥 Live Breakout"
-
-                if strat == "🔥 Live Power Mover (Last 2 Candles)":
-                    buy_mask = pd.Series(False, index=df_filtered.index)
-                    sell_mask = pd.Series(False, index=df_filtered.index)
-                    
-                    for idx, r in df_filtered.iterrows():
-                        tkr = r['Fetch_T']
-                        if tkr in processed_charts and len(processed_charts[tkr]) >= 2:
-                            df_hist = processed_charts[tkr]
-                            if 'Volume' in df_hist.columns and 'Vol_SMA_375' in df_hist.columns and 'EMA_10' in df_hist.columns:
-                                
-                                # 375 SMA కన్నా 1.5 రెట్లు వాల్యూమ్
-                                vol_fire = df_hist['Volume'] > (df_hist['Vol_SMA_375'].shift(1) * 1.5)
-                                
-                                # Buy: ముందు క్యాండిల్ పైన క్లోజ్ అవ్వాలి + 10 EMA పైన క్లోజ్ అవ్వాలి
-                                b_cond = vol_fire & (df_hist['Close'] > df_hist['Close'].shift(1)) & (df_hist['Close'] >= df_hist['EMA_10'])
-                                # Sell: ముందు క్యాండిల్ కింద క్లోజ్ అవ్వాలి + 10 EMA కింద క్లోజ్ అవ్వాలి
-                                s_cond = vol_fire & (df_hist['Close'] < df_hist['Close'].shift(1)) & (df_hist['Close'] <= df_hist['EMA_10'])
-                                
-                                if b_cond.iloc[-2:].sum() >= 1: buy_mask[idx] = True
-                                if s_cond.iloc[-2:].sum() >= 1: sell_mask[idx] = True
-                                
-                    c_buy = base_buy & buy_mask
-                    c_sell = base_sell & sell_mask
-                    icon_str = "🔥 Live Breakout"
-
-                elif strat == "🚀 All-Day Volume Spikes (Max Fire)":
-                    buy_mask = pd.Series(False, index=df_filtered.index)
-                    sell_mask = pd.Series(False, index=df_filtered.index)
-                    
-                    # 1. కేవలం FNO (Nifty Futures) స్టాక్స్ ఫిల్టర్
-                    df_fno = df_filtered[df_filtered['T'].isin(FNO_STOCKS)]
-                    
-                    for idx, r in df_fno.iterrows():
-                        tkr = r['Fetch_T']
-                        if tkr in processed_charts and len(processed_charts[tkr]) >= 2:
-                            df_hist = processed_charts[tkr]
-                            
-                            if 'Volume' in df_hist.columns and 'Vol_SMA_375' in df_hist.columns and 'EMA_10' in df_hist.columns:
-                                ltp = df_hist['Close'].iloc[-1]
-                                vwap = df_hist['VWAP'].iloc[-1]
-                                ema10 = df_hist['EMA_10'].iloc[-1]
-                                
-                                # కరెంట్ ప్రైస్ డైరెక్షన్
-                                is_buy_trend = (ltp > vwap) and (ltp > ema10)
-                                is_sell_trend = (ltp < vwap) and (ltp < ema10)
-                                
-                                # వాల్యూమ్ కండిషన్ (375 SMA * 1.5)
-                                vol_fire = df_hist['Volume'] > (df_hist['Vol_SMA_375'].shift(1) * 1.5)
-                                
-                                # 🔥 పక్కా ఫైర్ రూల్స్ (Previous Close Break + 10 EMA Alignment)
-                                valid_buy_fire = vol_fire & (df_hist['Close'] > df_hist['Close'].shift(1)) & (df_hist['Close'] >= df_hist['EMA_10'])
-                                valid_sell_fire = vol_fire & (df_hist['Close'] < df_hist['Close'].shift(1)) & (df_hist['Close'] <= df_hist['EMA_10'])
-                                
-                                tot_buy = valid_buy_fire.sum()
-                                tot_sell = valid_sell_fire.sum()
-                                
-                                fire_score = 0
-                                
-                                # నెట్ స్కోర్ లెక్కించడం
-                                if is_buy_trend and tot_buy >= 1 and tot_buy > tot_sell: 
-                                    buy_mask[idx] = True
-                                    fire_score = (tot_buy - tot_sell) * 10
-                                elif is_sell_trend and tot_sell >= 1 and tot_sell > tot_buy: 
-                                    sell_mask[idx] = True
-                                    fire_score = (tot_sell - tot_buy) * 10
-                                    
-                                if fire_score > 0:
-                                    price_score = int(abs(r['Day_C']) * 5)
-                                    s_vwap = r.get('VWAP', r['P'])
-                                    s_dist = abs(r['P'] - s_vwap) / s_vwap * 100 if s_vwap > 0 else 0
-                                    safe_nifty = max(nifty_dist, 0.2) 
-                                    
-                                    rs_score = 0
-                                    if s_dist >= (safe_nifty * 4): rs_score = 20
-                                    elif s_dist >= (safe_nifty * 3): rs_score = 15
-                                    elif s_dist >= (safe_nifty * 2): rs_score = 10
-                                    elif s_dist >= (safe_nifty * 1.5): rs_score = 5
-                                    
-                                    df_filtered.at[idx, 'S'] = df_filtered.at[idx, 'S'] + fire_score + price_score + rs_score
-
-                    # కనీసం 1% మూమెంట్ (Day Change) ఉంటేనే లిస్ట్‌లోకి రావాలి
-                    c_buy = base_buy & buy_mask & (df_filtered['Day_C'] >= 1.0)
-                    c_sell = base_sell & sell_mask & (df_filtered['Day_C'] <= -1.0)
-                    icon_str = "🚀 Max Fire"
-                elif strat == "⚡ Intraday Pro Breakout (Top 5)":
-                    c_buy = base_buy & (df_filtered['P'] > df_filtered['O']) & ((df_filtered['H'] - df_filtered['P']) <= (df_filtered['H'] - df_filtered['L']) * 0.30)
-                    c_sell = base_sell & (df_filtered['P'] < df_filtered['O']) & ((df_filtered['P'] - df_filtered['L']) <= (df_filtered['H'] - df_filtered['L']) * 0.30)
-                    icon_str = "⚡"
-                elif strat == "🌊 One Sided Only":
-                    c_buy = base_buy & (~df_filtered['AlphaTag'].str.contains("Reversal", na=False)) & (df_filtered['Day_C'] >= 1.5) & (stock_vwap_dist >= (nifty_dist * 1.5)) & (df_filtered['Trend_Score'] >= 3) & open_drive_bull
-                    c_sell = base_sell & (~df_filtered['AlphaTag'].str.contains("Reversal", na=False)) & (df_filtered['Day_C'] <= -1.5) & (stock_vwap_dist >= (nifty_dist * 1.5)) & (df_filtered['Trend_Score'] >= 3) & open_drive_bear
-                    icon_str = "🌊"
-                elif strat == "🔄 VWAP Reversal":
-                    c_buy = base_buy & (df_filtered['AlphaTag'].str.contains("Reversal Buy", na=False)) & (df_filtered['Day_C'] >= 1.5) & (stock_vwap_dist >= (nifty_dist * 1.5))
-                    c_sell = base_sell & (df_filtered['AlphaTag'].str.contains("Reversal Sell", na=False)) & (df_filtered['Day_C'] <= -1.5) & (stock_vwap_dist >= (nifty_dist * 1.5))
-                    icon_str = "🔄"
-                elif strat == "🎯 Reversals Only":
-                    c_buy = base_buy & (df_filtered['AlphaTag'].str.contains("Reversal Buy", na=False)) & (df_filtered['Day_C'] >= 1.0)
-                    c_sell = base_sell & (df_filtered['AlphaTag'].str.contains("Reversal Sell", na=False)) & (df_filtered['Day_C'] <= -1.0)
-                    icon_str = "🎯"
-                elif strat == "🏹 Rubber Band Stretch":
-                    c_buy = base_buy & (~df_filtered['AlphaTag'].str.contains("Reversal", na=False)) & (df_filtered['Day_C'] >= 2.5)
-                    c_sell = base_sell & (~df_filtered['AlphaTag'].str.contains("Reversal", na=False)) & (df_filtered['Day_C'] <= -2.5)
-                    icon_str = "🏹"
-                elif strat == "🏄‍♂️ Momentum Ignition":
-                    c_buy = base_buy & (~df_filtered['AlphaTag'].str.contains("Reversal", na=False)) & (df_filtered['P'] > df_filtered['O']) & (df_filtered['Day_C'] >= 2.0) & ((df_filtered['H'] - df_filtered['P']) <= (df_filtered['H'] - df_filtered['L']) * 0.15)
-                    c_sell = base_sell & (~df_filtered['AlphaTag'].str.contains("Reversal", na=False)) & (df_filtered['P'] < df_filtered['O']) & (df_filtered['Day_C'] <= -2.0) & ((df_filtered['P'] - df_filtered['L']) <= (df_filtered['H'] - df_filtered['L']) * 0.15)
-                    icon_str = "🏄‍♂️"
-                elif strat == "💥 Narrow CPR Breakout":
-                    c_buy = base_buy & (df_filtered['Narrow_CPR'] == True) & (df_filtered['Day_C'] >= 1.0)
-                    c_sell = base_sell & (df_filtered['Narrow_CPR'] == True) & (df_filtered['Day_C'] <= -1.0)
-                    icon_str = "💥"
-                elif strat == "🧲 10-EMA Retest (Best Entry)":
-                    ai_buy = (df_filtered['P'] > df_filtered['VWAP']) & (df_filtered['VolX'] >= 1.5) & (df_filtered.get('Bull_P', 0) >= 75)
-                    ai_sell = (df_filtered['P'] < df_filtered['VWAP']) & (df_filtered['VolX'] >= 1.5) & (df_filtered.get('Bear_P', 0) >= 75)
-                    dt_buy = ((df_filtered['Trend_Score'] >= 3) | (df_filtered['Narrow_CPR'] == True) | (df_filtered['AlphaTag'].str.contains("Reversal Buy", na=False)) | (df_filtered['Day_C'] >= 1.5))
-                    dt_sell = ((df_filtered['Trend_Score'] >= 3) | (df_filtered['Narrow_CPR'] == True) | (df_filtered['AlphaTag'].str.contains("Reversal Sell", na=False)) | (df_filtered['Day_C'] <= -1.5))
-                    c_buy = base_buy & (ai_buy | dt_buy) & (df_filtered['Retest_Tag'] == "BUY_RETEST")
-                    c_sell = base_sell & (ai_sell | dt_sell) & (df_filtered['Retest_Tag'] == "SELL_RETEST")
-                    icon_str = "🧲"
-                elif strat == "📉 FIB Retracement (0.382)":
-                    c_buy = base_buy & fib_buy_mask
-                    c_sell = base_sell & fib_sell_mask
-                    icon_str = "📉 FIB"
-                elif strat == "📈 Minervini Trend Template (VCP)":
-                    cond1 = (df_filtered['P'] > df_filtered['SMA150']) & (df_filtered['P'] > df_filtered['SMA200'])
-                    cond2 = df_filtered['SMA150'] > df_filtered['SMA200']
-                    cond3 = df_filtered['SMA200'] > df_filtered['SMA200_20D']
-                    cond4 = (df_filtered['SMA50'] > df_filtered['SMA150']) & (df_filtered['SMA50'] > df_filtered['SMA200'])
-                    cond5 = df_filtered['P'] > df_filtered['SMA50']
-                    cond6 = df_filtered['P'] >= (df_filtered['Low52W'] * 1.30)
-                    cond7 = df_filtered['P'] >= (df_filtered['High52W'] * 0.75)
-                    
-                    c_buy = base_buy & cond1 & cond2 & cond3 & cond4 & cond5 & cond6 & cond7
-                    c_sell = pd.Series(False, index=df_filtered.index)
-                    icon_str = "📈 M-VCP"
-                    
-                elif strat == "📉 Strict VCP (Price & Vol Contraction)":
-                    cond1 = (df_filtered['P'] > df_filtered['SMA150']) & (df_filtered['P'] > df_filtered['SMA200'])
-                    cond2 = df_filtered['SMA150'] > df_filtered['SMA200']
-                    cond3 = df_filtered['SMA200'] > df_filtered['SMA200_20D']
-                    cond4 = (df_filtered['SMA50'] > df_filtered['SMA150']) & (df_filtered['SMA50'] > df_filtered['SMA200'])
-                    cond5 = df_filtered['P'] > df_filtered['SMA50']
-                    cond6 = df_filtered['P'] >= (df_filtered['Low52W'] * 1.30)
-                    cond7 = df_filtered['P'] >= (df_filtered['High52W'] * 0.75)
-                    vcp_cond = (df_filtered['VCP_Contract'] == True) & (df_filtered['VCP_Vol_Dry'] == True)
-                    
-                    c_buy = base_buy & cond1 & cond2 & cond3 & cond4 & cond5 & cond6 & cond7 & vcp_cond
-                    c_sell = pd.Series(False, index=df_filtered.index)
-                    icon_str = "📉 VCP"
-                elif strat == "🌅 15-Min ORB (Opening Range Breakout)":
-                    c_buy = base_buy & (df_filtered['ORB_Tag'] == "ORB_BUY") & (df_filtered['VolX'] >= 1.2)
-                    c_sell = base_sell & (df_filtered['ORB_Tag'] == "ORB_SELL") & (df_filtered['VolX'] >= 1.2)
-                    icon_str = "🌅 ORB"
-
-                if apply_fib_strict and strat != "📉 FIB Retracement (0.382)":
-                    c_buy = c_buy & fib_buy_mask
-                    c_sell = c_sell & fib_sell_mask
-                    icon_str = icon_str + " + 📉FIB"
-
-                top_buy = df_filtered[c_buy].sort_values(by=['VolX', 'Day_C'], ascending=[False, False]).head(5).copy()
+            for strat, icon_str, c_buy, c_sell in strat_results:
+                # Max Fire స్కోర్ S కి కలుస్తుంది (ఆ స్ట్రాటజీ తర్వాత వచ్చే లిస్ట్స్ కి కూడా, పాత ఆర్డర్ లాగే)
+                if strat in SCORE_STRATEGIES: df_filtered['S'] = df_filtered['S'] + fire_delta
+
+                top_buy = df_filtered[c_buy].sort_values(by=['VolX', 'Day_C'], ascending=[False, False]).head(5)
                 if not top_buy.empty: top_buy['Strategy_Icon'] = f"{icon_str} BUY"
-                top_sell = df_filtered[c_sell].sort_values(by=['VolX', 'Day_C'], ascending=[False, True]).head(5).copy()
+                top_sell = df_filtered[c_sell].sort_values(by=['VolX', 'Day_C'], ascending=[False, True]).head(5)
                 if not top_sell.empty: top_sell['Strategy_Icon'] = f"{icon_str} SELL"
                 
                 all_dfs.extend([top_buy, top_sell])
@@ -2328,7 +1922,7 @@ if not df.empty:
             if submit_btn:
                 if new_sym:
                     if True:
-                        chk_data = yf.download(f"{new_sym}.NS", period="1d", progress=False)
+                        chk_data = DATA.yf_download(f"{new_sym}.NS", period="1d", progress=False)
                         if chk_data.empty: st.error(f"❌ '{new_sym}' not found in NSE!")
                         else:
                             new_date_str = new_date.strftime("%d-%b-%Y")
@@ -2359,7 +1953,7 @@ if not df.empty:
                                 st.success(f"✅ {new_sym} పోర్ట్‌ఫోలియోలో యాడ్ చేయబడింది! (SL: {calc_sl}, T1: {calc_t1})")
                             
                             import time
-                            save_portfolio(df_port_saved); fetch_all_data.clear(); 
+                            save_portfolio(df_port_saved)
                         st.success(f"✅ {sell_qty} shares of {sell_sym} sold successfully!") # ఇది యాడ్ చేయండి
                         time.sleep(1.5) # ఒక సెకను ఆగి రీలోడ్ అవ్వడానికి 
                         st.rerun()
@@ -2380,7 +1974,7 @@ if not df.empty:
                         "Date": st.column_config.TextColumn("Date")
                     }
                 )
-                if st.button("💾 Save Edited Changes", width="stretch"): save_portfolio(edited_df); fetch_all_data.clear(); st.rerun()
+                if st.button("💾 Save Edited Changes", width="stretch"): save_portfolio(edited_df); st.rerun()
 
             with st.expander("💸 Sell Stock & Book Profit/Loss", expanded=False):
                 with st.form("portfolio_sell_form"):
@@ -2408,7 +2002,7 @@ if not df.empty:
                         if sell_qty == current_qty: df_port_saved = df_port_saved[df_port_saved['Symbol'] != sell_sym] 
                         else: df_port_saved.loc[df_port_saved['Symbol'] == sell_sym, 'Quantity'] = current_qty - sell_qty
                         
-                        save_portfolio(df_port_saved); fetch_all_data.clear(); st.rerun()
+                        save_portfolio(df_port_saved); st.rerun()
 
             with st.expander("📜 View Trade Book (Closed P&L Ledger)", expanded=False):
                 df_closed_view = load_closed_trades()
@@ -2429,7 +2023,6 @@ if not df.empty:
                     
                     if st.button("💾 Save Trade Book Changes", width="stretch", key="save_tb"): 
                         save_closed_trades(edited_closed_df)
-                        load_closed_trades.clear()
                         st.success("✅ Trade Book అప్డేట్ అయ్యింది!")
                         time.sleep(1)
                         st.rerun()
@@ -2491,20 +2084,20 @@ if not df.empty:
                 
             if "AI Predictions" in watchlist_mode:
                 # 1. F&O మరియు NIFTY 50 
-                fno_buy = df_buy[df_buy['T'].isin(NIFTY_50 + FNO_STOCKS)]
-                fno_sell = df_sell[df_sell['T'].isin(NIFTY_50 + FNO_STOCKS)]
+                fno_buy = df_buy[UNIVERSE.contains(df_buy, U_NIFTY50 | U_FNO)]
+                fno_sell = df_sell[UNIVERSE.contains(df_sell, U_NIFTY50 | U_FNO)]
                 if not fno_buy.empty: render_heatmap_section(fno_buy, "🟢 POSITIVE / BUY (F&O & Nifty 50)", "#3fb950")
                 if not fno_sell.empty: render_heatmap_section(fno_sell, "🔴 NEGATIVE / SELL (F&O & Nifty 50)", "#f85149")
                 
                 # 2. Mid Cap 150
-                mid_buy = df_buy[df_buy['T'].isin(MIDCAP_150)]
-                mid_sell = df_sell[df_sell['T'].isin(MIDCAP_150)]
+                mid_buy = df_buy[UNIVERSE.contains(df_buy, U_MIDCAP)]
+                mid_sell = df_sell[UNIVERSE.contains(df_sell, U_MIDCAP)]
                 if not mid_buy.empty: render_heatmap_section(mid_buy, "🟢 POSITIVE / BUY (AI Mid Cap)", "#3fb950")
                 if not mid_sell.empty: render_heatmap_section(mid_sell, "🔴 NEGATIVE / SELL (AI Mid Cap)", "#f85149")
                 
                 # 3. Small Cap 250
-                small_buy = df_buy[df_buy['T'].isin(SMALLCAP_250)]
-                small_sell = df_sell[df_sell['T'].isin(SMALLCAP_250)]
+                small_buy = df_buy[UNIVERSE.contains(df_buy, U_SMALLCAP)]
+                small_sell = df_sell[UNIVERSE.contains(df_sell, U_SMALLCAP)]
                 if not small_buy.empty: render_heatmap_section(small_buy, "🟢 POSITIVE / BUY (AI Small Cap)", "#3fb950")
                 if not small_sell.empty: render_heatmap_section(small_sell, "🔴 NEGATIVE / SELL (AI Small Cap)", "#f85149")
             else:
@@ -2543,7 +2136,7 @@ if not df.empty:
                 for sym in display_tkrs:
                     try:
                         df_h = hist_data[sym] if isinstance(hist_data.columns, pd.MultiIndex) else hist_data
-                        df_h = df_h.dropna(subset=['Close']).copy()
+                        df_h = df_h.dropna(subset=['Close'])
                         if not df_h.empty:
                             if chart_timeframe == "Weekly Chart":
                                 df_h['SMA_10'] = df_h['Close'].rolling(window=10).mean()
@@ -2564,12 +2157,12 @@ if not df.empty:
             chart_dict_to_use = processed_charts
 
         if search_stock != "-- None --":
-            render_chart_grid(pd.DataFrame([df[df['T'] == search_stock].iloc[0]]), show_pin_option=True, key_prefix="search", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol)
+            render_chart_grid(df.iloc[[radar_idx.pos(search_stock, key='T')]], show_pin_option=True, key_prefix="search", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol, compact=compact_charts)
             st.markdown("<hr class='custom-hr'>", unsafe_allow_html=True)
         
         if watchlist_mode not in ["My Portfolio 💼", "Fundamentals 🏢", "Commodity 🛢️"]:
             st.markdown("<div style='font-size:16px; font-weight:bold; margin-bottom:5px; color:#00BFFF;'>🌍 Global & Main Indices</div>", unsafe_allow_html=True)
-            render_chart_grid(df_indices, show_pin_option=False, key_prefix="idx", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol)
+            render_chart_grid(df_indices, show_pin_option=False, key_prefix="idx", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol, compact=compact_charts)
             st.markdown("<hr class='custom-hr'>", unsafe_allow_html=True)
             
             if not df_sectors.empty:
@@ -2578,11 +2171,11 @@ if not df.empty:
                 st.markdown("<div style='margin-bottom: 2px;'></div>", unsafe_allow_html=True)
                 
                 if show_sec_charts:
-                    render_chart_grid(df_sectors, show_pin_option=False, key_prefix="sec", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol, is_sector=True)
+                    render_chart_grid(df_sectors, show_pin_option=False, key_prefix="sec", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol, compact=compact_charts, is_sector=True)
                     if st.session_state.get('active_sec'):
                         st.markdown(f"<div style='font-size:16px; font-weight:bold; margin-top:10px; margin-bottom:5px; color:#ffd700;'>🌟 Top 6 Active Movers in {st.session_state.active_sec}</div>", unsafe_allow_html=True)
                         sec_stock_names = TOP_SECTOR_STOCKS.get(st.session_state.active_sec, [])
-                        sec_df = df_stocks[df_stocks['T'].isin(sec_stock_names)].copy()
+                        sec_df = df_stocks[df_stocks['T'].isin(sec_stock_names)]
                         
                         if not sec_df.empty:
                             sort_col = 'W_C' if chart_timeframe == "Weekly Chart" else 'Day_C'
@@ -2590,16 +2183,16 @@ if not df.empty:
                             is_sec_down = float(sec_trend_row[sort_col].iloc[0]) < 0 if not sec_trend_row.empty else False
                             if is_sec_down: sec_df = sec_df.sort_values(by=sort_col, ascending=True).head(6) 
                             else: sec_df = sec_df.sort_values(by=sort_col, ascending=False).head(6) 
-                            render_chart_grid(sec_df, show_pin_option=True, key_prefix="sec_top6", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol)
+                            render_chart_grid(sec_df, show_pin_option=True, key_prefix="sec_top6", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol, compact=compact_charts)
                         else: pass
                 st.markdown("<hr class='custom-hr'>", unsafe_allow_html=True)
 
-        pinned_df = df[df['Fetch_T'].isin(st.session_state.pinned_stocks)].copy()
+        pinned_df = df[df['Fetch_T'].isin(st.session_state.pinned_stocks)]
         unpinned_df = df_stocks_display[~df_stocks_display['Fetch_T'].isin(pinned_df['Fetch_T'].tolist())]
         
         if not pinned_df.empty:
             st.markdown("<div style='font-size:16px; font-weight:bold; margin-bottom:5px; color:#ffd700;'>📌 Pinned Priority Charts</div>", unsafe_allow_html=True)
-            render_chart_grid(pinned_df, show_pin_option=True, key_prefix="pin", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol)
+            render_chart_grid(pinned_df, show_pin_option=True, key_prefix="pin", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol, compact=compact_charts, page_size=0)
             st.markdown("<hr class='custom-hr'>", unsafe_allow_html=True)
         
         # 🔥 SMART AUTO-REPLACEMENT: 
@@ -2617,11 +2210,11 @@ if not df.empty:
                 
                 if not df_buy_chart.empty:
                     st.markdown(f"<div style='font-size:16px; font-weight:bold; margin-top:10px; margin-bottom:5px; color:#3fb950;'>🟢 POSITIVE / BUY ({title_suffix})</div>", unsafe_allow_html=True)
-                    render_chart_grid(df_buy_chart, show_pin_option=True, key_prefix="ai_buy", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol)
+                    render_chart_grid(df_buy_chart, show_pin_option=True, key_prefix="ai_buy", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol, compact=compact_charts)
 
                 if not df_sell_chart.empty:
                     st.markdown(f"<div style='font-size:16px; font-weight:bold; margin-top:20px; margin-bottom:5px; color:#f85149;'>🔴 NEGATIVE / SELL ({title_suffix})</div>", unsafe_allow_html=True)
-                    render_chart_grid(df_sell_chart, show_pin_option=True, key_prefix="ai_sell", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol)
+                    render_chart_grid(df_sell_chart, show_pin_option=True, key_prefix="ai_sell", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol, compact=compact_charts)
                     
             elif watchlist_mode == "Swing Trading 📈":
                 df_buy_chart = unpinned_df[unpinned_df[sort_key] >= 0].head(12)
@@ -2629,11 +2222,11 @@ if not df.empty:
                 
                 if not df_buy_chart.empty:
                     st.markdown(f"<div style='font-size:16px; font-weight:bold; margin-top:10px; margin-bottom:5px; color:#3fb950;'>🟢 POSITIVE / BUY (Swing Trading)</div>", unsafe_allow_html=True)
-                    render_chart_grid(df_buy_chart, show_pin_option=True, key_prefix="swing_buy", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol)
+                    render_chart_grid(df_buy_chart, show_pin_option=True, key_prefix="swing_buy", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol, compact=compact_charts)
 
                 if not df_sell_chart.empty:
                     st.markdown(f"<div style='font-size:16px; font-weight:bold; margin-top:20px; margin-bottom:5px; color:#f85149;'>🔴 NEGATIVE / SELL (Swing Trading)</div>", unsafe_allow_html=True)
-                    render_chart_grid(df_sell_chart, show_pin_option=True, key_prefix="swing_sell", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol)
+                    render_chart_grid(df_sell_chart, show_pin_option=True, key_prefix="swing_sell", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol, compact=compact_charts)
 
             elif watchlist_mode == "Day Trading Stocks 🚀":
                 df_buy_chart = unpinned_df[unpinned_df['Strategy_Icon'].str.contains('BUY', na=False)].head(12)
@@ -2641,11 +2234,11 @@ if not df.empty:
                 
                 if not df_buy_chart.empty:
                     st.markdown(f"<div style='font-size:16px; font-weight:bold; margin-top:10px; margin-bottom:5px; color:#3fb950;'>🟢 POSITIVE / BUY ({watchlist_mode})</div>", unsafe_allow_html=True)
-                    render_chart_grid(df_buy_chart, show_pin_option=True, key_prefix="day_buy", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol)
+                    render_chart_grid(df_buy_chart, show_pin_option=True, key_prefix="day_buy", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol, compact=compact_charts)
 
                 if not df_sell_chart.empty:
                     st.markdown(f"<div style='font-size:16px; font-weight:bold; margin-top:20px; margin-bottom:5px; color:#f85149;'>🔴 NEGATIVE / SELL ({watchlist_mode})</div>", unsafe_allow_html=True)
-                    render_chart_grid(df_sell_chart, show_pin_option=True, key_prefix="day_sell", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol)
+                    render_chart_grid(df_sell_chart, show_pin_option=True, key_prefix="day_sell", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol, compact=compact_charts)
                     
             else:
                 df_buy_chart = unpinned_df[unpinned_df[sort_key] >= 0].head(12)
@@ -2653,8 +2246,27 @@ if not df.empty:
                 
                 if not df_buy_chart.empty:
                     st.markdown(f"<div style='font-size:16px; font-weight:bold; margin-top:10px; margin-bottom:5px; color:#3fb950;'>🟢 POSITIVE / BUY ({watchlist_mode})</div>", unsafe_allow_html=True)
-                    render_chart_grid(df_buy_chart, show_pin_option=True, key_prefix="main_buy", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol)
+                    render_chart_grid(df_buy_chart, show_pin_option=True, key_prefix="main_buy", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol, compact=compact_charts)
 
                 if not df_sell_chart.empty:
                     st.markdown(f"<div style='font-size:16px; font-weight:bold; margin-top:20px; margin-bottom:5px; color:#f85149;'>🔴 NEGATIVE / SELL ({watchlist_mode})</div>", unsafe_allow_html=True)
-                    render_chart_grid(df_sell_chart, show_pin_option=True, key_prefix="main_sell", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol)
+                    render_chart_grid(df_sell_chart, show_pin_option=True, key_prefix="main_sell", timeframe=chart_timeframe, chart_dict=chart_dict_to_use, show_crosshair=show_crosshair, show_vol=show_vol, compact=compact_charts)
+
+# --- 9. PERFORMANCE PANEL ---
+# 🔥 5s autorefresh బడ్జెట్ ఎక్కడ పోతుందో: ప్రతి స్టేజ్ రోలింగ్ p50/p95 + కాష్ hit/miss (TTL / ఇంటర్వెల్ ట్యూనింగ్ కి)
+PERF.record("rerun", time.perf_counter() - RERUN_T0, mode=watchlist_mode, view=view_mode)
+with st.sidebar.expander("⏱️ Performance (p50 / p95)", expanded=False):
+    st.dataframe(PERF.summary().round(2), hide_index=True, width="stretch")
+    render_cache, figure_cache = get_render_cache(), get_figure_cache()
+    memo_rows = pd.DataFrame([
+        {"cache": "render_memo", "hits": render_cache.hits, "misses": render_cache.misses},
+        {"cache": "figure_cache", "hits": figure_cache.hits, "misses": figure_cache.misses},
+    ])
+    memo_rows['hit_pct'] = 100.0 * memo_rows['hits'] / (memo_rows['hits'] + memo_rows['misses']).clip(lower=1)
+    st.dataframe(pd.concat([PERF.cache_summary(), memo_rows], ignore_index=True).round(1), hide_index=True, width="stretch")
+    snap = market_refresher.latest()
+    shared_mb = sum(frame_nbytes(f.cache().values()) for f in [fetch_cached_5m_data, fetch_historical_charts_data]) / 2**20
+    st.caption(f"Snapshot: radar {frame_nbytes(snap.get('radar')) / 2**20:.1f} MB · 5m {frame_nbytes(snap.get('intraday') or {}) / 2**20:.1f} MB · shared caches {shared_mb:.1f} MB")
+    if PERF.log_path: st.caption(f"JSONL log: {PERF.log_path}")
+    if st.button("Reset timings", key="perf_reset"): PERF.reset()
+PERF.flush()
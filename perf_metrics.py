@@ -0,0 +1,122 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+# --- HOT-PATH TIMING (spans + cache hit/miss + JSONL log) ---
+# process-wide: బ్యాక్‌గ్రౌండ్ రీఫ్రెషర్ థ్రెడ్ & అన్ని సెషన్స్ ఒకే PerfMetrics లో రాస్తాయి.
+# ప్రతి స్టేజ్ కి లాస్ట్ `window` టైమింగ్స్ మాత్రమే మెమరీ లో (p50/p95 కోసం), ప్రతి ఈవెంట్ ఒక JSON లైన్ గా లాగ్ లో.
+# లాగ్ max_bytes దాటితే <log>.1 కి రొటేట్ (ఒక్క పాత ఫైల్ మాత్రమే) - డిస్క్ మీద గరిష్టం ~2 x max_bytes.
+
+
+class PerfMetrics:
+    def __init__(self, log_path=None, window=500, flush_every=2.0, max_bytes=16 << 20):
+        self.log_path = log_path or None
+        self.max_bytes = max_bytes
+        self.window = window
+        self.flush_every = flush_every
+        self._samples = {}            # stage -> deque(ms)
+        self._totals = {}             # stage -> [count, total_ms]
+        self._cache = {}              # cache name -> [hits, misses]
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    # --- spans ---
+    def record(self, stage, seconds, **fields):
+        ms = seconds * 1000.0
+        with self._lock:
+            buf = self._samples.get(stage)
+            if buf is None: buf = self._samples[stage] = deque(maxlen=self.window)
+            buf.append(ms)
+            tot = self._totals.setdefault(stage, [0, 0.0])
+            tot[0] += 1
+            tot[1] += ms
+            if self.log_path: self._pending.append(dict(ts=round(time.time(), 3), kind="span", stage=stage, ms=round(ms, 3), **fields))
+        self._maybe_flush()
+
+    @contextmanager
+    def span(self, stage, **fields):
+        t0 = time.perf_counter()
+        try: yield
+        finally: self.record(stage, time.perf_counter() - t0, **fields)
+
+    def timed(self, stage):
+        def wrap(func):
+            def inner(*args, **kwargs):
+                with self.span(stage): return func(*args, **kwargs)
+            inner.__name__ = func.__name__
+            inner.__dict__.update(func.__dict__)   # .uncached / .clear లాంటివి అలాగే ఉంటాయి
+            inner.__wrapped__ = func
+            return inner
+        return wrap
+
+    # --- cache hit/miss ---
+    # cache_call(): కాష్ చేసిన ఫంక్షన్ బయట, miss(): లోపలి బాడీ లో (బాడీ రన్ అయితేనే miss, లేకపోతే hit)
+    @contextmanager
+    def cache_call(self, name):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None: stack = self._local.stack = []
+        flag = [False]
+        stack.append(flag)
+        t0 = time.perf_counter()
+        try: yield
+        finally:
+            stack.pop()
+            self.cache_event(name, hit=not flag[0], seconds=time.perf_counter() - t0)
+
+    def miss(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack: stack[-1][0] = True
+
+    def cache_event(self, name, hit, seconds=None):
+        with self._lock:
+            c = self._cache.setdefault(name, [0, 0])
+            c[0 if hit else 1] += 1
+            if self.log_path:
+                rec = dict(ts=round(time.time(), 3), kind="cache", cache=name, hit=hit)
+                if seconds is not None: rec['ms'] = round(seconds * 1000.0, 3)
+                self._pending.append(rec)
+        self._maybe_flush()
+
+    # --- JSONL లాగ్ (బ్యాచ్ గా, ప్రతి ఈవెంట్ కి ఫైల్ ఓపెన్ కాకుండా) ---
+    def _maybe_flush(self):
+        if self.log_path and time.monotonic() - self._last_flush >= self.flush_every: self.flush()
+
+    def flush(self):
+        with self._lock:
+            lines, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+        if not lines or not self.log_path: return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+            if self.max_bytes and os.path.exists(self.log_path) and os.path.getsize(self.log_path) >= self.max_bytes:
+                os.replace(self.log_path, self.log_path + ".1")
+            with open(self.log_path, 'a', encoding='utf-8') as fh:
+                fh.write("".join(json.dumps(r, default=str, ensure_ascii=False) + "\n" for r in lines))
+        except OSError: pass
+
+    # --- సైడ్‌బార్ ప్యానెల్ కోసం ---
+    def summary(self):
+        with self._lock:
+            rows = [(stage, np.fromiter(buf, float), *self._totals[stage]) for stage, buf in self._samples.items() if buf]
+        out = [dict(stage=s, calls=n, p50_ms=float(np.percentile(a, 50)), p95_ms=float(np.percentile(a, 95)),
+                    last_ms=float(a[-1]), total_s=total / 1000.0) for s, a, n, total in rows]
+        df = pd.DataFrame(out, columns=['stage', 'calls', 'p50_ms', 'p95_ms', 'last_ms', 'total_s'])
+        return df.sort_values('p95_ms', ascending=False, ignore_index=True)
+
+    def cache_summary(self):
+        with self._lock:
+            rows = [dict(cache=name, hits=h, misses=m, hit_pct=100.0 * h / (h + m) if h + m else 0.0) for name, (h, m) in self._cache.items()]
+        return pd.DataFrame(rows, columns=['cache', 'hits', 'misses', 'hit_pct']).sort_values('cache', ignore_index=True)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+            self._cache.clear()
@@ -0,0 +1,112 @@
+import os
+import sqlite3
+import threading
+import pandas as pd
+
+# --- LOCAL PORTFOLIO / TRADE BOOK DATABASE (SQLite WAL) ---
+# హోల్డింగ్స్ & క్లోజ్డ్ ట్రేడ్స్ కి ఇదే అసలు స్టోర్. పేజీ రీడ్స్ అన్నీ లోకల్ గా,
+# Google Sheets (Trading_DB) కి బ్యాక్‌గ్రౌండ్ థ్రెడ్ మిర్రర్ చేస్తుంది.
+
+PORTFOLIO_COLS = ['Symbol', 'Buy_Price', 'Quantity', 'Date', 'SL', 'T1', 'T2']
+TRADE_COLS = ['Sell_Date', 'Symbol', 'Quantity', 'Buy_Price', 'Sell_Price', 'PnL_Rs', 'PnL_Pct']
+TEXT_COLS = {'Symbol', 'Date', 'Sell_Date'}
+
+TABLES = {"holdings": ("Portfolio", PORTFOLIO_COLS), "trades": ("TradeBook", TRADE_COLS)}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS holdings (pos INTEGER PRIMARY KEY, Symbol TEXT, Buy_Price NUMERIC, Quantity NUMERIC,
+    Date TEXT, SL NUMERIC, T1 NUMERIC, T2 NUMERIC);
+CREATE TABLE IF NOT EXISTS trades (pos INTEGER PRIMARY KEY, Sell_Date TEXT, Sell_Day TEXT, Symbol TEXT, Quantity NUMERIC,
+    Buy_Price NUMERIC, Sell_Price NUMERIC, PnL_Rs NUMERIC, PnL_Pct NUMERIC);
+CREATE INDEX IF NOT EXISTS idx_holdings_symbol ON holdings(Symbol);
+CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(Symbol);
+CREATE INDEX IF NOT EXISTS idx_trades_day ON trades(Sell_Day);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def _val(v, col):
+    if v is None or (isinstance(v, float) and v != v): return None if col not in TEXT_COLS else ""
+    if hasattr(v, 'item'): v = v.item()
+    return str(v) if col in TEXT_COLS else v
+
+
+class PortfolioDB:
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._listeners = []
+        self.version = 0                 # ప్రతి replace తర్వాత +1 (రెండర్ మెమో కీ కోసం)
+
+    def on_change(self, callback):
+        self._listeners.append(callback)
+
+    def is_seeded(self, table):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (f"seeded_{table}",)).fetchone()
+        return row is not None
+
+    def read(self, table):
+        cols = TABLES[table][1]
+        with self._lock:
+            rows = self.conn.execute(f"SELECT {', '.join(cols)} FROM {table} ORDER BY pos").fetchall()
+        return pd.DataFrame(rows, columns=cols)
+
+    def replace(self, table, df, notify=True):
+        # చిన్న టేబుల్స్ - ఒకే ట్రాన్సాక్షన్ లో మొత్తం రీప్లేస్ (షీట్ లోని రో ఆర్డర్ అలాగే)
+        cols = TABLES[table][1]
+        df = df.reindex(columns=cols)
+        rows = [[_val(v, c) for v, c in zip(r, cols)] for r in df.itertuples(index=False, name=None)]
+        insert_cols = list(cols)
+        if table == "trades":
+            days = pd.to_datetime(df['Sell_Date'], format="%d-%b-%Y", errors='coerce').dt.strftime('%Y-%m-%d')
+            rows = [r + [d if isinstance(d, str) else None] for r, d in zip(rows, days)]
+            insert_cols.append('Sell_Day')
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute(f"DELETE FROM {table}")
+                self.conn.executemany(f"INSERT INTO {table} (pos, {', '.join(insert_cols)}) VALUES ({', '.join(['?'] * (len(insert_cols) + 1))})",
+                                      [[i] + r for i, r in enumerate(rows)])
+                self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, '1')", (f"seeded_{table}",))
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.version += 1
+        if notify:
+            for cb in self._listeners: cb(table)
+
+    def realized_pnl(self):
+        with self._lock:
+            row = self.conn.execute("SELECT COALESCE(SUM(PnL_Rs), 0) FROM trades WHERE typeof(PnL_Rs) IN ('integer', 'real')").fetchone()
+        return float(row[0])
+
+
+class SheetsMirror:
+    # DB మారిన ప్రతిసారి లేటెస్ట్ స్నాప్‌షాట్ ని బ్యాక్‌గ్రౌండ్ లో SheetWriter కి పంపిస్తుంది
+    def __init__(self, db, writer, retry_every=60):
+        self.db, self.writer, self.retry_every = db, writer, retry_every
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        db.on_change(self.mark)
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def mark(self, table):
+        with self._lock: self._dirty.add(table)
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(timeout=self.retry_every)
+            self._wake.clear()
+            with self._lock: dirty, self._dirty = self._dirty, set()
+            try:
+                for table in sorted(dirty): self.writer.write(TABLES[table][0], self.db.read(table))
+                self.writer.flush()
+            except Exception:
+                with self._lock: self._dirty |= dirty
@@ -0,0 +1,211 @@
+import warnings
+import numpy as np
+import pandas as pd
+
+# --- VECTORIZED DAILY RADAR ENGINE ---
+# yf.download ఇచ్చే (date x ticker/field) ప్యానెల్ ని ఒకేసారి date x symbol NumPy మ్యాట్రిక్స్ లాగా మార్చి,
+# పాత per-symbol లూప్ లో ఉన్న ప్రతి కాలమ్ ని అన్ని స్టాక్స్ కి ఒకే పాస్ లో లెక్కిస్తుంది.
+
+RADAR_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# fetch_all_data రిటర్న్ చేసే రేడార్ టేబుల్ కాలమ్స్ (పాత results dict ఆర్డర్ లోనే)
+RADAR_COLUMNS = [
+    "VCP_Contract", "VCP_Vol_Dry",
+    "Fetch_T", "T", "P", "O", "H", "L", "Prev_C",
+    "Prev_H", "Prev_L", "W_EMA10", "W_EMA50", "D_EMA50",
+    "SMA50", "SMA150", "SMA200", "High52W", "Low52W", "SMA200_20D",
+    "Day_C", "C", "W_C", "S", "VolX", "Is_Swing",
+    "Is_W_Pullback", "VWAP",
+    "ATR", "Narrow_CPR",
+    "Bull_P", "Bear_P",
+    "Is_Index", "Is_Sector", "Sector", "Is_Commodity"
+]
+
+
+def _field_matrix(data, symbols, field):
+    try:
+        wide = data.xs(field, axis=1, level=1)
+    except KeyError:
+        return np.full((len(data.index), len(symbols)), np.nan)
+    wide = wide.loc[:, ~wide.columns.duplicated()]
+    return wide.reindex(columns=symbols).to_numpy(dtype=float)
+
+
+def _align_last(mat, valid):
+    # ప్రతి symbol యొక్క valid రోస్ ని కిందకి జరుపుతుంది, అప్పుడు row -1 అందరికీ లాస్ట్ క్యాండిల్ అవుతుంది
+    order = np.argsort(valid, axis=0, kind='stable')
+    out = np.take_along_axis(mat, order, axis=0)
+    out[~np.take_along_axis(valid, order, axis=0)] = np.nan
+    return out
+
+
+def _shift(mat):
+    out = np.full_like(mat, np.nan)
+    out[1:] = mat[:-1]
+    return out
+
+
+def _ewm(mat, alpha):
+    # pandas .ewm(adjust=False) కి సమానం, లీడింగ్ NaN ప్యాడింగ్ ని స్కిప్ చేస్తుంది
+    out = np.full_like(mat, np.nan)
+    state = np.full(mat.shape[1], np.nan)
+    for t in range(mat.shape[0]):
+        x = mat[t]
+        has = ~np.isnan(x)
+        state = np.where(has & np.isnan(state), x, np.where(has, state + alpha * (x - state), state))
+        out[t] = state
+    return out
+
+
+def _true_range(high, low, close):
+    prev_c = _shift(close)
+    return np.fmax(np.fmax(high - low, np.abs(high - prev_c)), np.abs(low - prev_c))
+
+
+def _tail(mat, func, window, end=None):
+    block = mat[-window:] if end is None else mat[-window - end:-end]
+    with np.errstate(all='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return func(block, axis=0)
+
+
+def _last(mat, k=1):
+    return mat[-k] if mat.shape[0] >= k else np.full(mat.shape[1], np.nan)
+
+
+def _weekly_matrices(data, symbols, daily_valid, fields):
+    idx = pd.DatetimeIndex(data.index)
+    if idx.tz is not None: idx = idx.tz_localize(None)
+    week_key = idx.to_period('W')
+
+    aggs = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last'}
+    weekly = {}
+    for name, how in aggs.items():
+        masked = np.where(daily_valid, fields[name], np.nan)
+        weekly[name] = pd.DataFrame(masked, columns=symbols).groupby(week_key).agg(how).to_numpy(dtype=float)
+
+    w_valid = ~(np.isnan(weekly['Open']) | np.isnan(weekly['High']) | np.isnan(weekly['Low']) | np.isnan(weekly['Close']))
+    return {k: _align_last(v, w_valid) for k, v in weekly.items()}, w_valid.sum(axis=0)
+
+
+def compute_daily_radar(data, minutes, benchmark="^NSEI"):
+    if data is None or data.empty or not isinstance(data.columns, pd.MultiIndex):
+        return pd.DataFrame()
+
+    present = set(data.columns.get_level_values(0))
+    symbols = [s for s in data.columns.levels[0] if s in present]
+    raw = {f: _field_matrix(data, symbols, f) for f in RADAR_FIELDS}
+    valid = ~np.isnan(raw['Close'])
+    n = valid.sum(axis=0)
+
+    m = {f: _align_last(raw[f], valid) for f in RADAR_FIELDS}
+    O, H, L, C, V = m['Open'], m['High'], m['Low'], m['Close'], m['Volume']
+
+    with np.errstate(all='ignore'):
+        ltp, open_p, low, high = _last(C), _last(O), _last(L), _last(H)
+        prev_c, prev_h, prev_l = _last(C, 2), _last(H, 2), _last(L, 2)
+
+        # పాత లూప్ లో ZeroDivisionError వచ్చే స్టాక్స్ స్కిప్ అయ్యేవి, అదే రూల్ ఇక్కడ కూడా
+        p_pivot = (prev_h + prev_l + prev_c) / 3
+        keep = (n >= 2) & (open_p != 0) & (prev_c != 0) & (p_pivot != 0)
+
+        day_chg = (ltp - open_p) / open_p * 100
+        net_chg = (ltp - prev_c) / prev_c * 100
+
+        p_bc = (prev_h + prev_l) / 2
+        p_tc = (p_pivot - p_bc) + p_pivot
+        is_narrow_cpr = (np.abs(p_tc - p_bc) / p_pivot * 100) <= 0.30
+
+        atr = _last(_ewm(_true_range(H, L, C), 2 / 15))
+
+        has_vol = ~np.all(np.isnan(V), axis=0)
+        avg_vol_5d = _tail(V, np.nanmean, 5, end=1)
+        vol_ok = has_vol & (n >= 6)
+        curr_vol = np.where(vol_ok, _last(V), 0.0)
+        vol_x = np.where(vol_ok & (avg_vol_5d > 0), np.round(curr_vol / ((avg_vol_5d / 375) * minutes), 1), 0.0)
+
+        vwap = (high + low + ltp) / 3
+        hl_range = high - low
+        bull_power = np.where(hl_range > 0, (ltp - low) / hl_range * 100, 0)
+        bear_power = np.where(hl_range > 0, (high - ltp) / hl_range * 100, 0)
+
+        ema50_d = np.where(n >= 50, _last(_ewm(C, 2 / 51)), 0.0)
+
+        # MINERVINI METRICS
+        sma50_d = np.where(n >= 50, _tail(C, np.mean, 50), 0.0)
+        sma150_d = np.where(n >= 150, _tail(C, np.mean, 150), 0.0)
+        sma200_d = np.where(n >= 200, _tail(C, np.mean, 200), 0.0)
+        high_52w = _tail(H, np.nanmax, 252)
+        low_52w = _tail(L, np.nanmin, 252)
+        sma200_20d = np.where(n >= 220, _tail(C, np.mean, 200, end=20), 0.0)
+
+        # VCP CONTRACTION & VOLUME DRY-UP
+        max_60, min_60 = _tail(H, np.nanmax, 60), _tail(L, np.nanmin, 60)
+        max_10, min_10 = _tail(H, np.nanmax, 10), _tail(L, np.nanmin, 10)
+        range_60 = np.where(min_60 > 0, (max_60 - min_60) / min_60, 0)
+        range_10 = np.where(min_10 > 0, (max_10 - min_10) / min_10, 0)
+        vcp_price_contraction = (n >= 60) & (range_60 > 0) & (range_10 <= range_60 * 0.75) & (range_10 <= 0.15)
+        vcp_vol_dry = (n >= 60) & (_tail(V, np.nanmean, 5) <= _tail(V, np.nanmean, 50) * 1.05)
+
+        # WEEKLY TREND & ADX (df.resample('W') కి బదులు ఒకే groupby)
+        w, nw = _weekly_matrices(data, symbols, valid, raw)
+        prev_w_c = _last(w['Close'], 2)
+        weekly_net_chg = np.where((nw >= 2) & (prev_w_c > 0), (ltp - prev_w_c) / prev_w_c * 100, net_chg)
+
+        has_w = nw >= 75
+        w_ema10 = _ewm(w['Close'], 2 / 11)
+        w_ema50 = _ewm(w['Close'], 2 / 51)
+        latest_w_ema10 = np.where(has_w, _last(w_ema10), 0.0)
+        latest_w_ema50 = np.where(has_w, _last(w_ema50), 0.0)
+        continuous_4w = np.all(w_ema10[-4:] > w_ema50[-4:], axis=0) if w['Close'].shape[0] >= 4 else np.zeros(len(symbols), dtype=bool)
+
+        w_valid = ~np.isnan(w['Close'])
+        w_atr14 = _ewm(_true_range(w['High'], w['Low'], w['Close']), 1 / 14)
+        w_plus_dm = np.diff(w['High'], axis=0, prepend=np.nan)
+        w_minus_dm = _shift(w['Low']) - w['Low']
+        w_plus_dm = np.where((w_plus_dm > w_minus_dm) & (w_plus_dm > 0), w_plus_dm, 0.0)
+        w_minus_dm = np.where((w_minus_dm > w_plus_dm) & (w_minus_dm > 0), w_minus_dm, 0.0)
+        w_plus_di = 100 * (_ewm(np.where(w_valid, w_plus_dm, np.nan), 1 / 14) / w_atr14)
+        w_minus_di = 100 * (_ewm(np.where(w_valid, w_minus_dm, np.nan), 1 / 14) / w_atr14)
+        w_dx = np.abs(w_plus_di - w_minus_di) / (w_plus_di + w_minus_di) * 100
+        w_adx = _last(_ewm(w_dx, 1 / 14))
+
+        recent_w_low = _tail(w['Low'], np.nanmin, 2)
+        is_w_pullback = (has_w & continuous_4w & (recent_w_low <= latest_w_ema10 * 1.002)
+                         & (ltp > latest_w_ema10) & (ltp <= latest_w_ema10 * 1.02) & (w_adx >= 15))
+
+        # DAILY RSI SWING FILTER
+        delta = C - _shift(C)
+        gain = _last(_ewm(np.clip(delta, 0, None), 1 / 14))
+        loss = _last(_ewm(-np.clip(delta, None, 0), 1 / 14))
+        current_rsi = np.where((loss == 0) | np.isnan(loss), 100.0, 100 - (100 / (1 + gain / loss)))
+        ema20_w = np.where(latest_w_ema10 > 0, latest_w_ema10, 0)
+        is_swing = (n >= 100) & (ltp > ema50_d) & (ltp > ema20_w) & (current_rsi >= 55) & (net_chg > 0)
+
+        # SCORE
+        nifty_dist = 0.1
+        if benchmark in symbols:
+            b = symbols.index(benchmark)
+            if n[b] > 0 and vwap[b] > 0: nifty_dist = abs(ltp[b] - vwap[b]) / vwap[b] * 100
+        effective_nifty = max(nifty_dist, 0.25)
+        stock_dist = np.where(vwap > 0, np.abs(ltp - vwap) / vwap * 100, 0)
+
+        score = np.where(stock_dist > effective_nifty * 3, 5, np.where(stock_dist > effective_nifty * 2, 3, 0))
+        score = score + 3 * ((np.abs(open_p - low) <= ltp * 0.003) | (np.abs(open_p - high) <= ltp * 0.003))
+        score = score + 3 * (vol_x > 1.0)
+        score = score + 1 * (((ltp >= high * 0.998) & (day_chg > 0.5)) | ((ltp <= low * 1.002) & (day_chg < -0.5)))
+        score = score + 1 * (((ltp > low * 1.01) & (ltp > vwap)) | ((ltp < high * 0.99) & (ltp < vwap)))
+        score = score + 3 * ((bull_power >= 85) & (day_chg > 1.0))
+        score = score + 3 * ((bear_power >= 85) & (day_chg < -1.0))
+
+    out = pd.DataFrame({
+        "VCP_Contract": vcp_price_contraction, "VCP_Vol_Dry": vcp_vol_dry,
+        "Fetch_T": symbols, "P": ltp, "O": open_p, "H": high, "L": low, "Prev_C": prev_c,
+        "Prev_H": prev_h, "Prev_L": prev_l, "W_EMA10": latest_w_ema10, "W_EMA50": latest_w_ema50, "D_EMA50": ema50_d,
+        "SMA50": sma50_d, "SMA150": sma150_d, "SMA200": sma200_d, "High52W": high_52w, "Low52W": low_52w, "SMA200_20D": sma200_20d,
+        "Day_C": day_chg, "C": net_chg, "W_C": weekly_net_chg, "S": score.astype(int), "VolX": vol_x, "Is_Swing": is_swing,
+        "Is_W_Pullback": is_w_pullback, "VWAP": vwap,
+        "ATR": atr, "Narrow_CPR": is_narrow_cpr,
+        "Bull_P": bull_power, "Bear_P": bear_power,
+    })
+    return out[keep].reset_index(drop=True)
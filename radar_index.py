@@ -0,0 +1,39 @@
+# --- RADAR SYMBOL INDEX ---
+# df[df['Fetch_T'] == sym] ప్రతిసారీ మొత్తం ఫ్రేమ్ స్కాన్ (O(N)) - లూప్ లో అయితే O(N²).
+# ఒక్కసారి సింబల్ -> రో పొజిషన్ డిక్ట్ + కాలమ్ numpy అర్రేస్, తర్వాత ప్రతి లుక్అప్ O(1).
+
+
+class RadarIndex:
+    def __init__(self, df, keys=('Fetch_T', 'T')):
+        self.df = df
+        self._cols = {}
+        self._pos = {}
+        for key in keys:
+            if key not in df.columns: continue
+            vals = df[key].tolist()
+            # డూప్లికేట్ ఉంటే మొదటి రో (పాత .iloc[0] లాగే)
+            self._pos[key] = dict(zip(reversed(vals), range(len(vals) - 1, -1, -1)))
+
+    def __len__(self):
+        return len(self.df)
+
+    def col(self, name):
+        arr = self._cols.get(name)
+        if arr is None: arr = self._cols[name] = self.df[name].to_numpy()
+        return arr
+
+    def pos(self, sym, key='Fetch_T'):
+        return self._pos.get(key, {}).get(sym)
+
+    def has(self, sym, key='Fetch_T'):
+        return sym in self._pos.get(key, {})
+
+    def value(self, sym, name, key='Fetch_T', default=None):
+        i = self.pos(sym, key)
+        return default if i is None else self.col(name)[i]
+
+    def row(self, sym, key='Fetch_T'):
+        # కాలమ్ పేరు -> వాల్యూ డిక్ట్ (row['P'] లాగే వాడొచ్చు); లేకపోతే None
+        i = self.pos(sym, key)
+        if i is None: return None
+        return {c: self.col(c)[i] for c in self.df.columns}
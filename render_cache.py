@@ -0,0 +1,92 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# --- RENDER MEMO (charts & HTML tables) ---
+# 5 సెకన్ల autorefresh లో డేటా మారకపోతే చార్ట్ / టేబుల్ మళ్ళీ బిల్డ్ చేయకుండా పాతదే వాడుతుంది.
+# టేబుల్స్: కీ = కాంపోనెంట్ పేరు + ఇన్‌పుట్ ఆర్గ్యుమెంట్స్ ఫింగర్‌ప్రింట్ (+ స్నాప్‌షాట్ / టిక్ / DB వెర్షన్).
+# చార్ట్స్: FigureCache - (సింబల్, ఆప్షన్స్, లాస్ట్ బార్ టైమ్) కీ, లాస్ట్ బార్ మారితే ప్యాచ్.
+
+
+def fingerprint(obj, shallow=False):
+    # DataFrame / Series కంటెంట్ హాష్ (ఆర్డర్ కూడా) - లైవ్ టిక్ ఓవర్‌లే తో వాల్యూస్ మారితే కీ కూడా మారుతుంది.
+    # shallow: డేటా వెర్షన్ కీ లో ఉన్నప్పుడు float కాలమ్స్ (ప్రైసెస్ / ఇండికేటర్స్) ఆ వెర్షన్ నుండే వస్తాయి, హాష్ చేయం -
+    # ఇండెక్స్ (ఏ రోస్, ఏ ఆర్డర్) + సింబల్ / ట్యాగ్ / ఫ్లాగ్ కాలమ్స్ మాత్రమే (సెషన్ ఫిల్టర్స్ & మోడ్స్ వీటిలో కనిపిస్తాయి)
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        h = hashlib.blake2b(digest_size=16)
+        cols = obj.columns if isinstance(obj, pd.DataFrame) else [obj.name]
+        h.update(repr((type(obj).__name__, obj.shape, [str(c) for c in cols])).encode())
+        if shallow: obj = obj.select_dtypes(exclude='floating') if isinstance(obj, pd.DataFrame) else obj.index.to_series()
+        try: h.update(np.ascontiguousarray(pd.util.hash_pandas_object(obj, index=True).to_numpy()).tobytes())
+        except TypeError: h.update(obj.to_json(default_handler=str).encode())
+        return h.hexdigest()
+    if isinstance(obj, dict): return tuple(sorted((str(k), fingerprint(v, shallow)) for k, v in obj.items()))
+    if isinstance(obj, (list, tuple)): return tuple(fingerprint(v, shallow) for v in obj)
+    if isinstance(obj, (np.generic,)): return obj.item()
+    return obj
+
+
+class RenderCache:
+    def __init__(self, max_items=512):
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+        # బిల్డ్ లాక్ బయట - రెండు సెషన్స్ ఒకేసారి బిల్డ్ చేసినా ఫలితం ఒకటే
+        value = build()
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items: self._items.popitem(last=False)
+        return value
+
+    def memo(self, name, extra=None, shallow=False):
+        # HTML render_* ఫంక్షన్స్ కి: అన్ని ఆర్గ్యుమెంట్స్ ఫింగర్‌ప్రింట్ + extra(*args, **kwargs) (బయటి స్టేట్ వెర్షన్, అదే ఆర్గ్యుమెంట్స్ తో).
+        # shallow=True అయితే extra() లో డేటా వెర్షన్ తప్పనిసరి (float వాల్యూస్ హాష్ కావు)
+        def wrap(func):
+            def inner(*args, **kwargs):
+                key = (name, fingerprint(args, shallow), fingerprint(kwargs, shallow), extra(*args, **kwargs) if extra else None)
+                return self.get_or_build(key, lambda: func(*args, **kwargs))
+            inner.__name__ = func.__name__
+            inner.uncached = func
+            return inner
+        return wrap
+
+
+class FigureCache:
+    # చార్ట్ ఫిగర్స్ కి: ఎన్ని ఐటమ్స్ కాదు, అంచనా సైజ్ (బైట్స్) మీద LRU ఎవిక్షన్
+    def __init__(self, max_bytes=64 << 20):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._items = OrderedDict()      # key -> (entry, nbytes)
+        self.lock = threading.RLock()    # ఎంట్రీ ప్యాచ్ చేసేటప్పుడు కూడా ఇదే లాక్
+        self.hits = self.misses = self.patches = 0
+
+    def get(self, key):
+        with self.lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, entry, nbytes):
+        with self.lock:
+            if key in self._items: self.nbytes -= self._items.pop(key)[1]
+            self._items[key] = (entry, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes and len(self._items) > 1:
+                _, (_, old) = self._items.popitem(last=False)
+                self.nbytes -= old
@@ -0,0 +1,143 @@
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Mapping
+import numpy as np
+import pandas as pd
+
+# --- ZERO-COPY READ-ONLY SNAPSHOTS ---
+# పబ్లిష్ అయ్యేటప్పుడు ఒక్కసారి మాత్రమే కాపీ: ప్రతి dtype కి ఒక read-only numpy బ్లాక్ (writeable=False).
+# సెషన్స్ కి copy(deep=False) వ్యూస్ - డేటా కాపీ కాదు. ఎవరైనా మార్చితే pandas Copy-on-Write
+# ఆ సెషన్ కాపీ లో మాత్రమే మారుస్తుంది, షేర్డ్ బ్లాక్ ఎప్పటికీ మారదు (నేరుగా numpy రైట్ చేస్తే ValueError).
+
+NARROW_COLS = 64                                  # ఇంతకంటే తక్కువ కాలమ్స్ అయితే కాలమ్ వారీ బ్లాక్స్
+_FROZEN = weakref.WeakValueDictionary()   # id(df) -> df (DataFrame hashable కాదు)
+
+
+def is_frozen(df):
+    return isinstance(df, pd.DataFrame) and _FROZEN.get(id(df)) is df
+
+
+def mark_frozen(df):
+    # అన్ని కాలమ్స్ ఇప్పటికే సొంత read-only అర్రేస్ అయిన ఫ్రేమ్స్ కి మాత్రమే (readonly_frame) - కాపీ లేకుండా
+    _FROZEN[id(df)] = df
+    return df
+
+
+def readonly_frame(index, columns, blocks, attrs=None):
+    # blocks = [(కాలమ్ పొజిషన్స్, (rows x len(positions)) అర్రే)] - ప్రతి dtype కి ఒకే బ్లాక్, కాపీ లేకుండా ఫ్రేమ్
+    # (వెయ్యిల కాలమ్స్ ఉన్న ప్యానెల్ కి కూడా బ్లాక్స్ కొన్నే, అందుకే copy(deep=False) views చౌక)
+    n_cols = len(columns)
+    if n_cols <= NARROW_COLS:
+        # చిన్న ఫ్రేమ్స్ (ఒక్క సింబల్ OHLCV + ఇండికేటర్స్): concat + రీఆర్డర్ కంటే కాలమ్ వ్యూస్ డిక్ట్ చాలా వేగం
+        cols = {}
+        for pos, arr in blocks:
+            if isinstance(arr, np.ndarray):
+                arr.flags.writeable = False
+                for j, p in enumerate(pos): cols[p] = arr[:, j]
+            else: cols[pos[0]] = arr
+        out = pd.DataFrame({p: cols[p] for p in range(n_cols)}, index=index, copy=False)
+        out.columns = columns
+        out.attrs = dict(attrs or {})
+        return mark_frozen(out)
+    parts = []
+    for pos, arr in blocks:
+        if isinstance(arr, np.ndarray):
+            arr.flags.writeable = False
+            parts.append(pd.DataFrame(arr, index=index, columns=pos, copy=False))
+        else:
+            parts.append(pd.DataFrame({pos[0]: arr}, index=index))
+    if not parts: out = pd.DataFrame(index=index)
+    elif len(parts) == 1: out = parts[0]
+    else:
+        out = pd.concat(parts, axis=1)
+        if list(out.columns) != list(range(n_cols)): out = out[list(range(n_cols))]
+    out.columns = columns
+    out.attrs = dict(attrs or {})
+    return mark_frozen(out)
+
+
+def freeze_frame(df):
+    if df is None or not isinstance(df, pd.DataFrame) or is_frozen(df): return df
+    groups, blocks = {}, []
+    for i, dt in enumerate(df.dtypes):
+        if isinstance(dt, np.dtype) and dt != object: groups.setdefault(dt, []).append(i)
+        # categorical / string కాలమ్స్: ఒక కాపీ, CoW రక్షణ మాత్రమే (numpy బ్లాక్ కాదు)
+        else: blocks.append(([i], df.iloc[:, i].copy()))
+    for dt, pos in groups.items():
+        blocks.append((pos, df.iloc[:, pos].to_numpy(dtype=dt, copy=True)))
+    return readonly_frame(df.index, df.columns, blocks, df.attrs)
+
+
+def view(df):
+    # షేర్డ్ ఫ్రేమ్ పైన కొత్త DataFrame ఆబ్జెక్ట్ (డేటా కాపీ లేదు); కాలమ్ యాడ్ / రైట్ చేసినా ఒరిజినల్ మారదు
+    return df.copy(deep=False) if isinstance(df, pd.DataFrame) else df
+
+
+class FrozenCharts(Mapping):
+    # {Fetch_T: ఫ్రోజెన్ df} - చదివిన ప్రతిసారీ view; raw() పూర్తిగా రీడ్-ఓన్లీ పాత్స్ కి (ఉదా: to_numpy)
+    __slots__ = ('_items',)
+
+    def __init__(self, charts):
+        self._items = {k: freeze_frame(v) for k, v in charts.items()}
+
+    def __getitem__(self, key):
+        return view(self._items[key])
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def raw(self, key, default=None):
+        return self._items.get(key, default)
+
+
+def freeze(value):
+    if isinstance(value, FrozenCharts): return value
+    if isinstance(value, pd.DataFrame): return freeze_frame(value)
+    if isinstance(value, dict) and value and all(isinstance(v, pd.DataFrame) for v in value.values()): return FrozenCharts(value)
+    return value
+
+
+def thaw(value):
+    # సెషన్ కి ఇచ్చే రూపం: ఫ్రేమ్ అయితే view, charts అయితే అదే FrozenCharts (లేజీ views)
+    return view(value) if isinstance(value, pd.DataFrame) else value
+
+
+class SharedCache:
+    # st.cache_data బదులు: ప్రాసెస్ మొత్తానికి ఒకే ఫ్రోజెన్ కాపీ, ప్రతి కాలర్ కి zero-copy view (pickle / deepcopy లేదు)
+    def __init__(self, ttl, max_items=64):
+        self.ttl = ttl
+        self.max_items = max_items
+        self._items = OrderedDict()      # key -> (expires_at, frozen value)
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get_or_build(self, key, build):
+        now = time.time()
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and item[0] > now:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return thaw(item[1])
+            self.misses += 1
+        # బిల్డ్ లాక్ బయట (RenderCache లాగే) - నెమ్మదైన ఫెచ్ వేరే కీస్ ని ఆపదు
+        value = freeze(build())
+        with self._lock:
+            self._items[key] = (time.time() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items: self._items.popitem(last=False)
+        return thaw(value)
+
+    def clear(self):
+        with self._lock: self._items.clear()
+
+    def values(self):
+        with self._lock: return [v for _, v in self._items.values()]
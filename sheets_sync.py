@@ -0,0 +1,98 @@
+import os
+import json
+import time
+import threading
+import numpy as np
+from gspread.utils import rowcol_to_a1
+
+# --- DIFF-BASED GOOGLE SHEETS WRITER (with local write-ahead journal) ---
+# ప్రతి షీట్ లాస్ట్ గా ఎలా ఉందో గుర్తుంచుకుని, మారిన రోస్ మాత్రమే ఒకే batch_update లో పంపిస్తుంది.
+# పంపే ముందు జర్నల్ ఫైల్ లో రాస్తుంది - API ఫెయిల్ అయితే తర్వాతి సేవ్ / యాప్ రీస్టార్ట్ లో మళ్ళీ పంపుతుంది.
+
+
+def _cell(v):
+    # షీట్ నుండి చదివిన వాల్యూస్ (get_all_records) & మనం రాసేవి ఒకేలా కంపేర్ అవ్వడానికి
+    if v is None or (isinstance(v, float) and np.isnan(v)): return ""
+    if isinstance(v, (np.integer, np.floating)): v = v.item()
+    if isinstance(v, float) and v.is_integer(): v = int(v)
+    return v
+
+
+def frame_to_rows(df):
+    df = df.fillna("")
+    return [[str(c) for c in df.columns]] + [[_cell(v) for v in row] for row in df.values.tolist()]
+
+
+def diff_ranges(old_rows, new_rows):
+    # మారిన / కొత్త రోస్ ని వరుస బ్లాక్స్ గా కలిపి A1 రేంజ్ లు; తగ్గిన రోస్ ని ఖాళీ చేస్తుంది
+    width = max([len(r) for r in old_rows + new_rows] or [1])
+    padded = [r + [""] * (width - len(r)) for r in new_rows]
+    padded += [[""] * width for _ in range(len(old_rows) - len(new_rows))]
+
+    # హెడర్ (కాలమ్స్) మారితే అన్ని రోస్ మళ్ళీ రాయాలి
+    header_changed = not old_rows or old_rows[0] != new_rows[0]
+    changed = [i for i, r in enumerate(padded)
+               if header_changed or i >= len(old_rows)
+               or [str(x) for x in old_rows[i] + [""] * (width - len(old_rows[i]))] != [str(x) for x in r]]
+    ranges, start = [], None
+    for k, i in enumerate(changed):
+        if start is None: start = i
+        if k + 1 == len(changed) or changed[k + 1] != i + 1:
+            ranges.append({'range': f"{rowcol_to_a1(start + 1, 1)}:{rowcol_to_a1(i + 1, width)}", 'values': padded[start:i + 1]})
+            start = None
+    return ranges
+
+
+class SheetWriter:
+    def __init__(self, worksheets, journal_path):
+        self.worksheets = worksheets        # {"Portfolio": ws, "TradeBook": ws}
+        self.journal_path = journal_path
+        self.known = {}                     # షీట్ పేరు -> లాస్ట్ గా తెలిసిన rows
+        self._lock = threading.Lock()
+        self.pending = []
+        try:
+            with open(journal_path) as fh: self.pending = [json.loads(line) for line in fh if line.strip()]
+        except (OSError, ValueError): self.pending = []
+
+    def _save_journal(self):
+        if not self.pending:
+            if os.path.exists(self.journal_path): os.remove(self.journal_path)
+            return
+        os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+        tmp = f"{self.journal_path}.tmp"
+        with open(tmp, 'w') as fh:
+            for entry in self.pending: fh.write(json.dumps(entry, default=str) + "\n")
+        os.replace(tmp, self.journal_path)
+
+    def remember(self, sheet, df):
+        # షీట్ నుండి ఫ్రెష్ గా చదివినప్పుడు ఇదే అసలు స్టేట్ (పెండింగ్ రైట్స్ లేకపోతే)
+        with self._lock:
+            if not any(e['sheet'] == sheet for e in self.pending): self.known[sheet] = frame_to_rows(df)
+
+    def write(self, sheet, df):
+        new_rows = frame_to_rows(df)
+        with self._lock:
+            # షీట్ ఎలా ఉందో తెలియకపోతే పాత లాగా clear చేసి పూర్తిగా రాస్తుంది
+            unknown = sheet not in self.known
+            ranges = diff_ranges(self.known.get(sheet, []), new_rows)
+            if ranges:
+                self.pending.append({'sheet': sheet, 'ts': time.time(), 'clear': unknown, 'ranges': ranges})
+                self._save_journal()
+            self.known[sheet] = new_rows
+            return self._flush()
+
+    def flush(self):
+        with self._lock: return self._flush()
+
+    def _flush(self):
+        # జర్నల్ ఆర్డర్ లోనే పంపిస్తుంది, ఏది ఫెయిల్ అయినా అక్కడితో ఆగి తర్వాత రీట్రై
+        while self.pending:
+            entry = self.pending[0]
+            ws = self.worksheets[entry['sheet']]
+            try:
+                if entry.get('clear'): ws.clear()
+                ws.batch_update(entry['ranges'])
+            except Exception: return False
+            self.pending.pop(0)
+            self._save_journal()
+        return True
@@ -0,0 +1,219 @@
+from contextlib import nullcontext
+import warnings
+import numpy as np
+import pandas as pd
+from intraday_tags import stack_5m
+
+# --- VECTORIZED STRATEGY ENGINE (🤖 Today's AI Predictions) ---
+# ప్రతి స్ట్రాటజీ కి df_filtered.iterrows() + processed_charts[tkr] లూప్ బదులు, 5m ప్యానెల్ ఫీచర్స్
+# (ఓపెన్ డ్రైవ్, వాల్యూమ్ ఫైర్, Max Fire స్కోర్) ఒక్కసారే లెక్కించి, ప్రతి స్ట్రాటజీ ఒక buy/sell మాస్క్ మాత్రమే.
+
+PANEL_FIELDS = ['Open', 'High', 'Low', 'Close', 'VWAP', 'EMA_10', 'Volume', 'Vol_SMA_375']
+FIB_STRAT = "📉 FIB Retracement (0.382)"
+
+
+def _shift(mat):
+    out = np.full_like(mat, np.nan)
+    out[1:] = mat[:-1]
+    return out
+
+
+def panel_features(charts, symbols):
+    # ఒక్కో సింబల్ కి: ఓపెన్ డ్రైవ్ లెవెల్స్ + 375-SMA వాల్యూమ్ ఫైర్ కౌంట్స్ (పాత per-symbol లూప్స్ లాగే)
+    m, n = stack_5m(charts, symbols, PANEL_FIELDS)
+    O, H, L, C, VW, E10, V, VS = (m[f] for f in PANEL_FIELDS)
+    rows, cols = C.shape
+    last = lambda mat, k=1: mat[-k] if rows >= k else np.full(cols, np.nan)
+
+    with np.errstate(all='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        start = rows - n
+        bar_no = np.arange(rows)[:, None] - start[None, :]
+        first_open = O[np.clip(start, 0, max(rows - 1, 0)), np.arange(cols)] if rows else np.full(cols, np.nan)
+        after_1st = bar_no >= 1
+        low_after_1st = np.nanmin(np.where(after_1st, L, np.nan), axis=0) if rows else np.full(cols, np.nan)
+        high_after_1st = np.nanmax(np.where(after_1st, H, np.nan), axis=0) if rows else np.full(cols, np.nan)
+
+        # 375 SMA కన్నా 1.5 రెట్లు వాల్యూమ్ + ముందు క్యాండిల్ క్లోజ్ బ్రేక్ + 10 EMA అలైన్‌మెంట్
+        c_prev = _shift(C)
+        vol_fire = V > (_shift(VS) * 1.5)
+        buy_fire = vol_fire & (C > c_prev) & (C >= E10)
+        sell_fire = vol_fire & (C < c_prev) & (C <= E10)
+
+    return {
+        'n': n,
+        'first_open': first_open, 'low_after_1st': low_after_1st, 'high_after_1st': high_after_1st,
+        'live_buy': buy_fire[-2:].any(axis=0), 'live_sell': sell_fire[-2:].any(axis=0),
+        'tot_buy': buy_fire.sum(axis=0), 'tot_sell': sell_fire.sum(axis=0),
+        'ltp': last(C), 'vwap': last(VW), 'ema10': last(E10),
+    }
+
+
+def strategy_context(f, charts, fno_mask, nifty_dist):
+    # అన్ని స్ట్రాటజీలు షేర్ చేసే మాస్క్స్ / ఫీచర్స్ - ఒక్కసారే
+    idx = f.index
+    P, O, H, L = f['P'], f['O'], f['H'], f['L']
+    px = panel_features(charts, f['Fetch_T'].tolist())
+    has_5m = px['n'] >= 2
+    p = P.to_numpy(dtype=float)
+
+    with np.errstate(all='ignore'):
+        open_drive_bull = np.where(has_5m, (px['first_open'] - px['low_after_1st']) <= p * 0.003, (O - L).to_numpy(dtype=float) <= p * 0.003)
+        open_drive_bear = np.where(has_5m, (px['high_after_1st'] - px['first_open']) <= p * 0.003, (H - O).to_numpy(dtype=float) <= p * 0.003)
+
+        # 🚀 MAX FIRE: నెట్ ఫైర్ కౌంట్ స్కోర్ (FNO మాత్రమే)
+        tb, ts = px['tot_buy'], px['tot_sell']
+        fire_ok = np.asarray(fno_mask, dtype=bool) & has_5m
+        mf_buy = fire_ok & (px['ltp'] > px['vwap']) & (px['ltp'] > px['ema10']) & (tb >= 1) & (tb > ts)
+        mf_sell = fire_ok & ~mf_buy & (px['ltp'] < px['vwap']) & (px['ltp'] < px['ema10']) & (ts >= 1) & (ts > tb)
+        fire_score = np.where(mf_buy, (tb - ts) * 10, np.where(mf_sell, (ts - tb) * 10, 0))
+
+        price_score = np.trunc(np.nan_to_num(np.abs(f['Day_C'].to_numpy(dtype=float)) * 5)).astype(int)
+        s_vwap = f['VWAP'].to_numpy(dtype=float) if 'VWAP' in f.columns else p
+        s_dist = np.where(s_vwap > 0, np.abs(p - s_vwap) / s_vwap * 100, 0)
+        safe_nifty = max(nifty_dist, 0.2)
+        rs_score = np.select([s_dist >= safe_nifty * 4, s_dist >= safe_nifty * 3, s_dist >= safe_nifty * 2, s_dist >= safe_nifty * 1.5], [20, 15, 10, 5], 0)
+        fire_delta = np.where(fire_score > 0, fire_score + price_score + rs_score, 0)
+
+    s_vwap_day = (H + L + P) / 3
+    fib_range = H - L
+    return {
+        'base_buy': (P > f['W_EMA10']) & (P > f['W_EMA50']) & (P > f['VWAP']),
+        'base_sell': (P < f['W_EMA10']) & (P < f['W_EMA50']) & (P < f['VWAP']),
+        'nifty_dist': nifty_dist,
+        'stock_vwap_dist': (P - s_vwap_day).abs() / s_vwap_day * 100,
+        'open_drive_bull': pd.Series(open_drive_bull, index=idx),
+        'open_drive_bear': pd.Series(open_drive_bear, index=idx),
+        'live_buy': pd.Series(has_5m & px['live_buy'], index=idx),
+        'live_sell': pd.Series(has_5m & px['live_sell'], index=idx),
+        'mf_buy': pd.Series(mf_buy, index=idx),
+        'mf_sell': pd.Series(mf_sell, index=idx),
+        'fire_delta': pd.Series(fire_delta, index=idx),
+        'fib_buy': (P > f['VWAP']) & (P <= H - fib_range * 0.382) & (P >= H - fib_range * 0.618) & (fib_range > 0),
+        'fib_sell': (P < f['VWAP']) & (P >= L + fib_range * 0.382) & (P <= L + fib_range * 0.618) & (fib_range > 0),
+        'reversal': f['AlphaTag'].str.contains("Reversal", na=False),
+        'reversal_buy': f['AlphaTag'].str.contains("Reversal Buy", na=False),
+        'reversal_sell': f['AlphaTag'].str.contains("Reversal Sell", na=False),
+    }
+
+
+# --- STRATEGY MASKS: f = df_filtered, x = strategy_context ---
+
+def _live_power_mover(f, x):
+    return x['base_buy'] & x['live_buy'], x['base_sell'] & x['live_sell']
+
+
+def _max_fire(f, x):
+    # కనీసం 1% మూమెంట్ (Day Change) ఉంటేనే లిస్ట్‌లోకి రావాలి
+    return x['base_buy'] & x['mf_buy'] & (f['Day_C'] >= 1.0), x['base_sell'] & x['mf_sell'] & (f['Day_C'] <= -1.0)
+
+
+def _pro_breakout(f, x):
+    rng = f['H'] - f['L']
+    return (x['base_buy'] & (f['P'] > f['O']) & ((f['H'] - f['P']) <= rng * 0.30),
+            x['base_sell'] & (f['P'] < f['O']) & ((f['P'] - f['L']) <= rng * 0.30))
+
+
+def _one_sided(f, x):
+    strong = (x['stock_vwap_dist'] >= (x['nifty_dist'] * 1.5)) & (f['Trend_Score'] >= 3) & ~x['reversal']
+    return (x['base_buy'] & strong & (f['Day_C'] >= 1.5) & x['open_drive_bull'],
+            x['base_sell'] & strong & (f['Day_C'] <= -1.5) & x['open_drive_bear'])
+
+
+def _vwap_reversal(f, x):
+    far = x['stock_vwap_dist'] >= (x['nifty_dist'] * 1.5)
+    return (x['base_buy'] & x['reversal_buy'] & (f['Day_C'] >= 1.5) & far,
+            x['base_sell'] & x['reversal_sell'] & (f['Day_C'] <= -1.5) & far)
+
+
+def _reversals_only(f, x):
+    return x['base_buy'] & x['reversal_buy'] & (f['Day_C'] >= 1.0), x['base_sell'] & x['reversal_sell'] & (f['Day_C'] <= -1.0)
+
+
+def _rubber_band(f, x):
+    return x['base_buy'] & ~x['reversal'] & (f['Day_C'] >= 2.5), x['base_sell'] & ~x['reversal'] & (f['Day_C'] <= -2.5)
+
+
+def _momentum_ignition(f, x):
+    rng = f['H'] - f['L']
+    return (x['base_buy'] & ~x['reversal'] & (f['P'] > f['O']) & (f['Day_C'] >= 2.0) & ((f['H'] - f['P']) <= rng * 0.15),
+            x['base_sell'] & ~x['reversal'] & (f['P'] < f['O']) & (f['Day_C'] <= -2.0) & ((f['P'] - f['L']) <= rng * 0.15))
+
+
+def _narrow_cpr(f, x):
+    cpr = f['Narrow_CPR'] == True
+    return x['base_buy'] & cpr & (f['Day_C'] >= 1.0), x['base_sell'] & cpr & (f['Day_C'] <= -1.0)
+
+
+def _ema10_retest(f, x):
+    ai_buy = (f['P'] > f['VWAP']) & (f['VolX'] >= 1.5) & (f.get('Bull_P', 0) >= 75)
+    ai_sell = (f['P'] < f['VWAP']) & (f['VolX'] >= 1.5) & (f.get('Bear_P', 0) >= 75)
+    dt_base = (f['Trend_Score'] >= 3) | (f['Narrow_CPR'] == True)
+    dt_buy = dt_base | x['reversal_buy'] | (f['Day_C'] >= 1.5)
+    dt_sell = dt_base | x['reversal_sell'] | (f['Day_C'] <= -1.5)
+    return (x['base_buy'] & (ai_buy | dt_buy) & (f['Retest_Tag'] == "BUY_RETEST"),
+            x['base_sell'] & (ai_sell | dt_sell) & (f['Retest_Tag'] == "SELL_RETEST"))
+
+
+def _fib(f, x):
+    return x['base_buy'] & x['fib_buy'], x['base_sell'] & x['fib_sell']
+
+
+def _minervini(f):
+    return ((f['P'] > f['SMA150']) & (f['P'] > f['SMA200']) & (f['SMA150'] > f['SMA200'])
+            & (f['SMA200'] > f['SMA200_20D']) & (f['SMA50'] > f['SMA150']) & (f['SMA50'] > f['SMA200'])
+            & (f['P'] > f['SMA50']) & (f['P'] >= f['Low52W'] * 1.30) & (f['P'] >= f['High52W'] * 0.75))
+
+
+def _minervini_vcp(f, x):
+    return x['base_buy'] & _minervini(f), pd.Series(False, index=f.index)
+
+
+def _strict_vcp(f, x):
+    vcp = (f['VCP_Contract'] == True) & (f['VCP_Vol_Dry'] == True)
+    return x['base_buy'] & _minervini(f) & vcp, pd.Series(False, index=f.index)
+
+
+def _orb_15m(f, x):
+    return (x['base_buy'] & (f['ORB_Tag'] == "ORB_BUY") & (f['VolX'] >= 1.2),
+            x['base_sell'] & (f['ORB_Tag'] == "ORB_SELL") & (f['VolX'] >= 1.2))
+
+
+# పేరు -> (ఐకాన్, మాస్క్ ఫంక్షన్); ఆర్డర్ = "All Moves" లో రన్ అయ్యే ఆర్డర్
+STRATEGIES = {
+    "🔥 Live Power Mover (Last 2 Candles)": ("🔥 Live Breakout", _live_power_mover),
+    "🚀 All-Day Volume Spikes (Max Fire)": ("🚀 Max Fire", _max_fire),
+    "⚡ Intraday Pro Breakout (Top 5)": ("⚡", _pro_breakout),
+    "🌊 One Sided Only": ("🌊", _one_sided),
+    "🔄 VWAP Reversal": ("🔄", _vwap_reversal),
+    "🎯 Reversals Only": ("🎯", _reversals_only),
+    "🏹 Rubber Band Stretch": ("🏹", _rubber_band),
+    "🏄‍♂️ Momentum Ignition": ("🏄‍♂️", _momentum_ignition),
+    "💥 Narrow CPR Breakout": ("💥", _narrow_cpr),
+    "🧲 10-EMA Retest (Best Entry)": ("🧲", _ema10_retest),
+    FIB_STRAT: ("📉 FIB", _fib),
+    "📈 Minervini Trend Template (VCP)": ("📈 M-VCP", _minervini_vcp),
+    "🌅 15-Min ORB (Opening Range Breakout)": ("🌅 ORB", _orb_15m),
+}
+EXTRA_STRATEGIES = {
+    "📉 Strict VCP (Price & Vol Contraction)": ("📉 VCP", _strict_vcp),
+}
+SCORE_STRATEGIES = {"🚀 All-Day Volume Spikes (Max Fire)"}   # ఇవి S కాలమ్ కి fire_delta కలుపుతాయి
+
+
+def run_strategies(f, names, charts, fno_mask, nifty_dist=0.25, fib_strict=False, span=None):
+    # -> ([(పేరు, ఐకాన్, buy మాస్క్, sell మాస్క్)], fire_delta); ప్రతి స్ట్రాటజీ ఒక్కసారే
+    # span(stage) -> context manager (PerfMetrics.span) ఇస్తే context & ప్రతి స్ట్రాటజీ విడిగా టైమ్ అవుతుంది
+    span = span or (lambda stage: nullcontext())
+    with span("strategy.context"):
+        x = strategy_context(f, charts, fno_mask, nifty_dist)
+    out = []
+    for name in names:
+        icon, func = STRATEGIES.get(name) or EXTRA_STRATEGIES.get(name) or ("", None)
+        if func is None: buy = sell = pd.Series(False, index=f.index)
+        else:
+            with span(f"strategy.{name}"): buy, sell = func(f, x)
+        if fib_strict and name != FIB_STRAT:
+            buy, sell, icon = buy & x['fib_buy'], sell & x['fib_sell'], icon + " + 📉FIB"
+        out.append((name, icon, buy, sell))
+    return out, x['fire_delta']
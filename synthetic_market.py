@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+# --- SYNTHETIC MARKET (ఆఫ్‌లైన్ OHLCV ఫిక్స్చర్స్) ---
+# Yahoo / Dhan / Sheets లేకుండా బెంచ్‌మార్క్ & టెస్టింగ్ కోసం yf.download(group_by='ticker') ఆకారం లోనే
+# (date x (ticker, field)) ప్యానెల్స్. నిజమైన మార్కెట్ లాగే: గ్యాప్ అప్/డౌన్, మిస్ అయిన బార్స్,
+# జీరో వాల్యూమ్ క్యాండిల్స్, కొత్తగా లిస్ట్ అయిన (IPO) స్టాక్స్ కి చిన్న హిస్టరీ.
+
+FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+BARS_PER_DAY = 75            # 09:15 - 15:30, 5 నిమిషాల క్యాండిల్స్
+
+
+def synthetic_symbols(n, benchmark="^NSEI"):
+    return [benchmark] + [f"SYN{i:04d}.NS" for i in range(n)]
+
+
+def _walk(rng, rows, cols, vol):
+    # లాగ్-నార్మల్ ర్యాండమ్ వాక్ + అప్పుడప్పుడు గ్యాప్ జంప్స్
+    rets = rng.normal(0, 1, (rows, cols)) * vol
+    gaps = rng.random((rows, cols)) < 0.01
+    rets[gaps] += rng.normal(0, 0.04, gaps.sum())
+    start = rng.uniform(50, 3000, cols)
+    return start * np.exp(np.cumsum(rets, axis=0))
+
+
+def _ohlcv(rng, close, vol, base_volume):
+    rows, cols = close.shape
+    prev = np.vstack([close[:1], close[:-1]])
+    open_ = prev * np.exp(rng.normal(0, vol * 0.5, (rows, cols)))
+    wick = np.abs(rng.normal(0, vol, (rows, cols)))
+    high = np.maximum(open_, close) * (1 + wick)
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, vol, (rows, cols))))
+    volume = np.round(base_volume * rng.lognormal(0, 0.8, (rows, cols)))
+    volume[rng.random((rows, cols)) < 0.02] = 0        # జీరో వాల్యూమ్ బార్స్
+    return {'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume}
+
+
+def _panel(index, symbols, fields):
+    cols = pd.MultiIndex.from_product([symbols, FIELDS])
+    data = np.stack([fields[f] for f in FIELDS], axis=2).reshape(len(index), -1)
+    return pd.DataFrame(data, index=index, columns=cols)
+
+
+def _punch_holes(rng, fields, listed_from, missing_p):
+    # IPO ముందు రోస్ + ర్యాండమ్ మిస్సింగ్ బార్స్ -> NaN (yf.download లాగే)
+    rows, cols = fields['Close'].shape
+    hole = np.arange(rows)[:, None] < listed_from[None, :]
+    hole |= rng.random((rows, cols)) < missing_p
+    for f in FIELDS: fields[f][hole] = np.nan
+    return fields
+
+
+def daily_panel(symbols, days=320, end=None, seed=0, ipo_share=0.05, missing_p=0.002):
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp(end or pd.Timestamp.now()).normalize()
+    index = pd.bdate_range(end=end, periods=days)
+    cols = len(symbols)
+    fields = _ohlcv(rng, _walk(rng, days, cols, 0.018), 0.018, rng.uniform(2e4, 5e6, cols))
+    fields['Volume'][:, [i for i, s in enumerate(symbols) if s.startswith('^')]] = 0
+
+    # కొన్ని స్టాక్స్ కొత్తగా లిస్ట్ అయ్యాయి: 5 - 150 రోజుల హిస్టరీ మాత్రమే
+    listed_from = np.zeros(cols, dtype=int)
+    ipo = rng.random(cols) < ipo_share
+    listed_from[ipo] = days - rng.integers(5, 150, ipo.sum())
+    return _panel(index, symbols, _punch_holes(rng, fields, listed_from, missing_p))
+
+
+def intraday_panel(symbols, sessions=5, bars_today=BARS_PER_DAY, end=None, seed=1, ipo_share=0.03, missing_p=0.01):
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp(end or pd.Timestamp.now()).normalize()
+    days = pd.bdate_range(end=end, periods=sessions)
+    session = pd.timedelta_range("09:15:00", periods=BARS_PER_DAY, freq="5min")
+    index = pd.DatetimeIndex([d + t for d in days for t in session])[:len(session) * (sessions - 1) + bars_today]
+    rows, cols = len(index), len(symbols)
+    fields = _ohlcv(rng, _walk(rng, rows, cols, 0.002), 0.002, rng.uniform(500, 2e5, cols))
+
+    # ఈరోజే లిస్ట్ అయిన స్టాక్స్ (ఈరోజు బార్స్ మాత్రమే)
+    listed_from = np.zeros(cols, dtype=int)
+    listed_from[rng.random(cols) < ipo_share] = rows - bars_today
+    return _panel(index, symbols, _punch_holes(rng, fields, listed_from, missing_p))
+
+
+def tick_last_bar(panel, seed=2):
+    # లైవ్ టిక్ సిమ్యులేషన్: లాస్ట్ క్యాండిల్ Close / High / Low / Volume మాత్రమే మారుతుంది
+    rng = np.random.default_rng(seed)
+    out = panel.copy()
+    last = out.index[-1]
+    for sym in out.columns.get_level_values(0).unique():
+        c = out.at[last, (sym, 'Close')]
+        if c != c: continue
+        nc = c * (1 + rng.normal(0, 0.001))
+        out.at[last, (sym, 'Close')] = nc
+        out.at[last, (sym, 'High')] = max(out.at[last, (sym, 'High')], nc)
+        out.at[last, (sym, 'Low')] = min(out.at[last, (sym, 'Low')], nc)
+        out.at[last, (sym, 'Volume')] += rng.integers(0, 500)
+    return out
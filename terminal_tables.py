@@ -0,0 +1,26 @@
+# --- TERMINAL TABLE HTML (Streamlit లేకుండా బిల్డ్ - బెంచ్‌మార్క్ కూడా ఇదే వాడుతుంది) ---
+
+def generate_status(row):
+    status = ""
+    p = row.get('P', 0)
+    if row.get('Bull_P', 0) >= 80: status += f"🐂Bulls {int(row['Bull_P'])}% "
+    elif row.get('Bear_P', 0) >= 80: status += f"🐻Bears {int(row['Bear_P'])}% "
+    if 'AlphaTag' in row and row['AlphaTag']: status += f"{row['AlphaTag']} "
+    if 'O' in row and 'L' in row and abs(row['O'] - row['L']) < (p * 0.002): status += "O=L🔥 "
+    if 'O' in row and 'H' in row and abs(row['O'] - row['H']) < (p * 0.002): status += "O=H🩸 "
+    if row.get('C', 0) > 0 and row.get('Day_C', 0) > 0 and row.get('VolX', 0) > 1.5: status += "Rec⇈ "
+    if row.get('VolX', 0) > 1.5: status += "VOL🟢 "
+    return status.strip()
+
+
+def term_table_html(df_subset, title, color_class):
+    if df_subset.empty: return ""
+    html = f'<table class="term-table"><thead><tr><th colspan="7" class="{color_class}">{title}</th></tr><tr style="background-color: #21262d;"><th style="text-align:left; width:20%;">STOCK</th><th style="width:12%;">PRICE</th><th style="width:12%;">DAY%</th><th style="width:12%;">NET%</th><th style="width:10%;">VOL</th><th style="width:26%;">STATUS</th><th style="width:8%;">SCORE</th></tr></thead><tbody>'
+    for i, (_, row) in enumerate(df_subset.iterrows()):
+        bg_class = "row-dark" if i % 2 == 0 else "row-light"
+        day_color = "text-green" if row['Day_C'] >= 0 else "text-red"
+        net_color = "text-green" if row['C'] >= 0 else "text-red"
+        status = generate_status(row)
+        html += f'<tr class="{bg_class}"><td class="t-symbol {net_color}"><a href="https://in.tradingview.com/chart/?symbol=NSE:{row["T"]}" target="_blank">{row["T"]}</a></td><td>{row["P"]:.2f}</td><td class="{day_color}">{row["Day_C"]:.2f}%</td><td class="{net_color}">{row["C"]:.2f}%</td><td>{row["VolX"]:.1f}x</td><td style="font-size:10px;">{status}</td><td style="color:#ffd700;">{int(row["S"])}</td></tr>'
+    html += "</tbody></table>"
+    return html
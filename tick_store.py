@@ -0,0 +1,78 @@
+import threading
+import time
+from datetime import datetime
+import numpy as np
+
+# --- SHARED LIVE TICK STORE (process-wide, అన్ని సెషన్స్ కి ఒకటే) ---
+# ఒక్కో security id కి ఒక స్లాట్. వెబ్‌సాకెట్ థ్రెడ్ lock లోపల రాస్తుంది,
+# సెషన్స్ lookup() తో కాపీ తీసుకుని చదువుతాయి. seq తో ఏ స్లాట్ ఎప్పుడు మారిందో తెలుస్తుంది.
+
+
+def _num(val):
+    try: return float(val)
+    except (TypeError, ValueError): return np.nan
+
+
+def _parse_ltt(val):
+    # Dhan v2 LTT "HH:MM:SS" స్ట్రింగ్ గా ఇస్తుంది, పాత ఫార్మాట్ లో epoch seconds
+    if val is None: return int(time.time())
+    if isinstance(val, str) and ":" in val:
+        try:
+            t = datetime.strptime(val.strip(), "%H:%M:%S").time()
+            return int(datetime.combine(datetime.now().date(), t).timestamp())
+        except ValueError: return int(time.time())
+    ts = _num(val)
+    return int(ts) if ts == ts and ts > 0 else int(time.time())
+
+
+def parse_tick(message):
+    # DhanFeed మెసేజ్ -> (security id, LTP, day volume, avg price, LTT epoch)
+    if not isinstance(message, dict) or 'LTP' not in message: return None
+    sec_id = message.get('security_id', message.get('SecurityId'))
+    if sec_id is None: return None
+    return (str(sec_id), _num(message['LTP']), _num(message.get('volume')),
+            _num(message.get('avg_price')), _parse_ltt(message.get('LTT')))
+
+
+class TickStore:
+    def __init__(self, security_ids):
+        ids = list(dict.fromkeys(str(s) for s in security_ids))
+        self.slot = {sid: i for i, sid in enumerate(ids)}
+        n = len(ids)
+        self.ltp = np.full(n, np.nan)
+        self.volume = np.zeros(n)
+        self.avg_price = np.full(n, np.nan)
+        self.ltt = np.zeros(n, dtype='i8')
+        self.seq = np.zeros(n, dtype='i8')
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def update(self, sec_id, ltp, volume=np.nan, avg_price=np.nan, ltt=None):
+        i = self.slot.get(str(sec_id))
+        if i is None or not ltp > 0: return None
+        with self._lock:
+            self.version += 1
+            self.ltp[i] = ltp
+            if volume == volume: self.volume[i] = volume
+            if avg_price > 0: self.avg_price[i] = avg_price
+            self.ltt[i] = ltt if ltt is not None else int(time.time())
+            self.seq[i] = self.version
+        return i
+
+    def on_tick(self, tick):
+        return self.update(*tick) if tick else None
+
+    def lookup(self, sec_ids):
+        # sec_ids లిస్ట్ ఆర్డర్ లోనే arrays, టిక్ రాని / తెలియని వాటికి NaN & seq 0
+        pos = np.array([self.slot.get(str(s), -1) if s is not None else -1 for s in sec_ids], dtype='i8')
+        known = pos >= 0
+        out = {
+            'ltp': np.full(len(pos), np.nan), 'volume': np.full(len(pos), np.nan),
+            'avg_price': np.full(len(pos), np.nan), 'ltt': np.zeros(len(pos), dtype='i8'),
+            'seq': np.zeros(len(pos), dtype='i8'),
+        }
+        with self._lock:
+            for key in out: out[key][known] = getattr(self, key)[pos[known]]
+            version = self.version
+        out['version'] = version
+        return out
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+# --- UNIVERSE INDEX (membership bitmask + sector, built once at import) ---
+# ప్రతి ఫిల్టర్ లో NIFTY_50 + FNO_STOCKS లాంటి లిస్ట్ కాన్‌కాట్ & isin బదులు,
+# Fetch_T -> కేటగోరికల్ కోడ్ -> బిట్‌మాస్క్ / సెక్టార్ అర్రే లుక్అప్ ఒక్కసారే.
+
+U_NIFTY50 = 1 << 0
+U_FNO = 1 << 1
+U_MIDCAP = 1 << 2
+U_SMALLCAP = 1 << 3
+U_INDEX = 1 << 4
+U_SECTOR = 1 << 5
+U_COMMODITY = 1 << 6
+U_STOCKS = U_NIFTY50 | U_FNO | U_MIDCAP | U_SMALLCAP
+
+
+class UniverseIndex:
+    def __init__(self, groups, stock_sectors, default_sector="OTHER"):
+        # groups: {bit: Fetch_T లిస్ట్}, stock_sectors: {Fetch_T: సెక్టార్}
+        symbols = list(dict.fromkeys(s for syms in groups.values() for s in syms))
+        self.dtype = pd.CategoricalDtype(symbols)
+        # చివరి స్లాట్ యూనివర్స్ లో లేని సింబల్స్ కి (కోడ్ -1 అక్కడికే పడుతుంది)
+        self._masks = np.zeros(len(symbols) + 1, dtype=np.uint16)
+        pos = {s: i for i, s in enumerate(symbols)}
+        for bit, syms in groups.items():
+            self._masks[[pos[s] for s in syms]] |= bit
+        self._sectors = np.array([stock_sectors.get(s, default_sector) for s in symbols] + [default_sector], dtype=object)
+        self.members = {bit: frozenset(syms) for bit, syms in groups.items()}
+
+    def codes(self, fetch_t):
+        return pd.Categorical(fetch_t, dtype=self.dtype).codes
+
+    def mask_of(self, fetch_t):
+        return self._masks[self.codes(fetch_t)]
+
+    def sector_of(self, fetch_t):
+        return self._sectors[self.codes(fetch_t)]
+
+    def symbols(self, bits):
+        return {s for bit, syms in self.members.items() if bit & bits for s in syms}
+
+    def contains(self, df, bits):
+        # రేడార్ ఫ్రేమ్ (లేదా దాని సబ్‌సెట్) మీద వెక్టరైజ్డ్ మెంబర్‌షిప్ ఫిల్టర్; U_Mask లేకపోతే Fetch_T నుండి
+        if 'U_Mask' in df.columns and df['U_Mask'].dtype.kind in 'iu': mask = df['U_Mask'].to_numpy()
+        else: mask = self.mask_of(df['Fetch_T'])
+        return (mask & bits) != 0